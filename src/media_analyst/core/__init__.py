@@ -7,7 +7,15 @@ Core - Functional Core
 - 配置常量
 """
 
-from media_analyst.core.config import CRAWLER_TYPES, LOGIN_TYPES, PLATFORMS, SAVE_OPTIONS
+from media_analyst.core.config import (
+    CRAWLER_TYPE_KEYS,
+    CRAWLER_TYPES,
+    LOGIN_TYPE_KEYS,
+    LOGIN_TYPES,
+    PLATFORM_KEYS,
+    PLATFORMS,
+    SAVE_OPTIONS,
+)
 from media_analyst.core.models import (
     Comment,
     ContentType,
@@ -57,6 +65,9 @@ __all__ = [
     'LOGIN_TYPES',
     'CRAWLER_TYPES',
     'SAVE_OPTIONS',
+    'PLATFORM_KEYS',
+    'LOGIN_TYPE_KEYS',
+    'CRAWLER_TYPE_KEYS',
     # 函数
     'build_args',
     # URL解析
@@ -4,7 +4,7 @@
 所有 UI 显示文本和选项映射集中管理
 """
 
-from typing import Dict, List
+from typing import Dict, Tuple
 
 # 平台配置
 PLATFORMS: Dict[str, str] = {
@@ -32,7 +32,12 @@ CRAWLER_TYPES: Dict[str, str] = {
 }
 
 # 保存格式
-SAVE_OPTIONS: List[str] = ['json', 'csv', 'excel', 'sqlite', 'db', 'mongodb', 'postgres']
+SAVE_OPTIONS: Tuple[str, ...] = ('json', 'csv', 'excel', 'sqlite', 'db', 'mongodb', 'postgres')
+
+# 下拉框选项（导入时生成一次，UI 重跑时直接复用）
+PLATFORM_KEYS: Tuple[str, ...] = tuple(PLATFORMS)
+LOGIN_TYPE_KEYS: Tuple[str, ...] = tuple(LOGIN_TYPES)
+CRAWLER_TYPE_KEYS: Tuple[str, ...] = tuple(CRAWLER_TYPES)
 
 # MediaCrawler 路径（相对于项目根目录）
 DEFAULT_MEDIA_CRAWLER_PATH = '../MediaCrawler'
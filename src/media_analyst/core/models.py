@@ -6,13 +6,16 @@ Pydantic 数据模型
 - CrawlerExecution 创建时自动校验输出文件存在性
 """
 
+import os
 from abc import abstractmethod
+from collections import Counter
 from datetime import datetime
 from enum import Enum
+from functools import lru_cache
 from pathlib import Path
-from typing import Any, Dict, List, Literal, Optional, Union
+from typing import Any, Dict, List, Literal, Optional, Set, Tuple, Union
 
-from pydantic import BaseModel, Field, field_validator, model_validator
+from pydantic import BaseModel, Field, PrivateAttr, SkipValidation, ValidationInfo, field_validator, model_validator
 
 
 class Platform(str, Enum):
@@ -85,15 +88,15 @@ class CommonRequestFields(BaseModel):
         """转换为命令行参数列表（纯函数）"""
         raise NotImplementedError
 
-    def _build_common_args(self) -> List[str]:
-        """构建通用参数"""
+    def _build_common_args(self, start_page: int = 1) -> List[str]:
+        """构建通用参数（单个列表字面量一次构建）"""
         args = [
             '--platform',
             self.platform.value,
             '--lt',
             self.login_type.value,
             '--start',
-            '1',  # 起始页码默认为1，子类可覆盖
+            str(start_page),
             '--save_data_option',
             self.save_option.value,
             '--max_comments_count_singlenotes',
@@ -106,7 +109,7 @@ class CommonRequestFields(BaseModel):
             'yes' if self.headless else 'no',
         ]
         if self.save_path:
-            args.extend(['--save_data_path', self.save_path])
+            args += ('--save_data_path', self.save_path)
         return args
 
 
@@ -133,11 +136,8 @@ class SearchRequest(CommonRequestFields):
 
     def to_cli_args(self) -> List[str]:
         """转换为命令行参数"""
-        args = self._build_common_args()
-        # 覆盖起始页码
-        args = [arg if arg != '1' or args[i - 1] != '--start' else str(self.start_page) for i, arg in enumerate(args)]
-        args[args.index('--start') + 1] = str(self.start_page)
-        args.extend(['--type', 'search', '--keywords', self.keywords])
+        args = self._build_common_args(self.start_page)
+        args += ('--type', 'search', '--keywords', self.keywords)
         return args
 
 
@@ -164,9 +164,8 @@ class DetailRequest(CommonRequestFields):
 
     def to_cli_args(self) -> List[str]:
         """转换为命令行参数"""
-        args = self._build_common_args()
-        args[args.index('--start') + 1] = str(self.start_page)
-        args.extend(['--type', 'detail', '--specified_id', self.specified_ids])
+        args = self._build_common_args(self.start_page)
+        args += ('--type', 'detail', '--specified_id', self.specified_ids)
         return args
 
 
@@ -193,9 +192,8 @@ class CreatorRequest(CommonRequestFields):
 
     def to_cli_args(self) -> List[str]:
         """转换为命令行参数"""
-        args = self._build_common_args()
-        args[args.index('--start') + 1] = str(self.start_page)
-        args.extend(['--type', 'creator', '--creator_id', self.creator_ids])
+        args = self._build_common_args(self.start_page)
+        args += ('--type', 'creator', '--creator_id', self.creator_ids)
         return args
 
 
@@ -203,6 +201,37 @@ class CreatorRequest(CommonRequestFields):
 CrawlerRequest = Union[SearchRequest, DetailRequest, CreatorRequest]
 
 
+def _existing_names(directory: Path) -> Set[str]:
+    """目录中存在的文件名（不含断开的符号链接），目录无法读取时返回空集合"""
+    try:
+        with os.scandir(directory) as entries:
+            return {entry.name for entry in entries if not entry.is_symlink() or os.path.exists(entry.path)}
+    except OSError:
+        return set()
+
+
+def _first_missing_file(files: List[Path]) -> Optional[Path]:
+    """
+    按输入顺序返回第一个不存在的文件，全部存在时返回 None
+
+    输出文件通常集中在同一目录：同目录多个文件时 scandir 一次，
+    用文件名集合判断，代替逐个 stat；不在集合中的文件再用 exists() 确认
+    （大小写不敏感的文件系统上文件名大小写可能不同）
+    """
+    dir_counts = Counter(f.parent for f in files)
+    names_by_dir: Dict[Path, Set[str]] = {}
+
+    for f in files:
+        if dir_counts[f.parent] > 1:
+            if f.parent not in names_by_dir:
+                names_by_dir[f.parent] = _existing_names(f.parent)
+            if f.name in names_by_dir[f.parent]:
+                continue
+        if not f.exists():
+            return f
+    return None
+
+
 class CrawlerExecution(BaseModel):
     """
     爬虫执行状态和结果
@@ -236,16 +265,22 @@ class CrawlerExecution(BaseModel):
     # 输出文件路径（创建时自动校验存在性）
     output_files: List[Path] = Field(default_factory=list, description='生成的输出文件路径')
 
+    # 拼接结果缓存：is_stderr -> (行列表, 已拼接行数, 拼接文本)
+    _joined_cache: Dict[bool, Tuple[List[str], int, str]] = PrivateAttr(default_factory=dict)
+
     @model_validator(mode='after')
-    def validate_output_files_exist(self) -> 'CrawlerExecution':
+    def validate_output_files_exist(self, info: ValidationInfo) -> 'CrawlerExecution':
         """
         验证 output_files 指向的文件都存在
 
-        注意：这会在模型创建/更新时执行，确保不合法状态无法表示
+        注意：这会在模型创建/更新时执行，确保不合法状态无法表示。
+        从可信的已保存数据恢复时可传 context={'skip_fs': True} 跳过逐个 stat
         """
-        for file_path in self.output_files:
-            if not file_path.exists():
-                raise ValueError(f'输出文件不存在: {file_path}')
+        if info.context and info.context.get('skip_fs'):
+            return self
+        missing = _first_missing_file(self.output_files)
+        if missing is not None:
+            raise ValueError(f'输出文件不存在: {missing}')
         return self
 
     @model_validator(mode='after')
@@ -277,6 +312,16 @@ class CrawlerExecution(BaseModel):
 
         return self
 
+    @classmethod
+    def pending(cls, request: CrawlerRequest) -> 'CrawlerExecution':
+        """
+        创建待执行状态
+
+        请求模型已在创建时校验，PENDING 状态无输出文件和状态约束可查，
+        直接 model_construct 跳过校验器
+        """
+        return cls.model_construct(request=request)
+
     def add_output(self, line: str, is_stderr: bool = False) -> None:
         """添加输出（实时更新）"""
         if is_stderr:
@@ -284,6 +329,13 @@ class CrawlerExecution(BaseModel):
         else:
             self.stdout_lines.append(line)
 
+    def add_outputs(self, lines: List[str], is_stderr: bool = False) -> None:
+        """批量添加输出（每批只扩容一次列表）"""
+        if is_stderr:
+            self.stderr_lines.extend(lines)
+        else:
+            self.stdout_lines.extend(lines)
+
     def mark_running(self, process_id: int) -> None:
         """标记为运行中"""
         self.status = ExecutionStatus.RUNNING
@@ -323,9 +375,9 @@ class CrawlerExecution(BaseModel):
         会在赋值前验证所有文件存在
         """
         # 先验证所有文件存在
-        for f in files:
-            if not f.exists():
-                raise ValueError(f'输出文件不存在: {f}')
+        missing = _first_missing_file(files)
+        if missing is not None:
+            raise ValueError(f'输出文件不存在: {missing}')
         self.output_files = files
 
     @property
@@ -346,15 +398,31 @@ class CrawlerExecution(BaseModel):
             ExecutionStatus.STOPPED,
         )
 
+    def _joined(self, lines: List[str], is_stderr: bool) -> str:
+        """
+        增量拼接输出行
+
+        输出只追加不修改，缓存已拼接的文本，每次只拼接新增的行；
+        列表被整体替换或缩短时重新拼接
+        """
+        cached_lines, count, text = self._joined_cache.get(is_stderr, (lines, 0, ''))
+        if cached_lines is not lines or count > len(lines):
+            count, text = 0, ''
+        if count < len(lines):
+            tail = '\n'.join(lines[count:])
+            text = f'{text}\n{tail}' if count else tail
+        self._joined_cache[is_stderr] = (lines, len(lines), text)
+        return text
+
     @property
     def full_output(self) -> str:
         """完整输出文本"""
-        return '\n'.join(self.stdout_lines)
+        return self._joined(self.stdout_lines, is_stderr=False)
 
     @property
     def full_stderr(self) -> str:
         """完整错误输出文本"""
-        return '\n'.join(self.stderr_lines)
+        return self._joined(self.stderr_lines, is_stderr=True)
 
 
 # =============================================================================
@@ -362,6 +430,38 @@ class CrawlerExecution(BaseModel):
 # =============================================================================
 
 
+@lru_cache(maxsize=4096)
+def _from_timestamp(ts: Union[int, float]) -> datetime:
+    """Unix 时间戳转 datetime（同一批数据中时间戳大量重复，缓存转换结果）"""
+    return datetime.fromtimestamp(ts)
+
+
+def _parse_create_time(v: Any) -> Optional[datetime]:
+    """解析 create_time：datetime、Unix 时间戳（数字或数字字符串）或 ISO 字符串"""
+    if v is None:
+        return None
+    if isinstance(v, datetime):
+        return v
+    if isinstance(v, (int, float)):
+        return _from_timestamp(v)
+    if isinstance(v, str):
+        # 数字字符串是主流格式，先判断，避免 ISO 字符串走 int() 抛异常的路径；
+        # 与 int() 一致，允许首尾空白和正负号
+        text = v.strip()
+        digits = text[1:] if text.startswith(('+', '-')) else text
+        if digits.isdecimal():
+            try:
+                return _from_timestamp(int(text))
+            except (ValueError, OverflowError, OSError):
+                # 超出范围（如毫秒时间戳）
+                return None
+        try:
+            return datetime.fromisoformat(text.replace('Z', '+00:00'))
+        except ValueError:
+            return None
+    return None
+
+
 class ContentType(str, Enum):
     """内容类型"""
 
@@ -422,31 +522,14 @@ class Post(BaseModel):
     crawl_time: Optional[datetime] = Field(default=None, description='抓取时间（从文件名提取）')
     source_file: str = Field(default='', description='来源文件路径')
 
-    # 保留原始数据（用于高级查询）
-    raw_data: Dict[str, Any] = Field(default_factory=dict, description='原始数据')
+    # 保留原始数据（用于高级查询）；跳过校验以直接引用原记录，不逐条复制字典
+    raw_data: SkipValidation[Dict[str, Any]] = Field(default_factory=dict, description='原始数据')
 
     @field_validator('create_time', mode='before')
     @classmethod
     def parse_timestamp(cls, v: Any) -> Optional[datetime]:
         """将 Unix 时间戳转换为 datetime"""
-        if v is None:
-            return None
-        if isinstance(v, datetime):
-            return v
-        if isinstance(v, (int, float)):
-            return datetime.fromtimestamp(v)
-        if isinstance(v, str):
-            # 尝试解析数字字符串
-            try:
-                return datetime.fromtimestamp(int(v))
-            except ValueError:
-                pass
-            # 尝试 ISO 格式
-            try:
-                return datetime.fromisoformat(v.replace('Z', '+00:00'))
-            except ValueError:
-                return None
-        return None
+        return _parse_create_time(v)
 
     @field_validator('liked_count', 'collected_count', 'comment_count', 'share_count', mode='before')
     @classmethod
@@ -514,29 +597,14 @@ class Comment(BaseModel):
     crawl_time: Optional[datetime] = Field(default=None, description='抓取时间（从文件名提取）')
     source_file: str = Field(default='', description='来源文件路径')
 
-    # 保留原始数据
-    raw_data: Dict[str, Any] = Field(default_factory=dict, description='原始数据')
+    # 保留原始数据；跳过校验以直接引用原记录，不逐条复制字典
+    raw_data: SkipValidation[Dict[str, Any]] = Field(default_factory=dict, description='原始数据')
 
     @field_validator('create_time', mode='before')
     @classmethod
     def parse_timestamp(cls, v: Any) -> Optional[datetime]:
         """将 Unix 时间戳转换为 datetime"""
-        if v is None:
-            return None
-        if isinstance(v, datetime):
-            return v
-        if isinstance(v, (int, float)):
-            return datetime.fromtimestamp(v)
-        if isinstance(v, str):
-            try:
-                return datetime.fromtimestamp(int(v))
-            except ValueError:
-                pass
-            try:
-                return datetime.fromisoformat(v.replace('Z', '+00:00'))
-            except ValueError:
-                return None
-        return None
+        return _parse_create_time(v)
 
     @field_validator('like_count', 'sub_comment_count', mode='before')
     @classmethod
@@ -557,17 +625,49 @@ class Comment(BaseModel):
     @classmethod
     def parse_pictures(cls, v: Any) -> List[str]:
         """解析图片字段（支持逗号分隔的字符串或列表）"""
-        if v is None:
+        # 多数评论无图（None 或空字符串），直接返回
+        if not v:
             return []
         if isinstance(v, list):
             return v
         if isinstance(v, str):
-            if not v:
-                return []
-            return [url.strip() for url in v.split(',') if url.strip()]
+            # 只按逗号分割，URL 内部的空格保留，去掉首尾空白和空项
+            return [url for url in (part.strip() for part in v.split(',')) if url]
         return []
 
 
+def _latest_by_key(items: List[Any], id_field: str) -> Tuple[Dict[Tuple[str, str], Any], int]:
+    """
+    按 (platform, id_field) 分组，保留每组 crawl_time 最新的一条
+
+    两条都有 crawl_time 时保留更新的，否则保留后遇到的
+
+    Returns:
+        (键 -> 保留的记录, 出现重复的键数量)
+    """
+    latest: Dict[Tuple[str, str], Any] = {}
+    duplicated_keys = set()
+    for item in items:
+        key = (item.platform.value, getattr(item, id_field))
+        existing = latest.get(key)
+        if existing is None:
+            latest[key] = item
+            continue
+        duplicated_keys.add(key)
+        if not (item.crawl_time and existing.crawl_time) or item.crawl_time > existing.crawl_time:
+            latest[key] = item
+    return latest, len(duplicated_keys)
+
+
+def _dedup_stats(duplicate_posts: int, duplicate_comments: int) -> Dict[str, int]:
+    """去重统计字典"""
+    return {
+        'duplicate_posts': duplicate_posts,
+        'duplicate_comments': duplicate_comments,
+        'total_duplicates': duplicate_posts + duplicate_comments,
+    }
+
+
 class ParsedData(BaseModel):
     """
     解析结果容器
@@ -590,53 +690,25 @@ class ParsedData(BaseModel):
     @property
     def total_interactions(self) -> Dict[str, int]:
         """计算总互动量"""
-        return {
-            'likes': sum(p.liked_count for p in self.posts),
-            'collects': sum(p.collected_count for p in self.posts),
-            'comments': sum(p.comment_count for p in self.posts),
-            'shares': sum(p.share_count for p in self.posts),
-        }
+        likes = collects = comments = shares = 0
+        for p in self.posts:
+            likes += p.liked_count
+            collects += p.collected_count
+            comments += p.comment_count
+            shares += p.share_count
+        return {'likes': likes, 'collects': collects, 'comments': comments, 'shares': shares}
 
     @property
     def user_count(self) -> int:
         """统计唯一用户数量"""
-        user_ids = set()
-        for post in self.posts:
-            if post.user_id:
-                user_ids.add((post.platform.value, post.user_id))
-        for comment in self.comments:
-            if comment.user_id:
-                user_ids.add((comment.platform.value, comment.user_id))
-        return len(user_ids)
+        return len({(item.platform, item.user_id) for item in (*self.posts, *self.comments) if item.user_id})
 
     @property
     def deduplication_stats(self) -> Dict[str, int]:
         """获取去重统计信息"""
-        # 统计帖子重复数
-        post_keys = {}
-        for post in self.posts:
-            key = (post.platform.value, post.content_id)
-            if key in post_keys:
-                post_keys[key] += 1
-            else:
-                post_keys[key] = 1
-        duplicate_posts = sum(1 for count in post_keys.values() if count > 1)
-
-        # 统计评论重复数
-        comment_keys = {}
-        for comment in self.comments:
-            key = (comment.platform.value, comment.comment_id)
-            if key in comment_keys:
-                comment_keys[key] += 1
-            else:
-                comment_keys[key] = 1
-        duplicate_comments = sum(1 for count in comment_keys.values() if count > 1)
-
-        return {
-            'duplicate_posts': duplicate_posts,
-            'duplicate_comments': duplicate_comments,
-            'total_duplicates': duplicate_posts + duplicate_comments,
-        }
+        _, duplicate_posts = _latest_by_key(self.posts, 'content_id')
+        _, duplicate_comments = _latest_by_key(self.comments, 'comment_id')
+        return _dedup_stats(duplicate_posts, duplicate_comments)
 
     def deduplicate(self) -> 'ParsedData':
         """
@@ -650,35 +722,18 @@ class ParsedData(BaseModel):
         Returns:
             去重后的新 ParsedData 对象
         """
+        deduplicated, _ = self.deduplicate_with_stats()
+        return deduplicated
 
-        # 去重帖子：用字典保留最新数据
-        post_map: Dict[tuple[str, str], Post] = {}
-        for post in self.posts:
-            key = (post.platform.value, post.content_id)
-            if key in post_map:
-                existing = post_map[key]
-                # 保留 crawl_time 更新的，如果没有则保留当前（后遇到的优先）
-                if post.crawl_time and existing.crawl_time:
-                    if post.crawl_time > existing.crawl_time:
-                        post_map[key] = post
-                else:
-                    post_map[key] = post  # 没有 crawl_time 时保留后遇到的
-            else:
-                post_map[key] = post
-
-        # 去重评论
-        comment_map: Dict[tuple[str, str], Comment] = {}
-        for comment in self.comments:
-            key = (comment.platform.value, comment.comment_id)
-            if key in comment_map:
-                existing = comment_map[key]
-                if comment.crawl_time and existing.crawl_time:
-                    if comment.crawl_time > existing.crawl_time:
-                        comment_map[key] = comment
-                else:
-                    comment_map[key] = comment
-            else:
-                comment_map[key] = comment
+    def deduplicate_with_stats(self) -> Tuple['ParsedData', Dict[str, int]]:
+        """
+        去重并同时返回去重统计（一次遍历，避免先取 deduplication_stats 再 deduplicate 扫描两遍）
+
+        Returns:
+            (去重后的新 ParsedData 对象, 与 deduplication_stats 相同格式的统计)
+        """
+        post_map, duplicate_posts = _latest_by_key(self.posts, 'content_id')
+        comment_map, duplicate_comments = _latest_by_key(self.comments, 'comment_id')
 
         # 创建新的解析结果
         deduplicated = ParsedData(
@@ -691,4 +746,4 @@ class ParsedData(BaseModel):
             errors=self.errors,
         )
 
-        return deduplicated
+        return deduplicated, _dedup_stats(duplicate_posts, duplicate_comments)
@@ -4,16 +4,30 @@
 纯函数：将 CrawlerRequest 转换为 MediaCrawler 命令行参数
 """
 
-from typing import List
+import shlex
+from functools import lru_cache
+from typing import List, Tuple
 
 from media_analyst.core.models import CrawlerRequest
 
 
+@lru_cache(maxsize=256)
+def _cached_args(request: CrawlerRequest) -> Tuple[str, ...]:
+    """
+    按请求的字段值缓存参数
+
+    请求模型不可变，按字段值判等和哈希：UI 每次重跑重新构建的相同请求命中同一条缓存，
+    model_copy(update=...) 得到的新请求字段不同，不会取到旧结果
+    """
+    return tuple(request.to_cli_args())
+
+
 def build_args(request: CrawlerRequest) -> List[str]:
     """
     将爬虫请求模型转换为命令行参数列表
 
-    这是一个纯函数：相同的输入总是产生相同的输出，无副作用
+    这是一个纯函数：相同的输入总是产生相同的输出，无副作用；
+    结果按请求缓存，每次返回新列表，调用方可以修改
 
     Args:
         request: 爬虫请求模型（SearchRequest/DetailRequest/CreatorRequest）
@@ -26,7 +40,7 @@ def build_args(request: CrawlerRequest) -> List[str]:
         >>> build_args(req)
         ['--platform', 'dy', '--lt', 'qrcode', '--start', '1', ...]
     """
-    return request.to_cli_args()
+    return list(_cached_args(request))
 
 
 def build_command(request: CrawlerRequest, use_uv: bool = True) -> List[str]:
@@ -55,8 +69,7 @@ def preview_command(request: CrawlerRequest, media_crawler_path: str = '../Media
         media_crawler_path: MediaCrawler 项目路径
 
     Returns:
-        可读的命令字符串
+        可直接粘贴到 shell 执行的命令字符串
     """
-    cmd = build_command(request)
-    cmd_str = ' '.join(cmd)
-    return f'cd {media_crawler_path} && {cmd_str}'
+    # shlex 负责转义，含空格或 shell 元字符的参数也能原样复制执行
+    return f'cd {shlex.quote(media_crawler_path)} && {shlex.join(build_command(request))}'
@@ -13,12 +13,29 @@ JSON文件 -> detect_platform() -> parse_post/parse_comment() -> Post/Comment模
 """
 
 import json
+import re
+import sys
 from datetime import datetime
 from pathlib import Path
-from typing import Any, Callable, Dict, List, Optional, Union
+from typing import Any, BinaryIO, Callable, Dict, Iterable, Iterator, List, Optional, Tuple, Union
 
 from media_analyst.core.models import Comment, ParsedData, Platform, Post
 
+try:
+    # 可选加速依赖：C 实现的 JSON 解码，直接处理字节，大文件解析快数倍
+    import orjson
+except ImportError:
+    orjson = None
+
+try:
+    # 可选依赖：超大数组文件逐条流式解析，内存占用与单条记录同级
+    import ijson
+except ImportError:
+    ijson = None
+
+# 超过此大小（字节）的数组文件在安装了 ijson 时流式解析
+STREAMING_THRESHOLD = 64 << 20
+
 # =============================================================================
 # 平台检测
 # =============================================================================
@@ -34,6 +51,36 @@ PLATFORM_SIGNATURES = {
     Platform.ZHIHU: {'content_id_fields': ['question_id', 'answer_id'], 'user_id_fields': ['id', 'uid']},
 }
 
+# 内容ID字段 -> 平台，按 PLATFORM_SIGNATURES 顺序展开，检测时按此顺序逐个探测
+CONTENT_ID_PLATFORMS: Dict[str, Platform] = {
+    field: platform for platform, signatures in PLATFORM_SIGNATURES.items() for field in signatures['content_id_fields']
+}
+
+# 文件名/路径中的平台标识
+FILENAME_PLATFORMS = {
+    'douyin': Platform.DY,
+    'dy': Platform.DY,
+    'xiaohongshu': Platform.XHS,
+    'xhs': Platform.XHS,
+    'bilibili': Platform.BILI,
+    'bili': Platform.BILI,
+    'kuaishou': Platform.KS,
+    'ks': Platform.KS,
+    'weibo': Platform.WB,
+    'wb': Platform.WB,
+    'tieba': Platform.TIEBA,
+    'zhihu': Platform.ZHIHU,
+}
+
+# 平台全名作为子串出现即可（如 douyin2024.json）；缩写（不超过 4 个字母）前面不能是字母或数字、
+# 后面不能是字母（如 xhs2024.json 可以），避免 tmpdy3k.json 之类的随机名误判
+FILENAME_PLATFORM_PATTERN = re.compile(
+    '|'.join(
+        name if len(name) > 4 else rf'(?<![a-z0-9]){name}(?![a-z])'
+        for name in sorted(FILENAME_PLATFORMS, key=len, reverse=True)
+    )
+)
+
 
 def detect_platform(data: Dict[str, Any]) -> Optional[Platform]:
     """
@@ -54,22 +101,19 @@ def detect_platform(data: Dict[str, Any]) -> Optional[Platform]:
     if not isinstance(data, dict):
         return None
 
-    data_keys = set(data.keys())
-
     # 优先检查评论特有字段（避免将评论误判为帖子）
     # 抖音评论有 comment_id 和 aweme_id，小红书评论有 comment_id 和 note_id
-    if 'comment_id' in data_keys:
+    if 'comment_id' in data:
         # 有 aweme_id 的是抖音评论，有 note_id 的是小红书评论
-        if 'aweme_id' in data_keys:
+        if 'aweme_id' in data:
             return Platform.DY
-        if 'note_id' in data_keys:
+        if 'note_id' in data:
             return Platform.XHS
 
-    for platform, signatures in PLATFORM_SIGNATURES.items():
-        # 检查内容ID字段
-        for field in signatures['content_id_fields']:
-            if field in data_keys:
-                return platform
+    # 直接在记录上做字典成员检查，无需先复制出键集合
+    for field, platform in CONTENT_ID_PLATFORMS.items():
+        if field in data:
+            return platform
 
     return None
 
@@ -84,27 +128,38 @@ def detect_platform_from_filename(filename: str) -> Optional[Platform]:
     Returns:
         检测到的平台，无法检测则返回 None
     """
-    filename_lower = filename.lower()
-
-    platform_map = {
-        'douyin': Platform.DY,
-        'dy': Platform.DY,
-        'xiaohongshu': Platform.XHS,
-        'xhs': Platform.XHS,
-        'bilibili': Platform.BILI,
-        'bili': Platform.BILI,
-        'kuaishou': Platform.KS,
-        'ks': Platform.KS,
-        'weibo': Platform.WB,
-        'wb': Platform.WB,
-        'tieba': Platform.TIEBA,
-        'zhihu': Platform.ZHIHU,
-    }
-
-    for key, platform in platform_map.items():
-        if key in filename_lower:
-            return platform
+    match = FILENAME_PLATFORM_PATTERN.search(filename.lower())
+    if match:
+        return FILENAME_PLATFORMS[match.group()]
+    return None
+
 
+# 文件名中的抓取时间格式（模块加载时编译一次）
+CRAWL_TIME_PATTERNS = (
+    # 模式1: _2024_0222_143052 (下划线分隔，紧凑格式)
+    re.compile(r'_(\d{4})_?(\d{2})_?(\d{2})_?(\d{2})_?(\d{2})_?(\d{2})'),
+    # 模式2: _2024-02-22-14-30-52 (横线分隔)
+    re.compile(r'_(\d{4})-(\d{2})-(\d{2})-(\d{2})-(\d{2})-(\d{2})'),
+    # 模式3: _20240222_143052 (日期紧凑，时间下划线)
+    re.compile(r'_(\d{4})(\d{2})(\d{2})_(\d{2})(\d{2})(\d{2})'),
+)
+
+# 只有日期的格式（没有时间部分）: _2024-02-22 或 _2024_02_22
+CRAWL_DATE_PATTERNS = (
+    re.compile(r'_(\d{4})-(\d{2})-(\d{2})(?:\.|_|$)'),  # _2024-02-22.json 或 _2024-02-22_
+    re.compile(r'_(\d{4})_(\d{2})_(\d{2})(?:\.|_|$)'),  # _2024_02_22.json
+)
+
+
+def _match_crawl_time(base_name: str) -> Optional[datetime]:
+    """按 CRAWL_TIME_PATTERNS、CRAWL_DATE_PATTERNS 顺序匹配文件名中的时间"""
+    for pattern in CRAWL_TIME_PATTERNS + CRAWL_DATE_PATTERNS:
+        match = pattern.search(base_name)
+        if match:
+            try:
+                return datetime(*map(int, match.groups()))
+            except (ValueError, TypeError):
+                continue
     return None
 
 
@@ -123,41 +178,14 @@ def extract_crawl_time_from_filename(filename: str) -> Optional[datetime]:
     Returns:
         解析到的 datetime，无法解析则返回 None
     """
-    import re
-
     # 提取文件名（不含路径和扩展名）
     base_name = Path(filename).stem
 
-    # 模式1: _2024_0222_143052 (下划线分隔，紧凑格式)
-    pattern1 = r'_(\d{4})_?(\d{2})_?(\d{2})_?(\d{2})_?(\d{2})_?(\d{2})'
-    # 模式2: _2024-02-22-14-30-52 (横线分隔)
-    pattern2 = r'_(\d{4})-(\d{2})-(\d{2})-(\d{2})-(\d{2})-(\d{2})'
-    # 模式3: _20240222_143052 (日期紧凑，时间下划线)
-    pattern3 = r'_(\d{4})(\d{2})(\d{2})_(\d{2})(\d{2})(\d{2})'
-
-    for pattern in [pattern1, pattern2, pattern3]:
-        match = re.search(pattern, base_name)
-        if match:
-            try:
-                year, month, day, hour, minute, second = map(int, match.groups())
-                return datetime(year, month, day, hour, minute, second)
-            except (ValueError, TypeError):
-                continue
-
-    # 只有日期的格式（没有时间部分）
-    # 模式4: _2024-02-22 或 _2024_02_22
-    date_patterns = [
-        r'_(\d{4})-(\d{2})-(\d{2})(?:\.|_|$)',  # _2024-02-22.json 或 _2024-02-22_
-        r'_(\d{4})_(\d{2})_(\d{2})(?:\.|_|$)',  # _2024_02_22.json
-    ]
-    for pattern in date_patterns:
-        match = re.search(pattern, base_name)
-        if match:
-            try:
-                year, month, day = map(int, match.groups())
-                return datetime(year, month, day, 0, 0, 0)
-            except (ValueError, TypeError):
-                continue
+    # 所有时间格式都以 _ 开头，不含 _ 的文件名直接跳过正则匹配
+    if '_' in base_name:
+        parsed = _match_crawl_time(base_name)
+        if parsed is not None:
+            return parsed
 
     # 尝试文件修改时间作为备选
     try:
@@ -188,21 +216,42 @@ def _get_field(data: Dict[str, Any], *field_names: str, default: Any = None) ->
     Returns:
         第一个存在的字段值，或默认值
     """
+    get = data.get
     for name in field_names:
-        if name in data and data[name] is not None:
-            return data[name]
+        value = get(name)
+        if value is not None:
+            return value
     return default
 
 
+# 共通字段表：(目标字段, 候选源字段)，模块加载时构建一次，逐条记录只做字典查找
+COMMON_FIELD_SPECS = (
+    ('user_id', ('user_id', 'uid', 'author_id')),
+    ('nickname', ('nickname', 'user_name', 'author_name')),
+    ('avatar', ('avatar', 'avatar_url', 'user_avatar')),
+    ('ip_location', ('ip_location', 'ip_label', 'location')),
+    ('source_keyword', ('source_keyword', 'keyword')),
+)
+
+# 取值集合很小（省份、搜索关键词）的共通字段：驻留字符串，同值记录共享同一对象
+INTERNED_COMMON_FIELDS = frozenset({'ip_location', 'source_keyword'})
+
+
 def _extract_common_fields(data: Dict[str, Any]) -> Dict[str, Any]:
-    """提取各平台共通的字段"""
-    return {
-        'user_id': _get_field(data, 'user_id', 'uid', 'author_id', default=''),
-        'nickname': _get_field(data, 'nickname', 'user_name', 'author_name', default=''),
-        'avatar': _get_field(data, 'avatar', 'avatar_url', 'user_avatar', default=''),
-        'ip_location': _get_field(data, 'ip_location', 'ip_label', 'location', default=''),
-        'source_keyword': _get_field(data, 'source_keyword', 'keyword', default=''),
-    }
+    """提取各平台共通的字段（缺失时为空字符串）"""
+    get = data.get
+    common = {}
+    for target, sources in COMMON_FIELD_SPECS:
+        value = ''
+        for name in sources:
+            candidate = get(name)
+            if candidate is not None:
+                value = candidate
+                break
+        if target in INTERNED_COMMON_FIELDS and type(value) is str:
+            value = sys.intern(value)
+        common[target] = value
+    return common
 
 
 # =============================================================================
@@ -402,6 +451,55 @@ COMMENT_PARSERS: Dict[Platform, Callable[[Dict[str, Any]], Comment]] = {
 # =============================================================================
 
 
+def _decode_json(raw: bytes) -> Any:
+    """
+    解码 JSON 字节
+
+    安装了 orjson 时使用 orjson 解码（其 JSONDecodeError 是 json.JSONDecodeError 的子类，
+    调用方无需区分），否则退回标准库
+    """
+    if orjson is not None:
+        return orjson.loads(raw)
+    return json.loads(raw)
+
+
+def _load_json(path: Path) -> Any:
+    """读取 JSON 文件"""
+    return _decode_json(path.read_bytes())
+
+
+def _records_from_data(data: Any) -> Iterator[Any]:
+    """将解码后的 JSON 展开为记录（单个对象视为只有一条记录）"""
+    if isinstance(data, dict):
+        yield data
+    elif isinstance(data, list):
+        yield from data
+    else:
+        raise ValueError(f'不支持的 JSON 格式: {type(data)}')
+
+
+def _is_json_array(path: Path) -> bool:
+    """文件内容是否为 JSON 数组（只读取开头）"""
+    with open(path, 'rb') as f:
+        head = f.read(64).lstrip()
+    return head.startswith(b'[')
+
+
+def _iter_json_records(path: Path) -> Iterator[Any]:
+    """
+    逐条产出 JSON 文件中的记录
+
+    超过 STREAMING_THRESHOLD 的数组文件在安装了 ijson 时流式解析，否则整体加载；
+    单个对象视为只有一条记录
+    """
+    if ijson is not None and path.stat().st_size > STREAMING_THRESHOLD and _is_json_array(path):
+        with open(path, 'rb') as f:
+            yield from ijson.items(f, 'item', use_float=True)
+        return
+
+    yield from _records_from_data(_load_json(path))
+
+
 def parse_post(data: Dict[str, Any], platform: Optional[Platform] = None) -> Optional[Post]:
     """
     解析单条帖子数据
@@ -472,42 +570,74 @@ def parse_json_file(file_path: Union[str, Path], deduplicate: bool = False) -> P
 
     Raises:
         FileNotFoundError: 文件不存在
-        json.JSONDecodeError: JSON 格式错误
+        json.JSONDecodeError: JSON 格式错误（流式解析时为 ijson.JSONError）
+        ValueError: 顶层既不是数组也不是对象
     """
     path = Path(file_path)
 
     if not path.exists():
         raise FileNotFoundError(f'文件不存在: {file_path}')
 
-    # 读取并解析 JSON
-    with open(path, 'r', encoding='utf-8') as f:
-        data = json.load(f)
+    # 大文件逐条流式读取，不整体加载
+    return _parse_records(_iter_json_records(path), str(path), deduplicate)
 
-    # 确保是列表
-    if isinstance(data, dict):
-        data = [data]
-    elif not isinstance(data, list):
-        raise ValueError(f'不支持的 JSON 格式: {type(data)}')
 
+def parse_json_fileobj(fp: BinaryIO, source_file: str = '', deduplicate: bool = False) -> ParsedData:
+    """
+    从已打开的二进制文件对象解析 JSON 数据（如上传文件、内存中的 BytesIO）
+
+    Args:
+        fp: 以二进制模式打开的文件对象
+        source_file: 数据来源文件名（可选，用于检测平台和抓取时间，并记录到结果中）
+        deduplicate: 是否自动去重
+
+    Returns:
+        ParsedData 包含解析后的帖子和评论列表
+
+    Raises:
+        json.JSONDecodeError: JSON 格式错误
+        ValueError: 顶层既不是数组也不是对象
+    """
+    return _parse_records(_records_from_data(_decode_json(fp.read())), source_file, deduplicate)
+
+
+def _attach_meta(model: Union[Post, Comment], crawl_time: Optional[datetime], source_file: str) -> None:
+    """
+    就地写入抓取时间和源文件
+
+    仅用于刚解析出、尚未对外暴露的模型：绕过 frozen 直接写 __dict__，
+    省去每条记录一次 model_copy。字段集合同步更新，与 model_copy(update=...) 行为一致。
+    """
+    model.__dict__['crawl_time'] = crawl_time
+    model.__dict__['source_file'] = source_file
+    model.__pydantic_fields_set__.update(('crawl_time', 'source_file'))
+
+
+def _parse_records(records: Iterable[Any], source_file: str, deduplicate: bool) -> ParsedData:
+    """解析记录序列，source_file 非空时从中检测平台和抓取时间"""
     # 从文件名检测平台和抓取时间
-    platform_from_name = detect_platform_from_filename(str(path))
-    crawl_time = extract_crawl_time_from_filename(str(path))
-    source_file = str(path)
+    platform_from_name = detect_platform_from_filename(source_file) if source_file else None
+    crawl_time = extract_crawl_time_from_filename(source_file) if source_file else None
 
     # 初始化结果
     posts: List[Post] = []
     comments: List[Comment] = []
     errors: List[str] = []
     detected_platform: Optional[Platform] = None
+    total_records = 0
 
     # 解析每条记录
-    for idx, record in enumerate(data):
+    for idx, record in enumerate(records):
+        total_records = idx + 1
         if not isinstance(record, dict):
             errors.append(f'第 {idx + 1} 条记录不是字典类型')
             continue
 
-        # 先尝试自动检测平台
+        # 先尝试自动检测平台；无法识别时直接记错，不再交给 parse_post/parse_comment 重复检测
         detected = platform_from_name or detect_platform(record)
+        if detected is None:
+            errors.append(f'第 {idx + 1} 条记录无法识别平台或格式')
+            continue
 
         # 根据字段特征判断是评论还是帖子
         # 评论通常有 comment_id 或 content + parent_comment_id
@@ -519,12 +649,7 @@ def parse_json_file(file_path: Union[str, Path], deduplicate: bool = False) -> P
             if comment:
                 # 添加抓取时间和源文件信息
                 if crawl_time or source_file:
-                    comment = comment.model_copy(
-                        update={
-                            'crawl_time': crawl_time,
-                            'source_file': source_file,
-                        }
-                    )
+                    _attach_meta(comment, crawl_time, source_file)
                 comments.append(comment)
                 if detected_platform is None:
                     detected_platform = comment.platform
@@ -535,12 +660,7 @@ def parse_json_file(file_path: Union[str, Path], deduplicate: bool = False) -> P
             if post:
                 # 添加抓取时间和源文件信息
                 if crawl_time or source_file:
-                    post = post.model_copy(
-                        update={
-                            'crawl_time': crawl_time,
-                            'source_file': source_file,
-                        }
-                    )
+                    _attach_meta(post, crawl_time, source_file)
                 posts.append(post)
                 if detected_platform is None:
                     detected_platform = post.platform
@@ -553,7 +673,7 @@ def parse_json_file(file_path: Union[str, Path], deduplicate: bool = False) -> P
         posts=posts,
         comments=comments,
         platform=detected_platform,
-        total_records=len(data),
+        total_records=total_records,
         success_count=len(posts) + len(comments),
         error_count=len(errors),
         errors=errors,
@@ -566,13 +686,27 @@ def parse_json_file(file_path: Union[str, Path], deduplicate: bool = False) -> P
     return result
 
 
-def parse_json_files(file_paths: List[Union[str, Path]], deduplicate: bool = True) -> ParsedData:
+def _parse_json_file_or_error(file_path: Union[str, Path]) -> Tuple[Optional[ParsedData], Optional[str]]:
+    """解析单个文件，异常转为错误信息（模块级函数，可在进程池中执行）"""
+    try:
+        return parse_json_file(file_path), None
+    except Exception as e:
+        return None, f'{file_path}: {str(e)}'
+
+
+def parse_json_files(
+    file_paths: List[Union[str, Path]],
+    deduplicate: bool = True,
+    max_workers: int = 1,
+) -> ParsedData:
     """
     批量解析多个 JSON 文件
 
     Args:
         file_paths: JSON 文件路径列表
         deduplicate: 是否自动去重（默认 True）
+        max_workers: 并行解析的进程数（默认 1 即串行；文件多且大时可设为 CPU 核数，
+            小文件的进程启动和结果传输开销会超过收益）
 
     Returns:
         合并的 ParsedData（已去重，如果 deduplicate=True）
@@ -583,17 +717,26 @@ def parse_json_files(file_paths: List[Union[str, Path]], deduplicate: bool = Tru
     total_records = 0
     detected_platform: Optional[Platform] = None
 
-    for file_path in file_paths:
-        try:
-            result = parse_json_file(file_path)
-            all_posts.extend(result.posts)
-            all_comments.extend(result.comments)
-            all_errors.extend(result.errors)
-            total_records += result.total_records
-            if detected_platform is None and result.platform:
-                detected_platform = result.platform
-        except Exception as e:
-            all_errors.append(f'{file_path}: {str(e)}')
+    # 各文件独立解析，合并与去重在主进程按原顺序进行
+    if max_workers > 1 and len(file_paths) > 1:
+        # 按需导入：进程池会拉起 multiprocessing，串行解析不必承担其导入开销
+        from concurrent.futures import ProcessPoolExecutor
+
+        with ProcessPoolExecutor(max_workers=min(max_workers, len(file_paths))) as pool:
+            outcomes = list(pool.map(_parse_json_file_or_error, file_paths))
+    else:
+        outcomes = map(_parse_json_file_or_error, file_paths)
+
+    for result, error in outcomes:
+        if result is None:
+            all_errors.append(error)
+            continue
+        all_posts.extend(result.posts)
+        all_comments.extend(result.comments)
+        all_errors.extend(result.errors)
+        total_records += result.total_records
+        if detected_platform is None and result.platform:
+            detected_platform = result.platform
 
     merged_data = ParsedData(
         posts=all_posts,
@@ -617,36 +760,36 @@ def parse_json_files(file_paths: List[Union[str, Path]], deduplicate: bool = Tru
 # =============================================================================
 
 
-def posts_to_dataframe(posts: List[Post]) -> Any:
+def _models_to_dataframe(models: List[Union[Post, Comment]], model_cls: type) -> Any:
     """
-    将 Post 列表转换为 pandas DataFrame
-
-    Args:
-        posts: Post 列表
+    按列构建 DataFrame（排除 raw_data，create_time 转为 ISO 字符串）
 
-    Returns:
-        pandas DataFrame
+    直接逐字段取属性组成列，不为每条记录 model_dump 出一个字典再交给 pandas 按行组装
     """
     try:
         import pandas as pd
     except ImportError:
         raise ImportError('需要安装 pandas: uv add pandas')
 
-    if not posts:
+    if not models:
         return pd.DataFrame()
 
-    # 转换为字典列表（排除 raw_data）
-    data = []
-    for post in posts:
-        d = post.model_dump(exclude={'raw_data'})
-        # 转换 datetime 为字符串
-        if d.get('create_time'):
-            d['create_time'] = (
-                d['create_time'].isoformat() if isinstance(d['create_time'], datetime) else d['create_time']
-            )
-        data.append(d)
+    columns = {name: [getattr(m, name) for m in models] for name in model_cls.model_fields if name != 'raw_data'}
+    columns['create_time'] = [t.isoformat() if isinstance(t, datetime) else t for t in columns['create_time']]
+    return pd.DataFrame(columns)
+
+
+def posts_to_dataframe(posts: List[Post]) -> Any:
+    """
+    将 Post 列表转换为 pandas DataFrame
+
+    Args:
+        posts: Post 列表
 
-    return pd.DataFrame(data)
+    Returns:
+        pandas DataFrame
+    """
+    return _models_to_dataframe(posts, Post)
 
 
 def comments_to_dataframe(comments: List[Comment]) -> Any:
@@ -659,23 +802,4 @@ def comments_to_dataframe(comments: List[Comment]) -> Any:
     Returns:
         pandas DataFrame
     """
-    try:
-        import pandas as pd
-    except ImportError:
-        raise ImportError('需要安装 pandas: uv add pandas')
-
-    if not comments:
-        return pd.DataFrame()
-
-    # 转换为字典列表（排除 raw_data）
-    data = []
-    for comment in comments:
-        d = comment.model_dump(exclude={'raw_data'})
-        # 转换 datetime 为字符串
-        if d.get('create_time'):
-            d['create_time'] = (
-                d['create_time'].isoformat() if isinstance(d['create_time'], datetime) else d['create_time']
-            )
-        data.append(d)
-
-    return pd.DataFrame(data)
+    return _models_to_dataframe(comments, Comment)
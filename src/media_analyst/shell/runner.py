@@ -7,10 +7,17 @@ CrawlerRunner - 爬虫执行器
 - 停止进程
 """
 
+import contextlib
+import io
+import locale
+import os
+import queue
+import signal
 import subprocess
+import threading
 import time
 from pathlib import Path
-from typing import Iterator, Optional
+from typing import IO, Iterator, List, Optional, Tuple
 
 from media_analyst.core.models import (
     CrawlerExecution,
@@ -18,6 +25,15 @@ from media_analyst.core.models import (
 )
 from media_analyst.core.params import build_command
 
+# 子进程管道的读缓冲大小：一次 read() 读入多行日志，减少系统调用次数
+PIPE_BUFFER_SIZE = 64 * 1024
+
+# 子进程输出的编码（与 text=True 时 Popen 使用的编码一致）；管道以字节读取，整批完整行一次解码
+OUTPUT_ENCODING = locale.getpreferredencoding(False)
+
+# POSIX 下子进程在独立会话（进程组）中运行，停止时连同其派生的浏览器等子进程一起终止
+USE_PROCESS_GROUP = os.name == 'posix'
+
 
 class CrawlerRunnerError(Exception):
     """爬虫运行器错误"""
@@ -37,6 +53,89 @@ class ProcessError(CrawlerRunnerError):
     pass
 
 
+def _decode_lines(data: bytes) -> List[str]:
+    """
+    将一批字节输出解码并按行切分
+
+    只按 \\n 切分，每行去掉一个结尾的 \\r（兼容 CRLF 换行）；
+    进度条用单独的 \\r 刷新同一行，不拆成多行
+    """
+    text = data.decode(OUTPUT_ENCODING, 'replace')
+    if not text:
+        return []
+    lines = text.split('\n')
+    if text.endswith('\n'):
+        lines.pop()
+    return [line[:-1] if line.endswith('\r') else line for line in lines]
+
+
+def _pump_stream(stream: IO[bytes], is_stderr: bool, output_queue: queue.Queue) -> None:
+    """
+    读取管道直到 EOF，将 (is_stderr, lines) 放入队列（在独立线程中运行）
+
+    每次读入一整块（最多 PIPE_BUFFER_SIZE），在新块中找到最后一个换行，
+    一次性解码块内完整的行并整批放入队列，不完整的末行留到下一块；
+    读取结束后放入 (is_stderr, None) 作为 EOF 标记
+    """
+    # 直接读底层文件描述符，每次读入同一块复用的缓冲区，稳态下不为每块分配新的 bytes
+    raw = io.FileIO(stream.fileno(), 'rb', closefd=False)
+    buffer = bytearray(PIPE_BUFFER_SIZE)
+    view = memoryview(buffer)
+    # 上一块留下的不完整行；换行只在新读入的块中查找，不会重复扫描已缓存的部分
+    pending = bytearray()
+    try:
+        while n := raw.readinto(buffer):
+            cut = buffer.rfind(b'\n', 0, n) + 1
+            if not cut:
+                pending += view[:n]
+                continue
+            pending += view[:cut]
+            output_queue.put((is_stderr, _decode_lines(pending)))
+            pending.clear()
+            pending += view[cut:n]
+
+        # 没有以换行结尾的最后一行
+        if pending:
+            output_queue.put((is_stderr, _decode_lines(pending)))
+    finally:
+        output_queue.put((is_stderr, None))
+
+
+def _signal_process(process: subprocess.Popen, force: bool = False) -> None:
+    """
+    向子进程发送终止信号（force=True 时强制杀死）
+
+    POSIX 下信号发给整个进程组（进程组 ID 即子进程 PID），避免遗留孤儿进程
+    """
+    if USE_PROCESS_GROUP:
+        with contextlib.suppress(ProcessLookupError):
+            os.killpg(process.pid, signal.SIGKILL if force else signal.SIGTERM)
+        return
+
+    if force:
+        process.kill()
+    else:
+        process.terminate()
+
+
+def _terminate_process(process: subprocess.Popen) -> None:
+    """终止子进程并等待退出：先优雅终止，5 秒内未退出则强制杀死"""
+    _signal_process(process)
+
+    try:
+        process.wait(timeout=5)
+    except subprocess.TimeoutExpired:
+        _signal_process(process, force=True)
+        process.wait()
+
+
+def _remaining(deadline: Optional[float]) -> Optional[float]:
+    """距截止时间的剩余秒数（不小于 0），None 表示不限时"""
+    if deadline is None:
+        return None
+    return max(0.0, deadline - time.monotonic())
+
+
 class CrawlerRunner:
     """
     爬虫执行器
@@ -88,6 +187,10 @@ class CrawlerRunner:
         # 跟踪当前运行的进程
         self._current_process: Optional[subprocess.Popen] = None
         self._current_execution: Optional[CrawlerExecution] = None
+        # 管道读取线程的输出队列及尚未读到 EOF 的管道数（首次读取输出时创建）
+        self._output_queue: Optional[queue.Queue] = None
+        self._open_streams = 0
+        self._reader_threads: List[threading.Thread] = []
 
     def start(self, request: CrawlerRequest) -> CrawlerExecution:
         """
@@ -111,7 +214,7 @@ class CrawlerRunner:
         cmd = build_command(request, use_uv=self.use_uv)
 
         # 创建执行状态对象
-        execution = CrawlerExecution(request=request)
+        execution = CrawlerExecution.pending(request)
 
         try:
             # 启动进程
@@ -120,8 +223,9 @@ class CrawlerRunner:
                 cwd=self.media_crawler_path,
                 stdout=subprocess.PIPE,
                 stderr=subprocess.PIPE,
-                text=True,
-                bufsize=1,  # 行缓冲
+                bufsize=0,
+                close_fds=True,
+                start_new_session=USE_PROCESS_GROUP,
             )
         except FileNotFoundError as e:
             raise ProcessError(f'找不到命令: {cmd[0]}。请确保已安装 uv') from e
@@ -134,6 +238,7 @@ class CrawlerRunner:
         # 保存引用
         self._current_process = process
         self._current_execution = execution
+        self._output_queue = None
 
         return execution
 
@@ -157,21 +262,22 @@ class CrawlerRunner:
         process = self._current_process
 
         # 读取可用输出（非阻塞）
-        # 注意：Popen.stdout.readline() 在 bufsize=1 和 text=True 时
-        # 会尽可能读取，但如果没有新行会阻塞，所以我们需要谨慎
+        # 注意：Popen.stdout.readline() 在没有新行时会阻塞，所以这里不读取管道
 
         # 简单实现：只检查进程是否结束
         return_code = process.poll()
 
         if return_code is not None:
-            # 进程已结束，读取剩余输出
-            stdout, stderr = process.communicate()
-            if stdout:
-                for line in stdout.split('\n'):
+            if self._output_queue is not None:
+                # 管道已由读取线程接管（之前读过实时输出），从队列取剩余输出
+                self._finish_readers(execution)
+            else:
+                # 进程已结束，读取剩余输出
+                stdout, stderr = process.communicate()
+                for line in _decode_lines(stdout or b''):
                     if line:
                         execution.add_output(line)
-            if stderr:
-                for line in stderr.split('\n'):
+                for line in _decode_lines(stderr or b''):
                     if line:
                         execution.add_output(line, is_stderr=True)
 
@@ -179,8 +285,7 @@ class CrawlerRunner:
             execution.mark_completed(return_code)
 
             # 清理
-            self._current_process = None
-            self._current_execution = None
+            self._clear_current()
 
         return execution
 
@@ -188,7 +293,6 @@ class CrawlerRunner:
         self,
         execution: CrawlerExecution,
         timeout: Optional[float] = None,
-        poll_interval: float = 0.1,
     ) -> Iterator[str]:
         """
         迭代输出（阻塞，生成器模式）
@@ -198,10 +302,32 @@ class CrawlerRunner:
         Args:
             execution: 执行状态
             timeout: 超时时间（秒），None 表示不超时
-            poll_interval: 轮询间隔（秒）
 
         Yields:
-            输出行（实时）
+            输出行（实时），stderr 的行带 "[stderr] " 前缀
+
+        Raises:
+            TimeoutError: 如果超时
+        """
+        for lines in self.iter_output_batches(execution, timeout=timeout):
+            yield from lines
+
+    def iter_output_batches(
+        self,
+        execution: CrawlerExecution,
+        timeout: Optional[float] = None,
+    ) -> Iterator[List[str]]:
+        """
+        按批迭代输出（阻塞，生成器模式）
+
+        每批是管道一次读取到的全部完整行，适合整批写出（如一次 print），避免逐行写入
+
+        Args:
+            execution: 执行状态
+            timeout: 超时时间（秒），None 表示不超时
+
+        Yields:
+            一批输出行，stderr 的行带 "[stderr] " 前缀
 
         Raises:
             TimeoutError: 如果超时
@@ -210,45 +336,107 @@ class CrawlerRunner:
             raise ProcessError('进程未启动')
 
         process = self._current_process
-        start_time = time.time()
+        output_queue = self._ensure_readers()
 
-        # 实时读取输出
-        while True:
-            # 检查超时
-            if timeout is not None:
-                elapsed = time.time() - start_time
-                if elapsed > timeout:
-                    self.stop(execution)
-                    raise TimeoutError(f'执行超时（{timeout}秒）')
+        deadline = None if timeout is None else time.monotonic() + timeout
 
-            # 读取一行（阻塞直到有数据或进程结束）
-            line = process.stdout.readline() if process.stdout else ''
+        # 阻塞等待新输出直到截止时间，不再按固定间隔轮询
+        while self._open_streams:
+            try:
+                item = output_queue.get(timeout=_remaining(deadline))
+            except queue.Empty:
+                self.stop(execution)
+                raise TimeoutError(f'执行超时（{timeout}秒）')
 
-            if line:
-                line = line.rstrip('\n')
-                execution.add_output(line)
-                yield line
+            lines = self._handle_output(execution, item)
+            if lines:
+                yield lines
 
-            # 检查进程是否结束
-            return_code = process.poll()
-            if return_code is not None and not line:
-                # 读取 stderr 剩余内容
-                if process.stderr:
-                    stderr_remaining = process.stderr.read()
-                    if stderr_remaining:
-                        for err_line in stderr_remaining.split('\n'):
-                            if err_line:
-                                execution.add_output(err_line, is_stderr=True)
-                                yield f'[stderr] {err_line}'
+        # 管道均已关闭，等待进程退出
+        try:
+            return_code = process.wait(timeout=_remaining(deadline))
+        except subprocess.TimeoutExpired:
+            self.stop(execution)
+            raise TimeoutError(f'执行超时（{timeout}秒）')
 
-                execution.mark_completed(return_code)
-                self._current_process = None
-                self._current_execution = None
+        execution.mark_completed(return_code)
+        self._clear_current()
+
+    def drain_output(self, execution: CrawlerExecution) -> List[str]:
+        """
+        取出当前已到达的输出（非阻塞）
+
+        适用于 UI 定时刷新：每次调用只返回自上次调用以来的新行，
+        管道关闭且进程退出后将执行标记为完成
+
+        Args:
+            execution: 执行状态
+
+        Returns:
+            新的输出行，stderr 的行带 "[stderr] " 前缀
+        """
+        if execution.is_finished or self._current_process is None:
+            return []
+
+        process = self._current_process
+        output_queue = self._ensure_readers()
+
+        lines = []
+        while self._open_streams:
+            try:
+                item = output_queue.get_nowait()
+            except queue.Empty:
                 break
 
-            if not line:
-                # 没有新数据，短暂等待
-                time.sleep(poll_interval)
+            lines += self._handle_output(execution, item)
+
+        if not self._open_streams:
+            return_code = process.poll()
+            if return_code is not None:
+                execution.mark_completed(return_code)
+                self._clear_current()
+
+        return lines
+
+    def _ensure_readers(self) -> queue.Queue:
+        """启动管道读取线程（每个进程只启动一次），返回输出队列"""
+        if self._output_queue is None:
+            process = self._current_process
+            # stdout/stderr 各由一个线程读取，避免阻塞在一个管道上时另一个管道写满导致死锁
+            self._output_queue = queue.Queue()
+            streams = [(s, is_err) for s, is_err in ((process.stdout, False), (process.stderr, True)) if s is not None]
+            self._reader_threads = [
+                threading.Thread(target=_pump_stream, args=(stream, is_stderr, self._output_queue), daemon=True)
+                for stream, is_stderr in streams
+            ]
+            for thread in self._reader_threads:
+                thread.start()
+            self._open_streams = len(streams)
+        return self._output_queue
+
+    def _finish_readers(self, execution: CrawlerExecution) -> None:
+        """取出读取线程剩余的全部输出（阻塞到所有管道 EOF），并等待线程退出"""
+        while self._open_streams:
+            self._handle_output(execution, self._output_queue.get())
+        for thread in self._reader_threads:
+            thread.join()
+
+    def _handle_output(self, execution: CrawlerExecution, item: Tuple[bool, Optional[List[str]]]) -> List[str]:
+        """记录队列中取出的一批输出，返回用于显示的行（EOF 标记返回空列表）"""
+        is_stderr, lines = item
+        if lines is None:
+            self._open_streams -= 1
+            return []
+
+        execution.add_outputs(lines, is_stderr=is_stderr)
+        return [f'[stderr] {line}' for line in lines] if is_stderr else lines
+
+    def _clear_current(self) -> None:
+        """清理当前进程状态"""
+        self._current_process = None
+        self._current_execution = None
+        self._output_queue = None
+        self._reader_threads = []
 
     def wait(
         self,
@@ -289,6 +477,47 @@ class CrawlerRunner:
 
         return execution
 
+    def run_quiet(self, request: CrawlerRequest, timeout: Optional[float] = None) -> CrawlerExecution:
+        """
+        运行爬虫直到结束，不读取实时输出（阻塞）
+
+        由 communicate() 一次性读完两个管道，适用于只关心最终结果的场景；
+        stdout 与 stderr 分别收集，两者之间的先后顺序不保留
+
+        Args:
+            request: 爬虫请求模型
+            timeout: 超时时间（秒），None 表示不超时
+
+        Returns:
+            最终执行状态（超时则为 TIMEOUT）
+
+        Raises:
+            ProcessError: 如果已有进程在运行或启动失败
+        """
+        execution = self.start(request)
+        process = self._current_process
+
+        try:
+            stdout, stderr = process.communicate(timeout=timeout)
+        except subprocess.TimeoutExpired:
+            # 直接标记为超时，不经过 STOPPED 状态
+            _terminate_process(process)
+            execution.mark_timeout()
+            self._clear_current()
+            return execution
+
+        for line in _decode_lines(stdout):
+            if line:
+                execution.add_output(line)
+        for line in _decode_lines(stderr):
+            if line:
+                execution.add_output(line, is_stderr=True)
+
+        execution.mark_completed(process.returncode)
+        self._clear_current()
+
+        return execution
+
     def stop(self, execution: CrawlerExecution) -> CrawlerExecution:
         """
         停止执行中的爬虫
@@ -306,24 +535,11 @@ class CrawlerRunner:
             execution.mark_failed('进程未启动')
             return execution
 
-        process = self._current_process
-
-        # 尝试优雅终止
-        process.terminate()
-
-        try:
-            # 等待 5 秒
-            process.wait(timeout=5)
-        except subprocess.TimeoutExpired:
-            # 强制终止
-            process.kill()
-            process.wait()
-
+        _terminate_process(self._current_process)
         execution.mark_stopped()
 
         # 清理
-        self._current_process = None
-        self._current_execution = None
+        self._clear_current()
 
         return execution
 
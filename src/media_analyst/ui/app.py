@@ -11,18 +11,25 @@ Functional Core, Imperative Shell 架构：
 """
 
 import platform as _platform_module
+from collections import deque
+from dataclasses import replace
+from pathlib import Path
 
 import streamlit as st
 
 # 使用绝对导入（假设通过 pip install -e . 安装）
 from media_analyst.core import (
+    CRAWLER_TYPE_KEYS,
     CRAWLER_TYPES,
+    LOGIN_TYPE_KEYS,
     LOGIN_TYPES,
+    PLATFORM_KEYS,
     PLATFORMS,
     SAVE_OPTIONS,
     CrawlerExecution,
     CreatorRequest,
     DetailRequest,
+    ExecutionStatus,
     LoginType,
     Platform,
     SaveOption,
@@ -41,11 +48,21 @@ from media_analyst.ui.persistence import (
     save_preferences,
 )
 
+# 实时输出区域显示的最大行数
+OUTPUT_TAIL_LINES = 100
+# 实时输出区域的刷新间隔（秒）
+OUTPUT_RENDER_INTERVAL = 0.5
+# 爬虫运行超时时间（秒）
+CRAWL_TIMEOUT = 300
 
-def render_sidebar() -> dict:
+
+def render_sidebar(media_crawler_path: Path) -> dict:
     """
     渲染侧边栏，返回通用配置
 
+    Args:
+        media_crawler_path: 当前 MediaCrawler 路径（本次运行已解析）
+
     Returns:
         包含通用配置的字典
     """
@@ -53,14 +70,9 @@ def render_sidebar() -> dict:
     prefs = load_preferences()
 
     # 计算各选项的索引
-    platform_options = list(PLATFORMS.keys())
-    platform_index = platform_options.index(prefs.platform) if prefs.platform in platform_options else 0
-
-    login_options = list(LOGIN_TYPES.keys())
-    login_index = login_options.index(prefs.login_type) if prefs.login_type in login_options else 0
-
-    crawler_options = list(CRAWLER_TYPES.keys())
-    crawler_index = crawler_options.index(prefs.crawler_type) if prefs.crawler_type in crawler_options else 0
+    platform_index = PLATFORM_KEYS.index(prefs.platform) if prefs.platform in PLATFORMS else 0
+    login_index = LOGIN_TYPE_KEYS.index(prefs.login_type) if prefs.login_type in LOGIN_TYPES else 0
+    crawler_index = CRAWLER_TYPE_KEYS.index(prefs.crawler_type) if prefs.crawler_type in CRAWLER_TYPES else 0
 
     save_index = SAVE_OPTIONS.index(prefs.save_option) if prefs.save_option in SAVE_OPTIONS else 0
 
@@ -69,7 +81,7 @@ def render_sidebar() -> dict:
 
         platform = st.selectbox(
             '选择平台',
-            options=platform_options,
+            options=PLATFORM_KEYS,
             index=platform_index,
             format_func=lambda x: f'{x} - {PLATFORMS[x]}',
             help='选择要爬取的平台',
@@ -77,7 +89,7 @@ def render_sidebar() -> dict:
 
         login_type = st.selectbox(
             '登录方式',
-            options=login_options,
+            options=LOGIN_TYPE_KEYS,
             index=login_index,
             format_func=lambda x: LOGIN_TYPES[x],
             help='选择登录方式',
@@ -85,7 +97,7 @@ def render_sidebar() -> dict:
 
         crawler_type = st.selectbox(
             '爬虫类型',
-            options=crawler_options,
+            options=CRAWLER_TYPE_KEYS,
             index=crawler_index,
             format_func=lambda x: CRAWLER_TYPES[x],
             help='选择爬取模式',
@@ -94,50 +106,57 @@ def render_sidebar() -> dict:
         st.divider()
         st.header('🔧 通用设置')
 
-        save_option = st.selectbox(
-            '保存格式',
-            options=SAVE_OPTIONS,
-            index=save_index,
-            help='数据保存格式',
-        )
+        # 通用设置放在表单中：填写过程中不触发整页重跑，点击「应用设置」后统一生效
+        with st.form('common_settings_form', border=False):
+            save_option = st.selectbox(
+                '保存格式',
+                options=SAVE_OPTIONS,
+                index=save_index,
+                help='数据保存格式',
+            )
 
-        save_path = st.text_input(
-            '保存路径 (可选)',
-            value=prefs.save_path,
-            placeholder='默认: MediaCrawler/data/',
-            help='自定义数据保存路径，留空使用默认路径',
-        )
+            save_path = st.text_input(
+                '保存路径 (可选)',
+                value=prefs.save_path,
+                placeholder='默认: MediaCrawler/data/',
+                help='自定义数据保存路径，留空使用默认路径',
+            )
 
-        max_comments = st.number_input(
-            '单篇最大评论数',
-            min_value=0,
-            max_value=10000,
-            value=prefs.max_comments,
-            help='每篇笔记/视频获取的最大评论数，0表示不限制',
-        )
+            max_comments = st.number_input(
+                '单篇最大评论数',
+                min_value=0,
+                max_value=10000,
+                value=prefs.max_comments,
+                help='每篇笔记/视频获取的最大评论数，0表示不限制',
+            )
+
+            col1, col2 = st.columns(2)
+            with col1:
+                get_comment = st.checkbox('获取评论', value=prefs.get_comment)
+            with col2:
+                get_sub_comment = st.checkbox('获取子评论', value=prefs.get_sub_comment)
 
-        col1, col2 = st.columns(2)
-        with col1:
-            get_comment = st.checkbox('获取评论', value=prefs.get_comment)
-        with col2:
-            get_sub_comment = st.checkbox('获取子评论', value=prefs.get_sub_comment)
+            headless = st.checkbox('无头模式', value=prefs.headless, help='后台运行浏览器（不显示窗口）')
 
-        headless = st.checkbox('无头模式', value=prefs.headless, help='后台运行浏览器（不显示窗口）')
+            quiet_mode = st.checkbox(
+                '静默模式（仅显示最终输出）', value=False, help='不实时刷新输出，爬取结束后一次性显示结果'
+            )
+
+            st.form_submit_button('✔️ 应用设置', use_container_width=True)
+            st.caption('修改通用设置后需点击「应用设置」才会生效')
 
         # MediaCrawler 路径配置
         st.divider()
         st.header('📁 MediaCrawler 路径')
 
-        # 获取当前路径
-        current_mc_path = get_media_crawler_path()
-        st.caption(f'当前: {current_mc_path}')
+        st.caption(f'当前: {media_crawler_path}')
 
         # 路径选择
         path_options = get_media_crawler_path_options()
         path_options_str = [str(p) for p in path_options]
 
         # 如果当前路径不在选项中，添加它
-        current_str = str(current_mc_path)
+        current_str = str(media_crawler_path)
         if current_str not in path_options_str:
             path_options_str.insert(0, current_str)
 
@@ -167,8 +186,7 @@ def render_sidebar() -> dict:
                     st.error('❌ 无效路径，请确保是 MediaCrawler 根目录')
             else:
                 # 清空自定义路径，使用自动检测
-                prefs = load_preferences()
-                prefs.media_crawler_path = ''
+                prefs = replace(load_preferences(), media_crawler_path='')
                 save_preferences(prefs)
                 st.success('✅ 已重置为自动检测')
                 st.rerun()
@@ -183,10 +201,11 @@ def render_sidebar() -> dict:
         'get_comment': get_comment,
         'get_sub_comment': get_sub_comment,
         'headless': headless,
+        'quiet_mode': quiet_mode,
     }
 
 
-def render_search_form() -> dict:
+def render_search_form(platform: str) -> dict:
     """渲染搜索模式表单"""
     st.subheader('🔍 搜索模式配置')
     keywords = st.text_area(
@@ -194,11 +213,9 @@ def render_search_form() -> dict:
         placeholder='输入关键词，多个用逗号分隔，如：美食,旅游,穿搭',
         help='输入要搜索的关键词',
     )
-    start_page = st.number_input('起始页码', min_value=1, value=1, help='从第几页开始爬取')
 
     return {
         'keywords': keywords,
-        'start_page': start_page,
     }
 
 
@@ -239,16 +256,13 @@ def render_detail_form(platform: str) -> dict:
         elif specified_ids.strip():
             st.warning('⚠️ 未识别到有效的抖音链接')
 
-    start_page = st.number_input('起始页码', min_value=1, value=1)
-
     return {
         'specified_ids': specified_ids,
-        'start_page': start_page,
         'parsed_links': parsed_links,
     }
 
 
-def render_creator_form() -> dict:
+def render_creator_form(platform: str) -> dict:
     """渲染创作者模式表单"""
     st.subheader('👤 创作者模式配置')
     creator_ids = st.text_area(
@@ -256,14 +270,28 @@ def render_creator_form() -> dict:
         placeholder='输入创作者主页 URL 或 ID，多个用逗号分隔',
         help='输入创作者主页链接或ID',
     )
-    start_page = st.number_input('起始页码', min_value=1, value=1)
 
     return {
         'creator_ids': creator_ids,
-        'start_page': start_page,
     }
 
 
+# 爬虫类型 -> 模式表单渲染函数（统一签名：接收平台 key，返回模式配置）
+MODE_FORM_RENDERERS = {
+    'search': render_search_form,
+    'detail': render_detail_form,
+    'creator': render_creator_form,
+}
+
+
+# 爬虫类型 -> (请求模型, 模式配置中的必填字段, 未填写时的错误信息)
+MODE_REQUESTS = {
+    'search': (SearchRequest, 'keywords', '搜索模式必须填写关键词'),
+    'detail': (DetailRequest, 'specified_ids', '详情模式必须填写笔记/视频 URL 或 ID'),
+    'creator': (CreatorRequest, 'creator_ids', '创作者模式必须填写创作者 ID'),
+}
+
+
 def build_request(common_config: dict, mode_config: dict) -> SearchRequest | DetailRequest | CreatorRequest:
     """
     构建爬虫请求模型（Core - 纯函数）
@@ -296,48 +324,44 @@ def build_request(common_config: dict, mode_config: dict) -> SearchRequest | Det
         'max_comments': common_config['max_comments'],
         'save_path': common_config['save_path'],
     }
+    start_page = mode_config.get('start_page', 1)
 
     # 根据类型构建具体请求（不合法状态无法表示）
-    if crawler_type == 'search':
-        keywords = mode_config.get('keywords', '').strip()
-        if not keywords:
-            raise ValueError('搜索模式必须填写关键词')
-        return SearchRequest(
-            **common,
-            keywords=keywords,
-            start_page=mode_config.get('start_page', 1),
-        )
+    mode_request = MODE_REQUESTS.get(crawler_type)
+    if mode_request is None:
+        raise ValueError(f'未知的爬虫类型: {crawler_type}')
+    request_cls, field, missing_error = mode_request
 
-    elif crawler_type == 'detail':
-        # 如果存在解析后的链接（抖音平台），使用标准化后的链接
-        parsed_links = mode_config.get('parsed_links', [])
-        if parsed_links:
-            # 使用标准化后的链接，逗号分隔
-            normalized_urls = [link.normalized for link in parsed_links]
-            specified_ids = ','.join(normalized_urls)
-        else:
-            specified_ids = mode_config.get('specified_ids', '').strip()
-
-        if not specified_ids:
-            raise ValueError('详情模式必须填写笔记/视频 URL 或 ID')
-        return DetailRequest(
-            **common,
-            specified_ids=specified_ids,
-            start_page=mode_config.get('start_page', 1),
-        )
+    # 如果存在解析后的链接（抖音详情模式），使用标准化后的链接，逗号分隔
+    parsed_links = mode_config.get('parsed_links')
+    if parsed_links:
+        value = ','.join(link.normalized for link in parsed_links)
+    else:
+        value = mode_config.get(field, '').strip()
 
-    elif crawler_type == 'creator':
-        creator_ids = mode_config.get('creator_ids', '').strip()
-        if not creator_ids:
-            raise ValueError('创作者模式必须填写创作者 ID')
-        return CreatorRequest(
-            **common,
-            creator_ids=creator_ids,
-            start_page=mode_config.get('start_page', 1),
-        )
+    if not value:
+        raise ValueError(missing_error)
+    return request_cls(**common, **{field: value}, start_page=start_page)
 
-    else:
-        raise ValueError(f'未知的爬虫类型: {crawler_type}')
+
+def build_request_cached(common_config: dict, mode_config: dict) -> SearchRequest | DetailRequest | CreatorRequest:
+    """
+    带会话缓存的 build_request
+
+    Streamlit 每次交互都会重跑脚本，输入未变化时直接复用上次构建的请求模型，
+    跳过 Pydantic 校验。只缓存最近一次结果，构建失败（ValueError）不缓存。
+    """
+    key = (
+        tuple(common_config.items()),
+        tuple((k, tuple(v) if isinstance(v, list) else v) for k, v in mode_config.items()),
+    )
+    cached = st.session_state.get('_request_cache')
+    if cached is not None and cached[0] == key:
+        return cached[1]
+
+    request = build_request(common_config, mode_config)
+    st.session_state._request_cache = (key, request)
+    return request
 
 
 def open_results_directory(save_path: str | None) -> None:
@@ -378,63 +402,165 @@ def open_results_directory(save_path: str | None) -> None:
         st.error(f'无法打开目录: {e}')
 
 
-def run_crawler_ui(request: SearchRequest | DetailRequest | CreatorRequest) -> CrawlerExecution | None:
+def start_crawler_ui(request: SearchRequest | DetailRequest | CreatorRequest, media_crawler_path: Path) -> bool:
     """
-    运行爬虫并显示结果（Shell - 副作用）
+    启动爬虫（Shell - 副作用）
+
+    进程在后台运行，runner 和执行状态保存在 session_state 中，
+    输出由 render_crawl_output 定时刷新，不阻塞页面脚本
+
+    Args:
+        request: 爬虫请求
+        media_crawler_path: MediaCrawler 路径
 
     Returns:
-        CrawlerExecution 对象，如果失败则返回 None
+        是否启动成功
     """
-    # 获取 MediaCrawler 路径
-    media_crawler_path = get_media_crawler_path()
+    runner = create_runner_ui(media_crawler_path)
+    if runner is None:
+        return False
+
+    try:
+        execution = runner.start(request)
+    except CrawlerRunnerError as e:
+        st.error(f'❌ {e}')
+        return False
+    except Exception as e:
+        st.error(f'❌ 运行出错: {str(e)}')
+        return False
+
+    st.session_state.crawl_runner = runner
+    st.session_state.crawl_execution = execution
+    # 只保留最后 100 行输出
+    st.session_state.crawl_output = deque(maxlen=OUTPUT_TAIL_LINES)
+    st.session_state.crawl_output_text = ''
+    return True
+
+
+def run_crawler_quiet_ui(request: SearchRequest | DetailRequest | CreatorRequest, media_crawler_path: Path) -> None:
+    """
+    静默运行爬虫（Shell - 副作用）
 
+    阻塞直到爬虫结束，不刷新实时输出；结果保存到 session_state 供 render_crawl_result 显示。
+    输出中 stdout 的行在前、stderr 的行在后，两者原本的交错顺序不保留
+    """
+    runner = create_runner_ui(media_crawler_path)
+    if runner is None:
+        return
+
+    try:
+        with st.spinner('🔄 正在运行爬虫（静默模式）...'):
+            execution = runner.run_quiet(request, timeout=CRAWL_TIMEOUT)
+    except CrawlerRunnerError as e:
+        st.error(f'❌ {e}')
+        return
+    except Exception as e:
+        st.error(f'❌ 运行出错: {str(e)}')
+        return
+
+    st.session_state.crawl_execution = execution
+    st.session_state.crawl_output = deque(execution.stdout_lines + execution.stderr_lines, maxlen=OUTPUT_TAIL_LINES)
+    st.session_state.crawl_output_text = '\n'.join(st.session_state.crawl_output)
+
+
+def create_runner_ui(media_crawler_path: Path) -> CrawlerRunner | None:
+    """创建 CrawlerRunner，路径无效时显示错误并返回 None"""
     # 检查路径是否存在
     if not media_crawler_path.exists():
         st.error(f'❌ MediaCrawler 目录不存在: {media_crawler_path}')
         st.info('💡 请在侧边栏配置 MediaCrawler 路径')
         return None
 
-    # 初始化 Runner
     try:
-        runner = CrawlerRunner(media_crawler_path)
+        return CrawlerRunner(media_crawler_path)
     except CrawlerRunnerError as e:
         st.error(f'❌ {e}')
         return None
 
-    # 创建输出区域
-    st.info('🔄 正在启动爬虫...')
-    output_container = st.container()
-    output_placeholder = output_container.empty()
 
-    try:
-        # 启动爬虫
-        execution = runner.start(request)
+@st.fragment(run_every=OUTPUT_RENDER_INTERVAL)
+def render_crawl_output():
+    """
+    实时显示爬虫输出（定时重跑的 fragment）
 
-        # 实时显示输出（合并 stdout 和 stderr，使用普通文本样式）
-        all_lines = []
+    只有该片段按间隔重新运行，爬取期间修改表单不会中断输出刷新；
+    爬虫结束后触发整页重跑以显示结果
+    """
+    runner = st.session_state.get('crawl_runner')
+    execution = st.session_state.get('crawl_execution')
+    if runner is None or execution is None:
+        st.session_state.is_running = False
+        st.rerun()
 
-        for line in runner.iter_output(execution, timeout=300):  # 5分钟超时
-            if line.startswith('[stderr] '):
-                all_lines.append(line[9:])
-            else:
-                all_lines.append(line)
-            # 只显示最后100行，使用普通code样式（非红色）
-            output_placeholder.code('\n'.join(all_lines[-100:]), language='text')
+    # 实时显示输出（合并 stdout 和 stderr，使用普通文本样式）
+    # 只在有新行时重新拼接文本，没有新输出的刷新直接复用上次的结果
+    new_lines = runner.drain_output(execution)
+    if new_lines:
+        tail_lines = st.session_state.crawl_output
+        tail_lines.extend(line.removeprefix('[stderr] ') for line in new_lines)
+        st.session_state.crawl_output_text = '\n'.join(tail_lines)
 
-        # 显示结果
-        if execution.status.value == 'completed':
-            st.success(f'✅ 爬取完成！耗时 {execution.duration_seconds:.1f} 秒')
-        else:
-            st.error(f'❌ 爬取失败: {execution.error_message or "未知错误"}')
+    if not execution.is_finished and execution.duration_seconds > CRAWL_TIMEOUT:
+        runner.stop(execution)
+        execution.mark_timeout()
 
-        return execution
+    st.info('🔄 正在运行爬虫...')
+    st.code(st.session_state.crawl_output_text, language='text')
 
-    except TimeoutError:
-        st.error('❌ 执行超时（5分钟）')
-        return None
-    except Exception as e:
-        st.error(f'❌ 运行出错: {str(e)}')
-        return None
+    if execution.is_finished:
+        st.session_state.crawl_runner = None
+        st.session_state.is_running = False
+        st.rerun()
+
+
+def render_crawl_result(execution: CrawlerExecution, save_path: str | None) -> None:
+    """显示爬虫运行结果"""
+    output_text = st.session_state.get('crawl_output_text')
+    if output_text:
+        st.code(output_text, language='text')
+
+    if execution.status == ExecutionStatus.TIMEOUT:
+        st.error(f'❌ 执行超时（{CRAWL_TIMEOUT // 60}分钟）')
+        return
+
+    if execution.status != ExecutionStatus.COMPLETED:
+        st.error(f'❌ 爬取失败: {execution.error_message or "未知错误"}')
+        return
+
+    st.success(f'✅ 爬取完成！耗时 {execution.duration_seconds:.1f} 秒')
+
+    # 运行完成后，显示打开目录按钮
+    st.divider()
+    result_col1, result_col2 = st.columns([2, 1])
+
+    with result_col1:
+        # 显示输出文件
+        if execution.output_files:
+            with st.expander('📁 输出文件列表'):
+                for f in execution.output_files:
+                    st.text(f)
+
+    with result_col2:
+        # 快捷打开目录按钮
+        if st.button('📂 打开结果目录', type='primary', use_container_width=True):
+            open_results_directory(save_path)
+
+
+def render_command_preview(
+    request: SearchRequest | DetailRequest | CreatorRequest | None, preview_error: str, media_crawler_path: Path
+) -> None:
+    """渲染命令预览（请求无效时显示原因）"""
+    with st.expander('📜 命令预览', expanded=True):
+        if request is None:
+            st.warning(f'⏳ {preview_error}')
+            return
+
+        cmd_str = preview_command(request, str(media_crawler_path))
+        st.code(cmd_str, language='bash')
+
+        # 显示模型详情
+        with st.expander('🔍 请求模型详情'):
+            st.json(request.model_dump())
 
 
 # ========== 爬虫页面 ==========
@@ -477,8 +603,11 @@ def crawl_page():
     if 'is_running' not in st.session_state:
         st.session_state.is_running = False
 
+    # MediaCrawler 路径每次运行只解析一次（涉及多次文件系统检查），供侧边栏、预览和启动共用
+    media_crawler_path = get_media_crawler_path()
+
     # 侧边栏配置
-    common_config = render_sidebar()
+    common_config = render_sidebar(media_crawler_path)
 
     # 主界面 - 动态表单
     st.header('📋 爬取参数')
@@ -486,39 +615,31 @@ def crawl_page():
     crawler_type = common_config['crawler_type']
 
     # 根据爬虫类型渲染不同表单
-    if crawler_type == 'search':
-        mode_config = render_search_form()
-    elif crawler_type == 'detail':
-        mode_config = render_detail_form(common_config['platform'])
-    elif crawler_type == 'creator':
-        mode_config = render_creator_form()
-    else:
+    render_mode_form = MODE_FORM_RENDERERS.get(crawler_type)
+    if render_mode_form is None:
         st.error(f'未知的爬虫类型: {crawler_type}')
         return
+    mode_config = render_mode_form(common_config['platform'])
+
+    # 起始页码对所有模式相同，只渲染一次
+    mode_config['start_page'] = st.number_input('起始页码', min_value=1, value=1, help='从第几页开始爬取')
 
     # 参数预览
     st.divider()
 
     # 尝试构建请求（用于预览）
+    preview_error = ''
     try:
-        request = build_request(common_config, mode_config)
+        request = build_request_cached(common_config, mode_config)
         preview_valid = True
     except ValueError as e:
         request = None
         preview_valid = False
         preview_error = str(e)
 
-    with st.expander('📜 命令预览'):
-        if preview_valid and request:
-            media_crawler_path = get_media_crawler_path()
-            cmd_str = preview_command(request, str(media_crawler_path))
-            st.code(cmd_str, language='bash')
-
-            # 显示模型详情
-            with st.expander('🔍 请求模型详情'):
-                st.json(request.model_dump())
-        else:
-            st.warning(f'⏳ {preview_error}')
+    # 命令预览默认关闭：折叠的 expander 内容仍会执行，用开关跳过命令拼接和模型序列化
+    if st.toggle('📜 显示命令预览', key='show_preview'):
+        render_command_preview(request, preview_error, media_crawler_path)
 
     # 运行按钮
     st.divider()
@@ -557,35 +678,19 @@ def crawl_page():
                 headless=common_config['headless'],
                 save_path=common_config.get('save_path', ''),
             )
-            # 设置运行状态并重新运行以禁用按钮
-            st.session_state.is_running = True
-            st.rerun()
+            if common_config['quiet_mode']:
+                # 静默模式：阻塞运行，结束后在下方显示结果
+                run_crawler_quiet_ui(request, media_crawler_path)
+            # 启动爬虫，设置运行状态并重新运行以禁用按钮
+            elif start_crawler_ui(request, media_crawler_path):
+                st.session_state.is_running = True
+                st.rerun()
 
-    # 如果处于运行状态，执行爬虫
+    # 运行中：定时刷新输出；结束后：显示最近一次运行结果
     if st.session_state.is_running:
-        if preview_valid and request:
-            execution = run_crawler_ui(request)
-
-            # 运行完成后，显示打开目录按钮（如果成功）
-            if execution and execution.status.value == 'completed':
-                st.divider()
-                result_col1, result_col2 = st.columns([2, 1])
-
-                with result_col1:
-                    # 显示输出文件
-                    if execution.output_files:
-                        with st.expander('📁 输出文件列表'):
-                            for f in execution.output_files:
-                                st.text(f)
-
-                with result_col2:
-                    # 快捷打开目录按钮
-                    save_path = common_config.get('save_path')
-                    if st.button('📂 打开结果目录', type='primary', use_container_width=True):
-                        open_results_directory(save_path)
-
-        # 重置运行状态
-        st.session_state.is_running = False
+        render_crawl_output()
+    elif st.session_state.get('crawl_execution') is not None:
+        render_crawl_result(st.session_state.crawl_execution, common_config.get('save_path'))
 
 
 # ========== 解析页面 ==========
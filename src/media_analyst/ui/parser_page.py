@@ -28,6 +28,40 @@ from media_analyst.ui.persistence import get_media_crawler_path
 # MediaCrawler 根目录（作为路径基准）- 使用统一配置
 MEDIA_CRAWLER_PATH = get_media_crawler_path()
 
+# 结果视图选项（只渲染当前选中的视图，避免构建不可见的 DataFrame）
+VIEW_POSTS = '📝 帖子'
+VIEW_COMMENTS = '💬 评论'
+VIEW_ERRORS = '⚠️ 错误'
+VIEW_OPTIONS = [VIEW_POSTS, VIEW_COMMENTS, VIEW_ERRORS]
+
+# 表格显示列（按显示顺序）
+POST_DISPLAY_COLUMNS = (
+    'content_id',
+    'platform',
+    'content_type',
+    'title',
+    'nickname',
+    'liked_count',
+    'collected_count',
+    'comment_count',
+    'share_count',
+    'create_time',
+    'crawl_time',
+    'content_url',
+)
+COMMENT_DISPLAY_COLUMNS = (
+    'comment_id',
+    'content_id',
+    'platform',
+    'content',
+    'nickname',
+    'like_count',
+    'sub_comment_count',
+    'create_time',
+    'crawl_time',
+    'is_sub_comment',
+)
+
 # =============================================================================
 # 页面配置
 # =============================================================================
@@ -218,22 +252,7 @@ def render_posts_table(parsed_data: ParsedData):
         df = posts_to_dataframe(parsed_data.posts)
 
         # 选择要显示的列
-        display_columns = [
-            'content_id',
-            'platform',
-            'content_type',
-            'title',
-            'nickname',
-            'liked_count',
-            'collected_count',
-            'comment_count',
-            'share_count',
-            'create_time',
-            'crawl_time',
-            'content_url',
-        ]
-        available_columns = [c for c in display_columns if c in df.columns]
-        df_display = df[available_columns]
+        df_display = df[df.columns.intersection(POST_DISPLAY_COLUMNS, sort=False)]
 
         # 显示表格
         st.dataframe(
@@ -273,20 +292,7 @@ def render_comments_table(parsed_data: ParsedData):
     try:
         df = comments_to_dataframe(parsed_data.comments)
 
-        display_columns = [
-            'comment_id',
-            'content_id',
-            'platform',
-            'content',
-            'nickname',
-            'like_count',
-            'sub_comment_count',
-            'create_time',
-            'crawl_time',
-            'is_sub_comment',
-        ]
-        available_columns = [c for c in display_columns if c in df.columns]
-        df_display = df[available_columns]
+        df_display = df[df.columns.intersection(COMMENT_DISPLAY_COLUMNS, sort=False)]
 
         st.dataframe(
             df_display,
@@ -334,27 +340,33 @@ def render_raw_preview(file_paths: List[str]):
         # 选择要预览的文件
         preview_file = st.selectbox('选择文件预览', file_paths, format_func=format_path)
 
-        if preview_file and Path(preview_file).exists():
-            try:
-                with open(preview_file, 'r', encoding='utf-8') as f:
-                    data = json.load(f)
-
-                # 显示完整路径
-                full_path = Path(preview_file)
-                try:
-                    rel_path = full_path.relative_to(MEDIA_CRAWLER_PATH)
-                    st.caption(f'📁 {rel_path}')
-                except ValueError:
-                    st.caption(f'📁 {full_path}')
-
-                # 限制预览大小
-                if isinstance(data, list) and len(data) > 5:
-                    st.caption(f'共 {len(data)} 条记录，显示前 5 条')
-                    data = data[:5]
-
-                st.json(data)
-            except Exception as e:
-                st.error(f'无法预览文件: {e}')
+        if not preview_file:
+            return
+
+        full_path = Path(preview_file)
+        try:
+            # 直接打开文件，不存在时由 open() 抛出，省去额外的 exists() 调用
+            with open(full_path, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+        except FileNotFoundError:
+            return
+        except Exception as e:
+            st.error(f'无法预览文件: {e}')
+            return
+
+        # 显示完整路径
+        try:
+            rel_path = full_path.relative_to(MEDIA_CRAWLER_PATH)
+            st.caption(f'📁 {rel_path}')
+        except ValueError:
+            st.caption(f'📁 {full_path}')
+
+        # 限制预览大小
+        if isinstance(data, list) and len(data) > 5:
+            st.caption(f'共 {len(data)} 条记录，显示前 5 条')
+            data = data[:5]
+
+        st.json(data)
 
 
 def render_errors(parsed_data: ParsedData):
@@ -363,8 +375,8 @@ def render_errors(parsed_data: ParsedData):
         return
 
     with st.expander(f'⚠️ 解析错误 ({len(parsed_data.errors)} 个)', expanded=False):
-        for error in parsed_data.errors[:20]:  # 最多显示20个
-            st.warning(error)
+        # 合并为一条消息渲染（最多显示20个），避免逐条发送 20 个组件
+        st.warning('\n\n'.join(f'• {error}' for error in parsed_data.errors[:20]))
         if len(parsed_data.errors) > 20:
             st.caption(f'... 还有 {len(parsed_data.errors) - 20} 个错误')
 
@@ -427,15 +439,10 @@ def main():
                 else:
                     raw_result = parse_json_files(config['file_paths'], deduplicate=False)
 
-                # 计算去重统计
-                dedup_stats = raw_result.deduplication_stats
+                # 去重并统计（一次遍历），无重复时沿用原结果
+                deduplicated, dedup_stats = raw_result.deduplicate_with_stats()
                 has_duplicates = dedup_stats['total_duplicates'] > 0
-
-                # 执行去重
-                if has_duplicates:
-                    result = raw_result.deduplicate()
-                else:
-                    result = raw_result
+                result = deduplicated if has_duplicates else raw_result
 
                 st.session_state.parser_parsed_data = result
                 st.session_state.parser_raw_stats = {
@@ -469,16 +476,14 @@ def main():
 
         st.divider()
 
-        # 数据表格
-        tab1, tab2, tab3 = st.tabs(['📝 帖子', '💬 评论', '⚠️ 错误'])
+        # 数据表格（st.tabs 会在每次重跑时执行所有标签页，改用 radio 只渲染当前视图）
+        view = st.radio('视图', VIEW_OPTIONS, horizontal=True, label_visibility='collapsed', key='parser_view')
 
-        with tab1:
+        if view == VIEW_POSTS:
             render_posts_table(parsed_data)
-
-        with tab2:
+        elif view == VIEW_COMMENTS:
             render_comments_table(parsed_data)
-
-        with tab3:
+        else:
             render_errors(parsed_data)
 
         st.divider()
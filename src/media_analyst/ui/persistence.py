@@ -4,8 +4,9 @@ UI选项持久化模块
 使用本地JSON文件保存用户偏好设置，实现跨会话的选项记忆功能。
 """
 
+import functools
 import json
-from dataclasses import asdict, dataclass
+from dataclasses import asdict, dataclass, replace
 from pathlib import Path
 from typing import Any
 
@@ -16,9 +17,9 @@ CONFIG_DIR = Path.home() / '.media_analyst'
 PREFS_FILE = CONFIG_DIR / 'preferences.json'
 
 
-@dataclass
+@dataclass(frozen=True, slots=True)
 class UserPreferences:
-    """用户偏好设置"""
+    """用户偏好设置（不可变，修改用 dataclasses.replace；slots：无实例 __dict__）"""
 
     platform: str = 'dy'  # 默认抖音
     login_type: str = 'qrcode'  # 默认扫码登录
@@ -43,7 +44,13 @@ class UserPreferences:
 
 def _ensure_config_dir() -> None:
     """确保配置目录存在"""
-    CONFIG_DIR.mkdir(parents=True, exist_ok=True)
+    _mkdir_once(CONFIG_DIR)
+
+
+@functools.cache
+def _mkdir_once(directory: Path) -> None:
+    """创建目录（按路径缓存，同一目录每个进程只执行一次 mkdir）"""
+    directory.mkdir(parents=True, exist_ok=True)
 
 
 def load_preferences() -> UserPreferences:
@@ -53,9 +60,15 @@ def load_preferences() -> UserPreferences:
     Returns:
         UserPreferences对象，如果文件不存在则返回默认值
     """
-    # 首先检查session_state（当前会话已加载）
+    # 首先检查session_state（当前会话已加载，直接返回缓存的实例）
     if '_user_preferences' in st.session_state:
-        return UserPreferences.from_dict(st.session_state._user_preferences)
+        cached = st.session_state._user_preferences
+        if isinstance(cached, UserPreferences):
+            return cached
+        # 兼容旧版本存储的字典
+        prefs = UserPreferences.from_dict(cached)
+        st.session_state._user_preferences = prefs
+        return prefs
 
     # 从文件加载
     if PREFS_FILE.exists():
@@ -63,7 +76,7 @@ def load_preferences() -> UserPreferences:
             with open(PREFS_FILE, 'r', encoding='utf-8') as f:
                 data = json.load(f)
             prefs = UserPreferences.from_dict(data)
-            st.session_state._user_preferences = prefs.to_dict()
+            st.session_state._user_preferences = prefs
             return prefs
         except (json.JSONDecodeError, IOError, TypeError):
             # 文件损坏或读取失败，使用默认值
@@ -71,7 +84,7 @@ def load_preferences() -> UserPreferences:
 
     # 返回默认偏好
     default_prefs = UserPreferences()
-    st.session_state._user_preferences = default_prefs.to_dict()
+    st.session_state._user_preferences = default_prefs
     return default_prefs
 
 
@@ -82,16 +95,14 @@ def save_preferences(preferences: UserPreferences) -> None:
     Args:
         preferences: 用户偏好设置对象
     """
-    prefs_dict = preferences.to_dict()
-
     # 更新session_state
-    st.session_state._user_preferences = prefs_dict
+    st.session_state._user_preferences = preferences
 
     # 保存到文件
     try:
         _ensure_config_dir()
         with open(PREFS_FILE, 'w', encoding='utf-8') as f:
-            json.dump(prefs_dict, f, ensure_ascii=False, indent=2)
+            json.dump(preferences.to_dict(), f, ensure_ascii=False, indent=2)
     except IOError as e:
         # 保存失败时记录错误但不中断流程
         st.warning(f'⚠️ 无法保存偏好设置: {e}')
@@ -200,15 +211,13 @@ def _find_media_crawler_paths() -> list[Path]:
 
     # 2. 基于当前文件位置（media-analyst/src/media_analyst/ui/persistence.py）
     try:
-        current_file = Path(__file__).resolve()
-        # 向上回溯到 media-analyst 目录的父目录，查找 MediaCrawler
-        for parent in current_file.parents:
-            if parent.name == 'media-analyst':
-                sibling_path = parent.parent / 'MediaCrawler'
-                if sibling_path not in candidates:
-                    candidates.append(sibling_path)
-                break
-    except NameError:
+        parts = Path(__file__).resolve().parts
+        # 定位最近的 media-analyst 目录，其父目录下的 MediaCrawler 即为兄弟项目
+        idx = len(parts) - 1 - parts[::-1].index('media-analyst')
+        sibling_path = Path(*parts[:idx], 'MediaCrawler')
+        if sibling_path not in candidates:
+            candidates.append(sibling_path)
+    except (NameError, ValueError):
         pass
 
     # 3. 基于当前工作目录向上查找
@@ -310,8 +319,8 @@ def save_media_crawler_path(path: str | Path) -> bool:
     except ValueError:
         path_str = str(path_obj)
 
-    prefs = load_preferences()
-    prefs.media_crawler_path = path_str
+    # load_preferences 返回会话共享的实例，使用 replace 生成新对象而非原地修改
+    prefs = replace(load_preferences(), media_crawler_path=path_str)
     save_preferences(prefs)
     return True
 
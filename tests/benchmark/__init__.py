@@ -0,0 +1,7 @@
+"""
+性能基准测试 - 守护模型校验的性能预算
+
+特点：
+- 依赖 pytest-benchmark（未安装时整体跳过）
+- 断言宽松的耗时上限，只拦截数量级的回退
+"""
@@ -0,0 +1,28 @@
+"""
+模型校验性能基准
+
+批量构建请求模型，平均耗时超出预算即失败，防止 pydantic 升级或
+校验器改动带来的性能回退悄悄合入
+"""
+
+import pytest
+
+from media_analyst.core.models import Platform, SearchRequest
+
+pytest.importorskip('pytest_benchmark')
+
+# 构建 1000 个 SearchRequest 的平均耗时预算（秒），远高于正常值，只拦截明显回退
+SEARCH_REQUEST_BUDGET = 0.05
+
+
+def build_search_requests(n: int = 1000) -> list:
+    """批量构建搜索请求"""
+    return [SearchRequest(platform=Platform.DY, keywords=f'k{i}') for i in range(n)]
+
+
+def test_search_request_validation_budget(benchmark):
+    """批量构建 SearchRequest 不超过性能预算"""
+    requests = benchmark(build_search_requests)
+
+    assert len(requests) == 1000
+    assert benchmark.stats['mean'] < SEARCH_REQUEST_BUDGET
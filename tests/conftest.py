@@ -2,15 +2,10 @@
 pytest 配置和共享 fixtures
 """
 
-import sys
 from pathlib import Path
 
 import pytest
 
-# 确保可以导入 src 模块
-sys.path.insert(0, str(Path(__file__).parent.parent / 'src'))
-
-
 # ==================== 路径 Fixtures ====================
 
 
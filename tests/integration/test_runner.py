@@ -6,22 +6,30 @@ CrawlerRunner 集成测试
 使用函数形式编写测试
 """
 
+import os
+import queue
+import signal
 import subprocess
+import time
 from pathlib import Path
 from unittest.mock import MagicMock, patch
 
 import pytest
 
 from media_analyst.core.models import (
+    CrawlerExecution,
     ExecutionStatus,
     Platform,
     SearchRequest,
 )
 from media_analyst.shell.runner import (
+    USE_PROCESS_GROUP,
     CrawlerRunner,
     CrawlerRunnerError,
     MediaCrawlerNotFoundError,
     ProcessError,
+    _decode_lines,
+    _pump_stream,
 )
 
 # ============================================================================
@@ -29,15 +37,51 @@ from media_analyst.shell.runner import (
 # ============================================================================
 
 
+@pytest.fixture(autouse=True)
+def mock_killpg():
+    """mock 进程组信号，避免向真实的进程组发送信号"""
+    with patch('media_analyst.shell.runner.os.killpg') as mock:
+        yield mock
+
+
 @pytest.fixture
-def mock_media_crawler_dir(tmp_path: Path) -> Path:
-    """创建模拟的 MediaCrawler 目录结构"""
-    main_py = tmp_path / 'main.py'
-    main_py.write_text('# mock main.py')
-    return tmp_path
+def make_pipe():
+    """创建真实管道并写入数据，返回二进制读端（keep_open=True 时写端保持打开直到测试结束）"""
+    open_write_fds = []
+
+    def _make_pipe(data: str = '', keep_open: bool = False):
+        read_fd, write_fd = os.pipe()
+        os.write(write_fd, data.encode('utf-8'))
+        if keep_open:
+            open_write_fds.append(write_fd)
+        else:
+            os.close(write_fd)
+        return os.fdopen(read_fd, 'rb')
+
+    yield _make_pipe
+
+    for fd in open_write_fds:
+        os.close(fd)
 
 
 @pytest.fixture
+def mock_popen(monkeypatch) -> MagicMock:
+    """替换 subprocess.Popen，返回可配置的 mock"""
+    mock = MagicMock()
+    monkeypatch.setattr('media_analyst.shell.runner.subprocess.Popen', mock)
+    return mock
+
+
+@pytest.fixture(scope='module')
+def mock_media_crawler_dir(tmp_path_factory) -> Path:
+    """创建模拟的 MediaCrawler 目录结构（模块内共享，测试不应修改）"""
+    root = tmp_path_factory.mktemp('media_crawler')
+    main_py = root / 'main.py'
+    main_py.write_text('# mock main.py')
+    return root
+
+
+@pytest.fixture(scope='module')
 def sample_request() -> SearchRequest:
     """示例搜索请求"""
     return SearchRequest(
@@ -76,7 +120,6 @@ def test_init_without_main_py(tmp_path: Path):
 # ============================================================================
 
 
-@patch('media_analyst.shell.runner.subprocess.Popen')
 def test_start_creates_execution(mock_popen, mock_media_crawler_dir: Path, sample_request: SearchRequest):
     """启动后创建执行状态对象"""
     # 配置 mock
@@ -94,7 +137,6 @@ def test_start_creates_execution(mock_popen, mock_media_crawler_dir: Path, sampl
     assert execution.start_time is not None
 
 
-@patch('media_analyst.shell.runner.subprocess.Popen')
 def test_start_calls_popen_with_correct_args(mock_popen, mock_media_crawler_dir: Path, sample_request: SearchRequest):
     """使用正确参数调用 Popen"""
     mock_process = MagicMock()
@@ -115,9 +157,13 @@ def test_start_calls_popen_with_correct_args(mock_popen, mock_media_crawler_dir:
     assert 'dy' in cmd
     assert '--keywords' in cmd
     assert '测试' in cmd
+    # 以字节读取管道（由读取线程整块解码），不经过 TextIOWrapper
+    assert call_args[1]['bufsize'] == 0
+    assert 'text' not in call_args[1]
+    assert call_args[1]['close_fds'] is True
+    assert call_args[1]['start_new_session'] is USE_PROCESS_GROUP
 
 
-@patch('media_analyst.shell.runner.subprocess.Popen')
 def test_start_prevents_concurrent_execution(mock_popen, mock_media_crawler_dir: Path, sample_request: SearchRequest):
     """防止并发执行多个爬虫"""
     mock_process = MagicMock()
@@ -140,7 +186,6 @@ def test_start_prevents_concurrent_execution(mock_popen, mock_media_crawler_dir:
 # ============================================================================
 
 
-@patch('media_analyst.shell.runner.subprocess.Popen')
 def test_poll_running_process(mock_popen, mock_media_crawler_dir: Path, sample_request: SearchRequest):
     """轮询运行中的进程"""
     mock_process = MagicMock()
@@ -156,13 +201,12 @@ def test_poll_running_process(mock_popen, mock_media_crawler_dir: Path, sample_r
     assert execution.status == ExecutionStatus.RUNNING
 
 
-@patch('media_analyst.shell.runner.subprocess.Popen')
 def test_poll_completed_process(mock_popen, mock_media_crawler_dir: Path, sample_request: SearchRequest):
     """轮询已完成的进程"""
     mock_process = MagicMock()
     mock_process.pid = 12345
     mock_process.poll.return_value = 0  # 正常退出
-    mock_process.communicate.return_value = ('output\n', '')
+    mock_process.communicate.return_value = (b'output\n', b'')
     mock_popen.return_value = mock_process
 
     runner = CrawlerRunner(mock_media_crawler_dir)
@@ -174,13 +218,12 @@ def test_poll_completed_process(mock_popen, mock_media_crawler_dir: Path, sample
     assert execution.end_time is not None
 
 
-@patch('media_analyst.shell.runner.subprocess.Popen')
 def test_poll_captures_output(mock_popen, mock_media_crawler_dir: Path, sample_request: SearchRequest):
     """轮询时捕获输出"""
     mock_process = MagicMock()
     mock_process.pid = 12345
     mock_process.poll.return_value = 0
-    mock_process.communicate.return_value = ('line1\nline2\n', 'error\n')
+    mock_process.communicate.return_value = (b'line1\nline2\n', b'error\n')
     mock_popen.return_value = mock_process
 
     runner = CrawlerRunner(mock_media_crawler_dir)
@@ -191,12 +234,35 @@ def test_poll_captures_output(mock_popen, mock_media_crawler_dir: Path, sample_r
     assert 'line2' in execution.stdout_lines
 
 
+def test_poll_after_drain_output_reads_from_readers(
+    mock_popen, make_pipe, mock_media_crawler_dir: Path, sample_request: SearchRequest
+):
+    """读取线程已接管管道后，poll 从队列取剩余输出而不调用 communicate()"""
+    mock_process = MagicMock()
+    mock_process.pid = 12345
+    mock_process.poll.return_value = 0
+    mock_process.stdout = make_pipe('line1\nline2\n')
+    mock_process.stderr = make_pipe('warning\n')
+    mock_popen.return_value = mock_process
+
+    runner = CrawlerRunner(mock_media_crawler_dir)
+    execution = runner.start(sample_request)
+    runner._ensure_readers()  # 模拟 UI 先调用过 drain_output
+    reader_threads = runner._reader_threads
+    execution = runner.poll(execution)
+
+    mock_process.communicate.assert_not_called()
+    assert execution.status == ExecutionStatus.COMPLETED
+    assert execution.stdout_lines == ['line1', 'line2']
+    assert execution.stderr_lines == ['warning']
+    assert not any(thread.is_alive() for thread in reader_threads)
+
+
 # ============================================================================
 # Wait Tests
 # ============================================================================
 
 
-@patch('media_analyst.shell.runner.subprocess.Popen')
 @patch('media_analyst.shell.runner.time.sleep')
 def test_wait_until_completion(mock_sleep, mock_popen, mock_media_crawler_dir: Path, sample_request: SearchRequest):
     """等待直到完成"""
@@ -204,7 +270,7 @@ def test_wait_until_completion(mock_sleep, mock_popen, mock_media_crawler_dir: P
     mock_process.pid = 12345
     # 第一次 poll 返回 None（运行中），第二次返回 0（完成）
     mock_process.poll.side_effect = [None, 0]
-    mock_process.communicate.return_value = ('', '')
+    mock_process.communicate.return_value = (b'', b'')
     mock_popen.return_value = mock_process
 
     runner = CrawlerRunner(mock_media_crawler_dir)
@@ -214,7 +280,6 @@ def test_wait_until_completion(mock_sleep, mock_popen, mock_media_crawler_dir: P
     assert execution.status == ExecutionStatus.COMPLETED
 
 
-@patch('media_analyst.shell.runner.subprocess.Popen')
 @patch('media_analyst.shell.runner.time.sleep')
 def test_wait_timeout(mock_sleep, mock_popen, mock_media_crawler_dir: Path, sample_request: SearchRequest):
     """等待超时"""
@@ -236,7 +301,7 @@ def test_wait_timeout(mock_sleep, mock_popen, mock_media_crawler_dir: Path, samp
 # ============================================================================
 
 
-@patch('media_analyst.shell.runner.subprocess.Popen')
+@patch('media_analyst.shell.runner.USE_PROCESS_GROUP', False)
 def test_stop_running_process(mock_popen, mock_media_crawler_dir: Path, sample_request: SearchRequest):
     """停止运行中的进程"""
     mock_process = MagicMock()
@@ -253,12 +318,31 @@ def test_stop_running_process(mock_popen, mock_media_crawler_dir: Path, sample_r
     mock_process.terminate.assert_called_once()
 
 
+@patch('media_analyst.shell.runner.USE_PROCESS_GROUP', True)
+def test_stop_signals_process_group(
+    mock_popen, mock_killpg, mock_media_crawler_dir: Path, sample_request: SearchRequest
+):
+    """POSIX 下停止时向整个进程组发送 SIGTERM"""
+    mock_process = MagicMock()
+    mock_process.pid = 12345
+    mock_process.poll.return_value = None
+    mock_process.wait.return_value = 0
+    mock_popen.return_value = mock_process
+
+    runner = CrawlerRunner(mock_media_crawler_dir)
+    execution = runner.start(sample_request)
+    execution = runner.stop(execution)
+
+    assert execution.status == ExecutionStatus.STOPPED
+    mock_killpg.assert_called_once_with(12345, signal.SIGTERM)
+    mock_process.terminate.assert_not_called()
+
+
 # ============================================================================
 # Property Tests
 # ============================================================================
 
 
-@patch('media_analyst.shell.runner.subprocess.Popen')
 def test_is_running_property(mock_popen, mock_media_crawler_dir: Path):
     """测试 is_running 属性"""
     mock_process = MagicMock()
@@ -276,7 +360,6 @@ def test_is_running_property(mock_popen, mock_media_crawler_dir: Path):
     assert runner.is_running
 
 
-@patch('media_analyst.shell.runner.subprocess.Popen')
 def test_current_execution_property(mock_popen, mock_media_crawler_dir: Path):
     """测试 current_execution 属性"""
     mock_process = MagicMock()
@@ -298,7 +381,6 @@ def test_current_execution_property(mock_popen, mock_media_crawler_dir: Path):
 # ============================================================================
 
 
-@patch('media_analyst.shell.runner.subprocess.Popen')
 def test_start_handles_filenotfound_error(mock_popen, mock_media_crawler_dir: Path, sample_request: SearchRequest):
     """测试处理 FileNotFoundError（命令不存在）"""
     mock_popen.side_effect = FileNotFoundError('No such file: uv')
@@ -309,7 +391,6 @@ def test_start_handles_filenotfound_error(mock_popen, mock_media_crawler_dir: Pa
         runner.start(sample_request)
 
 
-@patch('media_analyst.shell.runner.subprocess.Popen')
 def test_start_handles_generic_exception(mock_popen, mock_media_crawler_dir: Path, sample_request: SearchRequest):
     """测试处理通用 Exception"""
     mock_popen.side_effect = Exception('Unexpected error')
@@ -325,7 +406,7 @@ def test_start_handles_generic_exception(mock_popen, mock_media_crawler_dir: Pat
 # ============================================================================
 
 
-@patch('media_analyst.shell.runner.subprocess.Popen')
+@patch('media_analyst.shell.runner.USE_PROCESS_GROUP', False)
 def test_stop_handles_timeout_expired(mock_popen, mock_media_crawler_dir: Path, sample_request: SearchRequest):
     """测试停止时超时后强制终止"""
     mock_process = MagicMock()
@@ -351,13 +432,15 @@ def test_stop_handles_timeout_expired(mock_popen, mock_media_crawler_dir: Path,
 # ============================================================================
 
 
-@patch('media_analyst.shell.runner.subprocess.Popen')
-def test_iter_output_timeout(mock_popen, mock_media_crawler_dir: Path, sample_request: SearchRequest):
+def test_iter_output_timeout(mock_popen, make_pipe, mock_media_crawler_dir: Path, sample_request: SearchRequest):
     """测试 iter_output 超时处理"""
     mock_process = MagicMock()
     mock_process.pid = 12345
     mock_process.poll.return_value = None  # 一直在运行
-    mock_process.stdout.readline.return_value = ''
+    # 管道关闭后等待退出超时，stop() 中的 wait 成功
+    mock_process.wait.side_effect = [subprocess.TimeoutExpired(cmd='test', timeout=0.01), 0]
+    mock_process.stdout = make_pipe()
+    mock_process.stderr = make_pipe()
     mock_popen.return_value = mock_process
 
     runner = CrawlerRunner(mock_media_crawler_dir)
@@ -366,43 +449,179 @@ def test_iter_output_timeout(mock_popen, mock_media_crawler_dir: Path, sample_re
     # 使用很短的超时时间
     with pytest.raises(TimeoutError):
         # 消费生成器
-        for _ in runner.iter_output(execution, timeout=0.01, poll_interval=0.001):
+        for _ in runner.iter_output(execution, timeout=0.01):
             pass
 
 
-@patch('media_analyst.shell.runner.subprocess.Popen')
-def test_iter_output_reads_stderr(mock_popen, mock_media_crawler_dir: Path, sample_request: SearchRequest):
+def test_iter_output_reads_stderr(mock_popen, make_pipe, mock_media_crawler_dir: Path, sample_request: SearchRequest):
     """测试 iter_output 读取 stderr 内容"""
     mock_process = MagicMock()
     mock_process.pid = 12345
-    # 第一次 poll 返回 None（运行中），第二次返回 0（完成）
-    mock_process.poll.side_effect = [None, 0]
-    mock_process.stdout.readline.return_value = ''
-    mock_process.stderr.read.return_value = 'error message\nanother error'
+    mock_process.wait.return_value = 0
+    mock_process.stdout = make_pipe()
+    mock_process.stderr = make_pipe('error message\nanother error')
     mock_popen.return_value = mock_process
 
     runner = CrawlerRunner(mock_media_crawler_dir)
     execution = runner.start(sample_request)
 
-    output_lines = list(runner.iter_output(execution, poll_interval=0.001))
+    output_lines = list(runner.iter_output(execution))
 
     # stderr 内容应该以 [stderr] 前缀输出
     assert any('[stderr]' in line for line in output_lines)
     assert any('error message' in line for line in output_lines)
 
 
+def test_iter_output_streams_stdout_and_stderr(
+    mock_popen, make_pipe, mock_media_crawler_dir: Path, sample_request: SearchRequest
+):
+    """测试 iter_output 同时读取 stdout 和 stderr"""
+    mock_process = MagicMock()
+    mock_process.pid = 12345
+    mock_process.wait.return_value = 0
+    mock_process.stdout = make_pipe('line1\nline2\n')
+    mock_process.stderr = make_pipe('warning\n')
+    mock_popen.return_value = mock_process
+
+    runner = CrawlerRunner(mock_media_crawler_dir)
+    execution = runner.start(sample_request)
+
+    output_lines = list(runner.iter_output(execution))
+
+    assert sorted(output_lines) == ['[stderr] warning', 'line1', 'line2']
+    assert execution.stdout_lines == ['line1', 'line2']
+    assert execution.stderr_lines == ['warning']
+    assert execution.status == ExecutionStatus.COMPLETED
+
+
+def test_iter_output_timeout_while_pipe_open(
+    mock_popen, make_pipe, mock_media_crawler_dir: Path, sample_request: SearchRequest
+):
+    """测试管道一直无输出时 iter_output 按截止时间超时"""
+    mock_process = MagicMock()
+    mock_process.pid = 12345
+    mock_process.poll.return_value = None
+    mock_process.wait.return_value = 0
+    mock_process.stdout = make_pipe(keep_open=True)
+    mock_process.stderr = None
+    mock_popen.return_value = mock_process
+
+    runner = CrawlerRunner(mock_media_crawler_dir)
+    execution = runner.start(sample_request)
+
+    with pytest.raises(TimeoutError):
+        list(runner.iter_output(execution, timeout=0.05))
+
+    assert execution.status == ExecutionStatus.STOPPED
+
+
+def test_drain_output_returns_available_lines(
+    mock_popen, make_pipe, mock_media_crawler_dir: Path, sample_request: SearchRequest
+):
+    """测试 drain_output 非阻塞地取出已到达的输出，进程退出后标记完成"""
+    mock_process = MagicMock()
+    mock_process.pid = 12345
+    mock_process.poll.return_value = 0
+    mock_process.stdout = make_pipe('line1\nline2\n')
+    mock_process.stderr = make_pipe('warning\n')
+    mock_popen.return_value = mock_process
+
+    runner = CrawlerRunner(mock_media_crawler_dir)
+    execution = runner.start(sample_request)
+
+    output_lines = []
+    deadline = time.monotonic() + 5
+    while not execution.is_finished and time.monotonic() < deadline:
+        output_lines += runner.drain_output(execution)
+
+    assert sorted(output_lines) == ['[stderr] warning', 'line1', 'line2']
+    assert execution.status == ExecutionStatus.COMPLETED
+    assert runner.drain_output(execution) == []
+    assert runner.current_execution is None
+
+
+def test_run_quiet_collects_output(mock_popen, mock_media_crawler_dir: Path, sample_request: SearchRequest):
+    """测试 run_quiet 一次性收集输出（与 poll 一样丢弃空行）并标记完成"""
+    mock_process = MagicMock()
+    mock_process.pid = 12345
+    mock_process.communicate.return_value = (b'line1\n\nline2\n', b'warning\n\n')
+    mock_process.returncode = 0
+    mock_popen.return_value = mock_process
+
+    runner = CrawlerRunner(mock_media_crawler_dir)
+    execution = runner.run_quiet(sample_request, timeout=10)
+
+    mock_process.communicate.assert_called_once_with(timeout=10)
+    assert execution.status == ExecutionStatus.COMPLETED
+    assert execution.stdout_lines == ['line1', 'line2']
+    assert execution.stderr_lines == ['warning']
+    assert runner.current_execution is None
+
+
+def test_run_quiet_timeout(mock_popen, mock_media_crawler_dir: Path, sample_request: SearchRequest):
+    """测试 run_quiet 超时后停止进程并标记超时"""
+    mock_process = MagicMock()
+    mock_process.pid = 12345
+    mock_process.poll.return_value = None
+    mock_process.communicate.side_effect = subprocess.TimeoutExpired(cmd='test', timeout=1)
+    mock_process.wait.return_value = -15
+    mock_popen.return_value = mock_process
+
+    runner = CrawlerRunner(mock_media_crawler_dir)
+    with patch.object(CrawlerExecution, 'mark_stopped') as mock_mark_stopped:
+        execution = runner.run_quiet(sample_request, timeout=1)
+
+    mock_mark_stopped.assert_not_called()  # 直接标记超时，不经过 STOPPED
+    assert execution.status == ExecutionStatus.TIMEOUT
+    assert execution.end_time is not None
+    assert not runner.is_running
+    assert runner.current_execution is None
+
+
+@patch('media_analyst.shell.runner.OUTPUT_ENCODING', 'utf-8')
+@patch('media_analyst.shell.runner.PIPE_BUFFER_SIZE', 3)
+def test_pump_stream_splits_lines_across_chunks(make_pipe):
+    """测试按块读取时跨块的行、空行、CRLF 和无换行结尾的末行都能正确切分"""
+    output_queue = queue.Queue()
+
+    _pump_stream(make_pipe('line1\n\n中文行\r\nend'), True, output_queue)
+
+    items = []
+    while not output_queue.empty():
+        items.append(output_queue.get_nowait())
+    assert items[-1] == (True, None)
+    assert all(is_stderr for is_stderr, _ in items)
+    assert [line for _, lines in items[:-1] for line in lines] == ['line1', '', '中文行', 'end']
+
+
+def test_pump_stream_puts_one_batch_per_chunk(make_pipe):
+    """测试一次读取到的多行作为一批放入队列"""
+    output_queue = queue.Queue()
+
+    _pump_stream(make_pipe('a\nb\nc\n'), False, output_queue)
+
+    assert output_queue.get_nowait() == (False, ['a', 'b', 'c'])
+    assert output_queue.get_nowait() == (False, None)
+
+
+def test_decode_lines_keeps_carriage_return_progress_on_one_line():
+    """测试只按换行切分：进度条的 \\r 不拆行，CRLF 去掉结尾的 \\r"""
+    assert _decode_lines(b'50%\r100%\n') == ['50%\r100%']
+    assert _decode_lines(b'a\r\n\r\nb') == ['a', '', 'b']
+    assert _decode_lines(b'') == []
+
+
 # ============================================================================
 # Poll Tests with Error Cases
 # ============================================================================
 
 
-@patch('media_analyst.shell.runner.subprocess.Popen')
 def test_poll_when_process_not_started(mock_popen, mock_media_crawler_dir: Path, sample_request: SearchRequest):
     """测试 poll 当进程未启动时"""
     mock_process = MagicMock()
     mock_process.pid = 12345
     mock_process.poll.return_value = 0  # 进程已完成
-    mock_process.communicate.return_value = ('output', '')
+    mock_process.communicate.return_value = (b'output', b'')
     mock_popen.return_value = mock_process
 
     runner = CrawlerRunner(mock_media_crawler_dir)
@@ -423,14 +642,13 @@ def test_poll_when_process_not_started(mock_popen, mock_media_crawler_dir: Path,
 # ============================================================================
 
 
-@patch('media_analyst.shell.runner.subprocess.Popen')
 @patch('media_analyst.shell.runner.time.sleep')
 def test_wait_with_already_finished_execution(mock_sleep, mock_popen, mock_media_crawler_dir: Path):
     """测试等待已经完成的执行"""
     mock_process = MagicMock()
     mock_process.pid = 12345
     mock_process.poll.return_value = 0
-    mock_process.communicate.return_value = ('', '')
+    mock_process.communicate.return_value = (b'', b'')
     mock_popen.return_value = mock_process
 
     runner = CrawlerRunner(mock_media_crawler_dir)
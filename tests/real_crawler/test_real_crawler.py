@@ -21,7 +21,9 @@
 """
 
 import json
+import os
 from pathlib import Path
+from typing import Iterator
 
 import pytest
 
@@ -39,6 +41,16 @@ from media_analyst.shell import CrawlerRunner
 TEST_TIMEOUT = 300
 
 
+def walk_json_files(root: str) -> Iterator[os.DirEntry]:
+    """递归遍历目录下的 JSON 文件（os.scandir 的 DirEntry 自带文件类型，无需逐个 stat）"""
+    with os.scandir(root) as entries:
+        for entry in entries:
+            if entry.is_dir(follow_symlinks=False):
+                yield from walk_json_files(entry.path)
+            elif entry.name.endswith('.json') and entry.is_file(follow_symlinks=False):
+                yield entry
+
+
 @pytest.fixture
 def media_crawler_path() -> Path:
     """返回 MediaCrawler 项目路径"""
@@ -116,8 +128,9 @@ def test_douyin_detail_with_pydantic_model(
     print('-' * 60)
 
     try:
-        for line in runner.iter_output(execution, timeout=TEST_TIMEOUT):
-            print(line)
+        # 每次读取到的一批行合并为一次写出，避免逐行 print
+        for lines in runner.iter_output_batches(execution, timeout=TEST_TIMEOUT):
+            print('\n'.join(lines), flush=True)
     except TimeoutError:
         pytest.fail(f'测试超时（{TEST_TIMEOUT}秒）')
 
@@ -188,13 +201,13 @@ def test_douyin_detail_with_output_verification(
     data_dir = ensure_media_crawler / 'data'
 
     if data_dir.exists():
-        json_files = list(data_dir.rglob('*.json'))
+        json_files = list(walk_json_files(str(data_dir)))
         print(f'  找到 {len(json_files)} 个 JSON 文件')
 
         if json_files:
             # 验证文件存在（CrawlerExecution 的校验）
             try:
-                execution.update_output_files(json_files[:5])  # 最多5个
+                execution.update_output_files([Path(entry.path) for entry in json_files[:5]])  # 最多5个
                 print(f'  ✅ 已追踪 {len(execution.output_files)} 个文件')
             except ValueError as e:
                 print(f'  ⚠️ 文件验证失败: {e}')
@@ -202,8 +215,8 @@ def test_douyin_detail_with_output_verification(
             # 验证 JSON 内容
             for json_file in json_files[:2]:
                 try:
-                    with open(json_file, 'r', encoding='utf-8') as f:
-                        data = json.load(f)
+                    # 一次读入字节后直接解析（json.loads 自动识别 UTF-8），省去文本解码的一遍处理
+                    data = json.loads(Path(json_file.path).read_bytes())
                     print(f'  ✅ {json_file.name}: {len(data) if isinstance(data, list) else "object"} 条记录')
                 except Exception as e:
                     print(f'  ⚠️ {json_file.name}: 读取失败 - {e}')
@@ -5,51 +5,78 @@
 """
 
 import json
-import sys
-import tempfile
 from pathlib import Path
-from unittest.mock import MagicMock, patch
+from types import SimpleNamespace
+from unittest.mock import MagicMock, mock_open, patch
 
+import pytest
 from streamlit.testing.v1 import AppTest
 
-sys.path.insert(0, str(Path(__file__).parent.parent.parent / 'src'))
+from media_analyst.core.models import ParsedData, Platform, Post
+
+# 模块导入时会访问文件系统，需在 fs_mocks 替换 Path 方法之前导入
+from media_analyst.ui.parser_page import find_json_files, render_errors, render_raw_preview, render_statistics
 
 PARSER_PAGE_PATH = str(Path(__file__).parent.parent.parent / 'src' / 'media_analyst' / 'ui' / 'parser_page.py')
 
 
+# ============================================================================
+# Fixtures
+# ============================================================================
+
+
+@pytest.fixture
+def at() -> AppTest:
+    """每个测试独立运行的页面（用于修改控件状态的测试）"""
+    app = AppTest.from_file(PARSER_PAGE_PATH)
+    app.run()
+    return app
+
+
+@pytest.fixture(scope='module')
+def shared_at() -> AppTest:
+    """模块内共享的已运行页面（仅用于只读断言，不得修改控件状态）"""
+    app = AppTest.from_file(PARSER_PAGE_PATH)
+    app.run()
+    return app
+
+
+@pytest.fixture
+def mock_st(monkeypatch) -> MagicMock:
+    """替换 parser_page 中的 st，columns 默认返回 4 列"""
+    fake = MagicMock()
+    fake.columns.return_value = [MagicMock() for _ in range(4)]
+    monkeypatch.setattr('media_analyst.ui.parser_page.st', fake)
+    return fake
+
+
 # ============================================================================
 # Page Load Tests
 # ============================================================================
 
 
-def test_parser_page_initial_load():
+@pytest.mark.ui
+def test_parser_page_initial_load(shared_at: AppTest):
     """测试解析页面初始加载"""
-    at = AppTest.from_file(PARSER_PAGE_PATH)
-    at.run()
-
     # 验证页面标题
-    assert at.title[0].value == '📊 数据解析'
-    assert at.caption[0].value == '解析 MediaCrawler 抓取的 JSON 数据，转换为统一格式'
+    assert shared_at.title[0].value == '📊 数据解析'
+    assert shared_at.caption[0].value == '解析 MediaCrawler 抓取的 JSON 数据，转换为统一格式'
 
 
-def test_parser_page_shows_sidebar():
+@pytest.mark.ui
+def test_parser_page_shows_sidebar(shared_at: AppTest):
     """测试侧边栏显示"""
-    at = AppTest.from_file(PARSER_PAGE_PATH)
-    at.run()
-
     # 验证侧边栏存在且有文件选择
-    assert at.sidebar is not None
-    assert len(at.sidebar.radio) > 0
+    assert shared_at.sidebar is not None
+    assert len(shared_at.sidebar.radio) > 0
 
 
-def test_initial_info_message():
+@pytest.mark.ui
+def test_initial_info_message(shared_at: AppTest):
     """测试初始提示信息"""
-    at = AppTest.from_file(PARSER_PAGE_PATH)
-    at.run()
-
     # 未选择文件时显示提示
-    assert len(at.info) > 0
-    assert '请在侧边栏选择或上传 JSON 数据文件' in at.info[0].value
+    assert len(shared_at.info) > 0
+    assert '请在侧边栏选择或上传 JSON 数据文件' in shared_at.info[0].value
 
 
 # ============================================================================
@@ -57,32 +84,26 @@ def test_initial_info_message():
 # ============================================================================
 
 
-def test_input_method_radio_exists():
+@pytest.mark.ui
+def test_input_method_radio_exists(shared_at: AppTest):
     """测试输入方式选择器存在"""
-    at = AppTest.from_file(PARSER_PAGE_PATH)
-    at.run()
-
-    radio = at.sidebar.radio[0]
+    radio = shared_at.sidebar.radio[0]
     assert '上传文件' in radio.options
     assert '输入目录' in radio.options
 
 
-def test_upload_input_shows_file_uploader():
+@pytest.mark.ui
+def test_upload_input_shows_file_uploader(shared_at: AppTest):
     """测试上传方式显示文件上传器"""
-    at = AppTest.from_file(PARSER_PAGE_PATH)
-    at.run()
-
     # 默认是上传文件方式，验证 sidebar 中有文件上传组件（以不同方式检查）
     # 由于 AppTest API 限制，我们检查 sidebar 内容
-    assert at.sidebar is not None
+    assert shared_at.sidebar is not None
     # 页面加载成功即表示文件上传器已渲染
 
 
-def test_directory_input_shows_text_input():
+@pytest.mark.ui
+def test_directory_input_shows_text_input(at: AppTest):
     """测试目录方式显示文本输入"""
-    at = AppTest.from_file(PARSER_PAGE_PATH)
-    at.run()
-
     # 切换到目录输入方式
     radio = at.sidebar.radio[0]
     radio.set_value('输入目录').run()
@@ -96,15 +117,13 @@ def test_directory_input_shows_text_input():
 # ============================================================================
 
 
-def test_session_state_initialization():
+@pytest.mark.ui
+def test_session_state_initialization(shared_at: AppTest):
     """测试 session state 初始化"""
-    at = AppTest.from_file(PARSER_PAGE_PATH)
-    at.run()
-
     # 验证 session state 被初始化
-    assert 'parser_parsed_data' in at.session_state
-    assert 'parser_selected_files' in at.session_state
-    assert 'parser_platform_filter' in at.session_state
+    assert 'parser_parsed_data' in shared_at.session_state
+    assert 'parser_selected_files' in shared_at.session_state
+    assert 'parser_platform_filter' in shared_at.session_state
 
 
 # ============================================================================
@@ -112,80 +131,69 @@ def test_session_state_initialization():
 # ============================================================================
 
 
-def test_find_json_files_finds_json():
-    """测试 find_json_files 找到 JSON 文件"""
-    from media_analyst.ui.parser_page import find_json_files
+@pytest.fixture
+def fs_mocks(monkeypatch) -> SimpleNamespace:
+    """替换 Path.exists / rglob / stat，由各测试设置返回值"""
+    mocks = SimpleNamespace(
+        exists=MagicMock(return_value=True),
+        rglob=MagicMock(return_value=[]),
+        stat=MagicMock(return_value=MagicMock(st_mtime=1000)),
+    )
+    monkeypatch.setattr('pathlib.Path.exists', mocks.exists)
+    monkeypatch.setattr('pathlib.Path.rglob', mocks.rglob)
+    monkeypatch.setattr('pathlib.Path.stat', mocks.stat)
+    return mocks
+
 
-    with patch('media_analyst.ui.parser_page.MEDIA_CRAWLER_PATH', Path('/mock')):
-        with patch('pathlib.Path.rglob') as mock_rglob:
-            with patch('pathlib.Path.exists') as mock_exists:
-                with patch('pathlib.Path.stat') as mock_stat:
-                    mock_exists.return_value = True
-                    mock_rglob.return_value = [
-                        Path('/mock/data/file1.json'),
-                        Path('/mock/data/file2.json'),
-                    ]
-                    mock_stat.return_value = MagicMock(st_mtime=1000)
+def test_find_json_files_finds_json(fs_mocks: SimpleNamespace):
+    """测试 find_json_files 找到 JSON 文件"""
+    fs_mocks.rglob.return_value = [
+        Path('/mock/data/file1.json'),
+        Path('/mock/data/file2.json'),
+    ]
 
-                    result = find_json_files(Path('/mock/data'))
+    result = find_json_files(Path('/mock/data'))
 
-                    assert len(result) == 2
-                    assert all(f.suffix == '.json' for f in result)
+    assert len(result) == 2
+    assert all(f.suffix == '.json' for f in result)
 
 
-def test_find_json_files_skips_hidden():
+def test_find_json_files_skips_hidden(fs_mocks: SimpleNamespace):
     """测试 find_json_files 跳过隐藏文件"""
-    from media_analyst.ui.parser_page import find_json_files
-
-    with patch('media_analyst.ui.parser_page.MEDIA_CRAWLER_PATH', Path('/mock')):
-        with patch('pathlib.Path.rglob') as mock_rglob:
-            with patch('pathlib.Path.exists') as mock_exists:
-                with patch('pathlib.Path.stat') as mock_stat:
-                    mock_exists.return_value = True
-                    mock_rglob.return_value = [
-                        Path('/mock/data/file1.json'),
-                        Path('/mock/data/.hidden.json'),
-                        Path('/mock/.hidden_dir/file2.json'),
-                    ]
-                    mock_stat.return_value = MagicMock(st_mtime=1000)
+    fs_mocks.rglob.return_value = [
+        Path('/mock/data/file1.json'),
+        Path('/mock/data/.hidden.json'),
+        Path('/mock/.hidden_dir/file2.json'),
+    ]
 
-                    result = find_json_files(Path('/mock/data'))
+    result = find_json_files(Path('/mock/data'))
 
-                    # 应该只返回非隐藏文件
-                    assert len(result) == 1
-                    assert result[0].name == 'file1.json'
+    # 应该只返回非隐藏文件
+    assert len(result) == 1
+    assert result[0].name == 'file1.json'
 
 
-def test_find_json_files_returns_empty_for_nonexistent():
+def test_find_json_files_returns_empty_for_nonexistent(fs_mocks: SimpleNamespace):
     """测试 find_json_files 对不存在目录返回空列表"""
-    from media_analyst.ui.parser_page import find_json_files
+    fs_mocks.exists.return_value = False
 
-    with patch('pathlib.Path.exists') as mock_exists:
-        mock_exists.return_value = False
+    result = find_json_files(Path('/nonexistent'))
 
-        result = find_json_files(Path('/nonexistent'))
+    assert result == []
+    fs_mocks.rglob.assert_not_called()
 
-        assert result == []
 
-
-def test_find_json_files_handles_permission_error():
+def test_find_json_files_handles_permission_error(fs_mocks: SimpleNamespace):
     """测试 find_json_files 处理权限错误"""
-    from media_analyst.ui.parser_page import find_json_files
-
-    with patch('pathlib.Path.exists') as mock_exists:
-        with patch('pathlib.Path.rglob') as mock_rglob:
-            mock_exists.return_value = True
-            mock_rglob.side_effect = PermissionError('Access denied')
+    fs_mocks.rglob.side_effect = PermissionError('Access denied')
 
-            result = find_json_files(Path('/protected'))
+    result = find_json_files(Path('/protected'))
 
-            assert result == []
+    assert result == []
 
 
-def test_find_json_files_sorts_by_mtime():
+def test_find_json_files_sorts_by_mtime(fs_mocks: SimpleNamespace):
     """测试 find_json_files 按修改时间排序"""
-    from media_analyst.ui.parser_page import find_json_files
-
     # 创建模拟文件对象
     file1 = MagicMock()
     file1.parts = ['mock', 'old.json']
@@ -197,16 +205,13 @@ def test_find_json_files_sorts_by_mtime():
     file2.stat.return_value = MagicMock(st_mtime=2000)
     file2.suffix = '.json'
 
-    with patch('pathlib.Path.exists') as mock_exists:
-        with patch('pathlib.Path.rglob') as mock_rglob:
-            mock_exists.return_value = True
-            mock_rglob.return_value = [file1, file2]
+    fs_mocks.rglob.return_value = [file1, file2]
 
-            result = find_json_files(Path('/mock'))
+    result = find_json_files(Path('/mock'))
 
-            # 新的在前
-            assert result[0] == file2
-            assert result[1] == file1
+    # 新的在前
+    assert result[0] == file2
+    assert result[1] == file1
 
 
 # ============================================================================
@@ -214,15 +219,10 @@ def test_find_json_files_sorts_by_mtime():
 # ============================================================================
 
 
-def test_parse_button_exists():
-    """测试解析按钮存在"""
-    at = AppTest.from_file(PARSER_PAGE_PATH)
-    at.run()
-
-    # 验证有按钮存在（按钮可能在主区域或需要根据状态显示）
-    # 由于解析按钮在无文件选择时可能不显示，我们验证页面加载成功
-    assert at is not None
-    assert len(at.button) >= 0  # 按钮数量可能为0（无文件时）或更多
+@pytest.mark.ui
+def test_parse_button_hidden_without_files(shared_at: AppTest):
+    """测试未选择文件时不显示解析按钮"""
+    assert '🔍 开始解析' not in [button.label for button in shared_at.button]
 
 
 # ============================================================================
@@ -230,42 +230,54 @@ def test_parse_button_exists():
 # ============================================================================
 
 
-def test_render_statistics_with_no_data():
-    """测试无数据时的统计渲染"""
-    from media_analyst.core.models import ParsedData
-    from media_analyst.ui.parser_page import render_statistics
+@pytest.fixture(scope='module')
+def empty_parsed() -> ParsedData:
+    """无数据的解析结果（只读，模块内共享）"""
+    return ParsedData(posts=[], comments=[])
 
-    parsed_data = ParsedData(posts=[], comments=[])
 
-    # 使用 mock 的 st 对象
-    with patch('media_analyst.ui.parser_page.st') as mock_st:
-        mock_st.columns.return_value = [MagicMock(), MagicMock(), MagicMock(), MagicMock()]
+@pytest.fixture(scope='module')
+def duplicated_parsed() -> ParsedData:
+    """包含重复帖子的解析结果（只读，模块内共享）"""
+    posts = [
+        Post(content_id='1', platform=Platform.DY),
+        Post(content_id='1', platform=Platform.DY),  # 重复
+    ]
+    return ParsedData(posts=posts, comments=[])
+
 
-        render_statistics(parsed_data)
+def test_render_statistics_with_no_data(mock_st: MagicMock, empty_parsed: ParsedData):
+    """测试无数据时的统计渲染"""
+    render_statistics(empty_parsed)
 
-        # 验证 metric 被调用
-        assert mock_st.metric.called
+    # 验证 metric 被调用
+    assert mock_st.metric.called
 
 
-def test_render_statistics_with_duplicates():
+def test_render_statistics_with_duplicates(mock_st: MagicMock, duplicated_parsed: ParsedData):
     """测试有重复数据时的统计渲染"""
-    from media_analyst.core.models import ParsedData, Platform, Post
-    from media_analyst.ui.parser_page import render_statistics
+    render_statistics(duplicated_parsed)
 
-    # 创建有重复的数据
-    posts = [
-        Post(content_id='1', platform=Platform.DY),
-        Post(content_id='1', platform=Platform.DY),  # 重复
-    ]
-    parsed_data = ParsedData(posts=posts, comments=[])
+    # 应该显示去重信息
+    assert mock_st.metric.called
+
+
+# ============================================================================
+# Errors Rendering Tests
+# ============================================================================
 
-    with patch('media_analyst.ui.parser_page.st') as mock_st:
-        mock_st.columns.return_value = [MagicMock(), MagicMock(), MagicMock(), MagicMock()]
 
-        render_statistics(parsed_data)
+def test_render_errors_single_warning(mock_st: MagicMock):
+    """测试错误信息合并为一条 warning 渲染"""
+    parsed_data = ParsedData(errors=[f'错误 {i}' for i in range(25)])
 
-        # 应该显示去重信息
-        assert mock_st.metric.called
+    render_errors(parsed_data)
+
+    mock_st.warning.assert_called_once()
+    message = mock_st.warning.call_args[0][0]
+    assert '错误 19' in message
+    assert '错误 20' not in message
+    mock_st.caption.assert_called_once()
 
 
 # ============================================================================
@@ -273,37 +285,34 @@ def test_render_statistics_with_duplicates():
 # ============================================================================
 
 
-def test_render_raw_preview_with_no_files():
+def test_render_raw_preview_with_no_files(mock_st: MagicMock):
     """测试无文件时的原始预览"""
-    from media_analyst.ui.parser_page import render_raw_preview
-
-    with patch('media_analyst.ui.parser_page.st') as mock_st:
-        render_raw_preview([])
+    render_raw_preview([])
 
-        # 应该显示提示信息
-        mock_st.info.assert_called_once()
+    # 应该显示提示信息
+    mock_st.info.assert_called_once()
 
 
-def test_render_raw_preview_with_files():
+def test_render_raw_preview_with_files(mock_st: MagicMock):
     """测试有文件时的原始预览"""
-    from media_analyst.ui.parser_page import render_raw_preview
+    file_content = json.dumps([{'id': 1, 'name': 'test'}])
+    mock_st.selectbox.return_value = '/fake/preview.json'
+
+    with patch('builtins.open', mock_open(read_data=file_content)):
+        render_raw_preview(['/fake/preview.json'])
 
-    with tempfile.NamedTemporaryFile(mode='w', suffix='.json', delete=False) as f:
-        json.dump([{'id': 1, 'name': 'test'}], f)
-        temp_path = f.name
+    # 验证 json 显示
+    mock_st.json.assert_called_once_with([{'id': 1, 'name': 'test'}])
 
-    try:
-        with patch('media_analyst.ui.parser_page.st') as mock_st:
-            mock_st.expander.return_value.__enter__ = MagicMock(return_value=mock_st)
-            mock_st.expander.return_value.__exit__ = MagicMock(return_value=False)
-            mock_st.selectbox.return_value = temp_path
 
-            render_raw_preview([temp_path])
+def test_render_raw_preview_with_missing_file(mock_st: MagicMock):
+    """测试选中文件已被删除时静默跳过预览"""
+    mock_st.selectbox.return_value = '/nonexistent/missing.json'
 
-            # 验证 json 显示
-            assert mock_st.json.called
-    finally:
-        Path(temp_path).unlink()
+    render_raw_preview(['/nonexistent/missing.json'])
+
+    assert not mock_st.json.called
+    assert not mock_st.error.called
 
 
 # ============================================================================
@@ -311,14 +320,11 @@ def test_render_raw_preview_with_files():
 # ============================================================================
 
 
-def test_supported_formats_expander_exists():
+@pytest.mark.ui
+def test_supported_formats_expander_exists(shared_at: AppTest):
     """测试支持的格式说明折叠面板存在"""
-    at = AppTest.from_file(PARSER_PAGE_PATH)
-    at.run()
-
     # 查找包含"支持的文件格式"的折叠面板
-    expanders = [e for e in at.expander if '支持的文件格式' in str(e.label)]
-    assert len(expanders) > 0
+    assert any('支持的文件格式' in str(e.label) for e in shared_at.expander)
 
 
 # ============================================================================
@@ -326,11 +332,9 @@ def test_supported_formats_expander_exists():
 # ============================================================================
 
 
-def test_parse_json_file_called_on_button_click():
+@pytest.mark.ui
+def test_parse_json_file_called_on_button_click(shared_at: AppTest):
     """测试点击解析按钮时调用 parse_json_file"""
-    at = AppTest.from_file(PARSER_PAGE_PATH)
-    at.run()
-
     with patch('media_analyst.ui.parser_page.parse_json_file') as mock_parse:
         mock_parse.return_value = MagicMock(
             posts=[],
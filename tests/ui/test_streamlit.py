@@ -9,15 +9,15 @@ Streamlit UI 测试
 使用函数形式编写测试
 """
 
-import sys
 from pathlib import Path
+from types import MappingProxyType
+from typing import List
 
 import pytest
+import streamlit as st
 from streamlit.testing.v1 import AppTest
 
-# 确保可以导入 src 模块
-sys.path.insert(0, str(Path(__file__).parent.parent.parent / 'src'))
-
+from media_analyst.core import PLATFORM_KEYS, ParsedLink
 from media_analyst.core.models import (
     CrawlerType,
     CreatorRequest,
@@ -25,24 +25,63 @@ from media_analyst.core.models import (
     Platform,
     SearchRequest,
 )
+from media_analyst.ui.app import build_request, build_request_cached
+
+# 各测试共用的通用配置（只读），测试中以 {**BASE_COMMON_CONFIG, ...} 覆盖差异字段
+BASE_COMMON_CONFIG = MappingProxyType(
+    {
+        'platform': 'dy',
+        'login_type': 'qrcode',
+        'save_option': 'json',
+        'save_path': None,
+        'max_comments': 100,
+        'get_comment': False,
+        'get_sub_comment': False,
+        'headless': True,
+    }
+)
 
 # 注意：AppTest 从文件加载，需要指向新的 app 路径
 APP_PATH = str(Path(__file__).parent.parent.parent / 'src' / 'media_analyst' / 'ui' / 'app.py')
 
 
+# ============================================================================
+# Fixtures
+# ============================================================================
+
+
+@pytest.fixture
+def at() -> AppTest:
+    """每个测试独立运行的页面（用于修改控件状态的测试）"""
+    app = AppTest.from_file(APP_PATH)
+    app.run()
+    return app
+
+
+@pytest.fixture(scope='module')
+def shared_at() -> AppTest:
+    """模块内共享的已运行页面（仅用于只读断言，不得修改控件状态）"""
+    app = AppTest.from_file(APP_PATH)
+    app.run()
+    return app
+
+
+def subheader_values(at: AppTest) -> List[str]:
+    """页面中所有子标题的文本"""
+    return [s.value for s in at.subheader]
+
+
 # ============================================================================
 # App Load Tests
 # ============================================================================
 
 
-def test_app_initial_load():
+@pytest.mark.ui
+def test_app_initial_load(shared_at: AppTest):
     """测试应用初始加载"""
-    at = AppTest.from_file(APP_PATH)
-    at.run()
-
     # 验证页面标题
-    assert at.title[0].value == '🕷️ MediaCrawler 控制台'
-    assert at.sidebar is not None
+    assert shared_at.title[0].value == '🕷️ MediaCrawler 控制台'
+    assert shared_at.sidebar is not None
 
 
 # ============================================================================
@@ -50,21 +89,17 @@ def test_app_initial_load():
 # ============================================================================
 
 
-def test_default_platform():
+@pytest.mark.ui
+def test_default_platform(shared_at: AppTest):
     """测试默认选中平台（受持久化偏好影响，默认是dy抖音）"""
-    at = AppTest.from_file(APP_PATH)
-    at.run()
-
-    platform_select = at.sidebar.selectbox[0]
+    platform_select = shared_at.sidebar.selectbox[0]
     # 持久化模块默认选择 dy（抖音）
     assert platform_select.value == 'dy'
 
 
-def test_switch_platform():
+@pytest.mark.ui
+def test_switch_platform(at: AppTest):
     """测试切换平台"""
-    at = AppTest.from_file(APP_PATH)
-    at.run()
-
     platform_select = at.sidebar.selectbox[0]
     platform_select.select('dy').run()
 
@@ -76,40 +111,31 @@ def test_switch_platform():
 # ============================================================================
 
 
-def test_search_mode_shows_keywords_input():
+@pytest.mark.ui
+def test_search_mode_shows_keywords_input(shared_at: AppTest):
     """搜索模式显示关键词输入"""
-    at = AppTest.from_file(APP_PATH)
-    at.run()
-
     # 默认是 search 模式
-    subheaders = [s.value for s in at.subheader]
-    assert '🔍 搜索模式配置' in subheaders
+    assert '🔍 搜索模式配置' in subheader_values(shared_at)
 
 
-def test_detail_mode_shows_url_input():
+@pytest.mark.ui
+def test_detail_mode_shows_url_input(at: AppTest):
     """详情模式显示 URL 输入"""
-    at = AppTest.from_file(APP_PATH)
-    at.run()
-
     # 切换到详情模式
     crawler_select = at.sidebar.selectbox[2]
     crawler_select.select('detail').run()
 
-    subheaders = [s.value for s in at.subheader]
-    assert '📄 详情模式配置' in subheaders
+    assert '📄 详情模式配置' in subheader_values(at)
 
 
-def test_creator_mode_shows_creator_input():
+@pytest.mark.ui
+def test_creator_mode_shows_creator_input(at: AppTest):
     """创作者模式显示创作者输入"""
-    at = AppTest.from_file(APP_PATH)
-    at.run()
-
     # 切换到创作者模式
     crawler_select = at.sidebar.selectbox[2]
     crawler_select.select('creator').run()
 
-    subheaders = [s.value for s in at.subheader]
-    assert '👤 创作者模式配置' in subheaders
+    assert '👤 创作者模式配置' in subheader_values(at)
 
 
 # ============================================================================
@@ -117,165 +143,105 @@ def test_creator_mode_shows_creator_input():
 # ============================================================================
 
 
-def test_build_search_request():
-    """测试构建搜索请求模型"""
-    from media_analyst.ui.app import build_request
-
-    common_config = {
-        'platform': 'dy',
-        'login_type': 'qrcode',
-        'crawler_type': 'search',
-        'save_option': 'json',
-        'save_path': None,
-        'max_comments': 100,
-        'get_comment': True,
-        'get_sub_comment': False,
-        'headless': True,
-    }
-    mode_config = {
-        'keywords': '美食,旅游',
-        'start_page': 2,
-    }
-
+BUILD_REQUEST_CASES = [
+    pytest.param(
+        {**BASE_COMMON_CONFIG, 'crawler_type': 'search', 'get_comment': True},
+        {'keywords': '美食,旅游', 'start_page': 2},
+        SearchRequest,
+        {
+            'crawler_type': CrawlerType.SEARCH,
+            'platform': Platform.DY,
+            'keywords': '美食,旅游',
+            'start_page': 2,
+            'get_comment': True,
+        },
+        id='search',
+    ),
+    pytest.param(
+        {
+            **BASE_COMMON_CONFIG,
+            'platform': 'xhs',
+            'login_type': 'cookie',
+            'crawler_type': 'detail',
+            'save_option': 'csv',
+            'save_path': '/custom/path',
+            'max_comments': 50,
+            'headless': False,
+        },
+        {'specified_ids': 'https://xiaohongshu.com/note/123', 'start_page': 1},
+        DetailRequest,
+        {
+            'platform': Platform.XHS,
+            'specified_ids': 'https://xiaohongshu.com/note/123',
+            'save_path': '/custom/path',
+            'headless': False,
+        },
+        id='detail',
+    ),
+    pytest.param(
+        {
+            **BASE_COMMON_CONFIG,
+            'platform': 'ks',
+            'login_type': 'phone',
+            'crawler_type': 'creator',
+            'save_option': 'excel',
+            'max_comments': 200,
+            'get_comment': True,
+            'get_sub_comment': True,
+        },
+        {'creator_ids': 'user1,user2', 'start_page': 3},
+        CreatorRequest,
+        {
+            'platform': Platform.KS,
+            'creator_ids': 'user1,user2',
+            'start_page': 3,
+        },
+        id='creator',
+    ),
+]
+
+
+@pytest.mark.parametrize('common_config,mode_config,expected_cls,expected_fields', BUILD_REQUEST_CASES)
+def test_build_request(common_config, mode_config, expected_cls, expected_fields):
+    """测试各模式构建出对应的请求模型"""
     request = build_request(common_config, mode_config)
 
-    # 验证类型
-    assert isinstance(request, SearchRequest)
-    assert request.crawler_type == CrawlerType.SEARCH
+    assert isinstance(request, expected_cls)
+    for field, value in expected_fields.items():
+        assert getattr(request, field) == value
 
-    # 验证字段
-    assert request.platform == Platform.DY
-    assert request.keywords == '美食,旅游'
-    assert request.start_page == 2
-    assert request.get_comment is True
 
+def test_build_request_cached_reuses_request():
+    """测试输入未变化时复用缓存的请求模型，输入变化时重新构建"""
+    common_config = {**BASE_COMMON_CONFIG, 'crawler_type': 'search', 'get_comment': True}
 
-def test_build_detail_request():
-    """测试构建详情请求模型"""
-    from media_analyst.ui.app import build_request
+    try:
+        first = build_request_cached(common_config, {'keywords': '美食', 'start_page': 1})
+        second = build_request_cached(dict(common_config), {'keywords': '美食', 'start_page': 1})
+        changed = build_request_cached(common_config, {'keywords': '旅游', 'start_page': 1})
 
-    common_config = {
-        'platform': 'xhs',
-        'login_type': 'cookie',
-        'crawler_type': 'detail',
-        'save_option': 'csv',
-        'save_path': '/custom/path',
-        'max_comments': 50,
-        'get_comment': False,
-        'get_sub_comment': False,
-        'headless': False,
-    }
-    mode_config = {
-        'specified_ids': 'https://xiaohongshu.com/note/123',
-        'start_page': 1,
-    }
+        assert second is first
+        assert changed is not first
+        assert changed.keywords == '旅游'
+    finally:
+        if '_request_cache' in st.session_state:
+            del st.session_state._request_cache
 
-    request = build_request(common_config, mode_config)
-
-    assert isinstance(request, DetailRequest)
-    assert request.platform == Platform.XHS
-    assert request.specified_ids == 'https://xiaohongshu.com/note/123'
-    assert request.save_path == '/custom/path'
-    assert request.headless is False
-
-
-def test_build_creator_request():
-    """测试构建创作者请求模型"""
-    from media_analyst.ui.app import build_request
-
-    common_config = {
-        'platform': 'ks',
-        'login_type': 'phone',
-        'crawler_type': 'creator',
-        'save_option': 'excel',
-        'save_path': None,
-        'max_comments': 200,
-        'get_comment': True,
-        'get_sub_comment': True,
-        'headless': True,
-    }
-    mode_config = {
-        'creator_ids': 'user1,user2',
-        'start_page': 3,
-    }
-
-    request = build_request(common_config, mode_config)
-
-    assert isinstance(request, CreatorRequest)
-    assert request.platform.value == 'ks'
-    assert request.creator_ids == 'user1,user2'
-    assert request.start_page == 3
-
-
-def test_build_request_rejects_empty_search_keywords():
-    """拒绝空的搜索关键词"""
-    from media_analyst.ui.app import build_request
-
-    common_config = {
-        'platform': 'dy',
-        'login_type': 'qrcode',
-        'crawler_type': 'search',
-        'save_option': 'json',
-        'save_path': None,
-        'max_comments': 100,
-        'get_comment': False,
-        'get_sub_comment': False,
-        'headless': True,
-    }
-    mode_config = {
-        'keywords': '',
-        'start_page': 1,
-    }
-
-    with pytest.raises(ValueError, match='搜索模式必须填写关键词'):
-        build_request(common_config, mode_config)
-
-
-def test_build_request_rejects_empty_detail_ids():
-    """拒绝空的详情 ID"""
-    from media_analyst.ui.app import build_request
-
-    common_config = {
-        'platform': 'dy',
-        'login_type': 'qrcode',
-        'crawler_type': 'detail',
-        'save_option': 'json',
-        'save_path': None,
-        'max_comments': 100,
-        'get_comment': False,
-        'get_sub_comment': False,
-        'headless': True,
-    }
-    mode_config = {
-        'specified_ids': '   ',  # 纯空白
-        'start_page': 1,
-    }
 
-    with pytest.raises(ValueError, match='详情模式必须填写'):
-        build_request(common_config, mode_config)
-
-
-def test_build_request_rejects_empty_creator_ids():
-    """拒绝空的创作者 ID"""
-    from media_analyst.ui.app import build_request
-
-    common_config = {
-        'platform': 'dy',
-        'login_type': 'qrcode',
-        'crawler_type': 'creator',
-        'save_option': 'json',
-        'save_path': None,
-        'max_comments': 100,
-        'get_comment': False,
-        'get_sub_comment': False,
-        'headless': True,
-    }
-    mode_config = {
-        'creator_ids': '',
-        'start_page': 1,
-    }
+@pytest.mark.parametrize(
+    'crawler_type,mode_config,message',
+    [
+        pytest.param('search', {'keywords': '', 'start_page': 1}, '搜索模式必须填写关键词', id='empty-keywords'),
+        pytest.param('detail', {'specified_ids': '   ', 'start_page': 1}, '详情模式必须填写', id='blank-ids'),
+        pytest.param('creator', {'creator_ids': '', 'start_page': 1}, '创作者模式必须填写', id='empty-creators'),
+        pytest.param('unknown_type', {}, '未知的爬虫类型', id='unknown-type'),
+    ],
+)
+def test_build_request_rejects_invalid_input(crawler_type, mode_config, message):
+    """拒绝空的必填输入和未知的爬虫类型"""
+    common_config = {**BASE_COMMON_CONFIG, 'crawler_type': crawler_type}
 
-    with pytest.raises(ValueError, match='创作者模式必须填写'):
+    with pytest.raises(ValueError, match=message):
         build_request(common_config, mode_config)
 
 
@@ -284,13 +250,18 @@ def test_build_request_rejects_empty_creator_ids():
 # ============================================================================
 
 
-def test_command_preview_expander_exists():
-    """验证命令预览区域存在"""
-    at = AppTest.from_file(APP_PATH)
-    at.run()
+@pytest.mark.ui
+def test_command_preview_expander_exists(at: AppTest):
+    """验证打开预览开关后命令预览区域存在"""
+    at.toggle(key='show_preview').set_value(True).run()
+
+    assert any(e.label == '📜 命令预览' for e in at.expander)
 
-    expanders = [e.label for e in at.expander]
-    assert '📜 命令预览' in expanders
+
+@pytest.mark.ui
+def test_command_preview_hidden_by_default(shared_at: AppTest):
+    """验证预览开关默认关闭，不渲染命令预览"""
+    assert not any(e.label == '📜 命令预览' for e in shared_at.expander)
 
 
 # ============================================================================
@@ -298,22 +269,18 @@ def test_command_preview_expander_exists():
 # ============================================================================
 
 
-def test_all_selectboxes_present():
+@pytest.mark.ui
+def test_all_selectboxes_present(shared_at: AppTest):
     """验证所有选择器存在"""
-    at = AppTest.from_file(APP_PATH)
-    at.run()
-
     # 侧边栏应有：平台、登录方式、爬虫类型、保存格式
-    assert len(at.sidebar.selectbox) >= 4
+    assert len(shared_at.sidebar.selectbox) >= 4
 
 
-def test_checkboxes_present():
+@pytest.mark.ui
+def test_checkboxes_present(shared_at: AppTest):
     """验证复选框存在"""
-    at = AppTest.from_file(APP_PATH)
-    at.run()
-
     # 至少应有：获取评论、获取子评论、无头模式
-    assert len(at.sidebar.checkbox) >= 3
+    assert len(shared_at.sidebar.checkbox) >= 3
 
 
 # ============================================================================
@@ -321,58 +288,30 @@ def test_checkboxes_present():
 # ============================================================================
 
 
-def test_full_search_workflow_model():
-    """完整搜索流程的模型验证"""
-    at = AppTest.from_file(APP_PATH)
+@pytest.mark.ui
+def test_full_search_workflow_model(at: AppTest):
+    """完整搜索流程：选择控件、填写关键词后，命令预览反映所选配置"""
+    # 1. 选择平台和登录方式（不在表单中，重跑后生效）
+    at.sidebar.selectbox[0].select('xhs')
+    at.sidebar.selectbox[1].select('cookie')
     at.run()
 
-    # 1. 选择平台
-    platform_select = at.sidebar.selectbox[0]
-    platform_select.select('dy').run()
-
-    # 2. 选择登录方式
-    login_select = at.sidebar.selectbox[1]
-    login_select.select('qrcode').run()
-
-    # 3. 确认搜索模式
-    # 默认就是 search，无需切换
-
-    # 4. 填写关键词
-    # 注意：在真实测试中，这里需要找到 textarea 并设置值
-    # 但由于 streamlit testing 的限制，我们直接测试 build_request
-
-    # 5. 构建请求模型（模拟表单提交）
-    from media_analyst.ui.app import build_request
-
-    common_config = {
-        'platform': platform_select.value,
-        'login_type': login_select.value,
-        'crawler_type': 'search',
-        'save_option': 'json',
-        'save_path': None,
-        'max_comments': 100,
-        'get_comment': True,
-        'get_sub_comment': False,
-        'headless': True,
-    }
-    mode_config = {
-        'keywords': '美食探店',
-        'start_page': 1,
-    }
-
-    request = build_request(common_config, mode_config)
+    # 2. 默认即搜索模式，填写关键词并打开命令预览
+    at.text_area[0].input('美食探店')
+    at.toggle(key='show_preview').set_value(True)
+    at.run()
 
-    # 验证模型
-    assert isinstance(request, SearchRequest)
-    assert request.platform == Platform.DY
-    assert request.keywords == '美食探店'
+    assert not at.exception
+    assert at.sidebar.selectbox[0].value == 'xhs'
+    assert at.sidebar.selectbox[1].value == 'cookie'
 
-    # 验证可转换为 CLI 参数
-    cli_args = request.to_cli_args()
-    assert '--platform' in cli_args
-    assert 'dy' in cli_args
-    assert '--keywords' in cli_args
-    assert '美食探店' in cli_args
+    # 3. 预览的命令由页面构建的请求生成
+    assert len(at.code) == 1
+    cmd = at.code[0].value
+    assert '--platform xhs' in cmd
+    assert '--lt cookie' in cmd
+    assert '--type search' in cmd
+    assert "--keywords '美食探店'" in cmd
 
 
 # ============================================================================
@@ -382,20 +321,7 @@ def test_full_search_workflow_model():
 
 def test_build_detail_request_with_parsed_links():
     """测试详情模式使用解析后的链接"""
-    from media_analyst.core import ParsedLink
-    from media_analyst.ui.app import build_request
-
-    common_config = {
-        'platform': 'dy',
-        'login_type': 'qrcode',
-        'crawler_type': 'detail',
-        'save_option': 'json',
-        'save_path': None,
-        'max_comments': 100,
-        'get_comment': False,
-        'get_sub_comment': False,
-        'headless': True,
-    }
+    common_config = {**BASE_COMMON_CONFIG, 'crawler_type': 'detail'}
     mode_config = {
         'specified_ids': '',
         'start_page': 1,
@@ -415,44 +341,16 @@ def test_build_detail_request_with_parsed_links():
     assert 'abc123' in request.specified_ids
 
 
-# ============================================================================
-# Unknown Crawler Type Tests
-# ============================================================================
-
-
-def test_build_request_rejects_unknown_crawler_type():
-    """拒绝未知的爬虫类型"""
-    from media_analyst.ui.app import build_request
-
-    common_config = {
-        'platform': 'dy',
-        'login_type': 'qrcode',
-        'crawler_type': 'unknown_type',
-        'save_option': 'json',
-        'save_path': None,
-        'max_comments': 100,
-        'get_comment': False,
-        'get_sub_comment': False,
-        'headless': True,
-    }
-    mode_config = {}
-
-    with pytest.raises(ValueError, match='未知的爬虫类型'):
-        build_request(common_config, mode_config)
-
-
 # ============================================================================
 # Sidebar Config Tests
 # ============================================================================
 
 
-def test_login_type_selection():
+@pytest.mark.ui
+def test_login_type_selection(shared_at: AppTest):
     """测试登录方式选择"""
-    at = AppTest.from_file(APP_PATH)
-    at.run()
-
     # 第二个 selectbox 是登录方式
-    login_select = at.sidebar.selectbox[1]
+    login_select = shared_at.sidebar.selectbox[1]
     login_options = login_select.options
 
     # 应有扫码登录、手机号登录、Cookie 登录选项（中文显示文本）
@@ -461,13 +359,11 @@ def test_login_type_selection():
     assert any('Cookie' in opt for opt in login_options)
 
 
-def test_crawler_type_selection():
+@pytest.mark.ui
+def test_crawler_type_selection(shared_at: AppTest):
     """测试爬虫类型选择"""
-    at = AppTest.from_file(APP_PATH)
-    at.run()
-
     # 第三个 selectbox 是爬虫类型
-    crawler_select = at.sidebar.selectbox[2]
+    crawler_select = shared_at.sidebar.selectbox[2]
     crawler_options = crawler_select.options
 
     # 应有搜索模式、详情模式、创作者模式选项（中文显示文本）
@@ -476,13 +372,11 @@ def test_crawler_type_selection():
     assert any('创作者' in opt for opt in crawler_options)
 
 
-def test_save_option_selection():
+@pytest.mark.ui
+def test_save_option_selection(shared_at: AppTest):
     """测试保存格式选择"""
-    at = AppTest.from_file(APP_PATH)
-    at.run()
-
     # 第四个 selectbox 是保存格式
-    save_select = at.sidebar.selectbox[3]
+    save_select = shared_at.sidebar.selectbox[3]
     save_options = save_select.options
 
     # 应有 json, csv, excel 等选项
@@ -490,13 +384,11 @@ def test_save_option_selection():
     assert 'csv' in save_options
 
 
-def test_max_comments_number_input():
+@pytest.mark.ui
+def test_max_comments_number_input(shared_at: AppTest):
     """测试最大评论数输入"""
-    at = AppTest.from_file(APP_PATH)
-    at.run()
-
     # 查找数字输入
-    number_inputs = at.sidebar.number_input
+    number_inputs = shared_at.sidebar.number_input
     assert len(number_inputs) > 0
 
     # 第一个应该是 max_comments
@@ -504,12 +396,10 @@ def test_max_comments_number_input():
     assert max_comments.value >= 0
 
 
-def test_comment_checkboxes():
+@pytest.mark.ui
+def test_comment_checkboxes(shared_at: AppTest):
     """测试评论相关复选框"""
-    at = AppTest.from_file(APP_PATH)
-    at.run()
-
-    checkboxes = at.sidebar.checkbox
+    checkboxes = shared_at.sidebar.checkbox
     checkbox_labels = [cb.label for cb in checkboxes]
 
     # 检查有获取评论和无头模式选项
@@ -517,27 +407,38 @@ def test_comment_checkboxes():
     assert any('无头' in label or 'headless' in label.lower() for label in checkbox_labels)
 
 
+@pytest.mark.ui
+def test_common_settings_apply_on_submit(at: AppTest):
+    """通用设置在表单中，点击「应用设置」后才生效"""
+    original = at.sidebar.number_input[0].value
+
+    # 未提交时重跑页面，修改不生效
+    at.sidebar.number_input[0].set_value(original + 1).run()
+    assert at.sidebar.number_input[0].value == original
+
+    at.sidebar.number_input[0].set_value(original + 1)
+    next(b for b in at.sidebar.button if '应用设置' in b.label).click().run()
+
+    assert at.sidebar.number_input[0].value == original + 1
+
+
 # ============================================================================
 # Expander Tests
 # ============================================================================
 
 
-def test_usage_expander_exists():
+@pytest.mark.ui
+def test_usage_expander_exists(shared_at: AppTest):
     """验证使用说明折叠面板存在"""
-    at = AppTest.from_file(APP_PATH)
-    at.run()
+    assert any(e.label == '📖 使用说明' for e in shared_at.expander)
 
-    expanders = [e.label for e in at.expander]
-    assert '📖 使用说明' in expanders
 
-
-def test_model_details_expander():
+@pytest.mark.ui
+def test_model_details_expander(at: AppTest):
     """验证请求模型详情折叠面板存在（在命令预览内）"""
-    at = AppTest.from_file(APP_PATH)
-    at.run()
+    at.toggle(key='show_preview').set_value(True).run()
 
-    expanders = [e.label for e in at.expander]
-    assert '📜 命令预览' in expanders
+    assert any(e.label == '📜 命令预览' for e in at.expander)
 
 
 # ============================================================================
@@ -545,21 +446,17 @@ def test_model_details_expander():
 # ============================================================================
 
 
-def test_start_button_exists():
+@pytest.mark.ui
+def test_start_button_exists(shared_at: AppTest):
     """验证开始按钮存在"""
-    at = AppTest.from_file(APP_PATH)
-    at.run()
-
-    buttons = [b for b in at.button if '开始' in str(b.label) or '爬取' in str(b.label)]
+    buttons = [b for b in shared_at.button if '开始' in str(b.label) or '爬取' in str(b.label)]
     assert len(buttons) > 0
 
 
-def test_open_directory_button_exists():
+@pytest.mark.ui
+def test_open_directory_button_exists(shared_at: AppTest):
     """验证打开目录按钮存在"""
-    at = AppTest.from_file(APP_PATH)
-    at.run()
-
-    buttons = [b for b in at.button if '目录' in str(b.label)]
+    buttons = [b for b in shared_at.button if '目录' in str(b.label)]
     # 可能有多个打开目录按钮
     assert len(buttons) >= 0  # 页面结构可能变化
 
@@ -569,37 +466,14 @@ def test_open_directory_button_exists():
 # ============================================================================
 
 
-def test_detail_mode_for_douyin():
-    """测试抖音详情模式的特殊处理"""
-    at = AppTest.from_file(APP_PATH)
-    at.run()
-
-    # 选择抖音平台
-    platform_select = at.sidebar.selectbox[0]
-    platform_select.select('dy').run()
-
+@pytest.mark.ui
+def test_detail_mode_for_each_platform(at: AppTest):
+    """测试各平台的详情模式（同一页面依次切换平台，每个平台只重跑一次脚本）"""
     # 切换到详情模式
-    crawler_select = at.sidebar.selectbox[2]
-    crawler_select.select('detail').run()
+    at.sidebar.selectbox[2].select('detail')
 
-    # 验证有子标题显示详情模式配置
-    subheaders = [s.value for s in at.subheader]
-    assert any('详情' in s for s in subheaders)
-
-
-def test_detail_mode_for_xiaohongshu():
-    """测试小红书详情模式"""
-    at = AppTest.from_file(APP_PATH)
-    at.run()
-
-    # 选择小红书平台
-    platform_select = at.sidebar.selectbox[0]
-    platform_select.select('xhs').run()
-
-    # 切换到详情模式
-    crawler_select = at.sidebar.selectbox[2]
-    crawler_select.select('detail').run()
+    for platform in PLATFORM_KEYS:
+        at.sidebar.selectbox[0].select(platform).run()
 
-    # 验证有详情模式配置
-    subheaders = [s.value for s in at.subheader]
-    assert any('详情' in s for s in subheaders)
+        # 验证有子标题显示详情模式配置
+        assert any('详情' in s for s in subheader_values(at)), platform
@@ -6,87 +6,72 @@ CLI 入口单元测试
 
 import sys
 from pathlib import Path
-from unittest.mock import MagicMock, patch
+from unittest.mock import MagicMock
 
 import pytest
 
 from media_analyst.cli import main
 
 # ============================================================================
-# Main Function Tests
+# Fixtures
 # ============================================================================
 
 
-def test_main_calls_streamlit_run():
-    """验证 main() 使用正确的参数调用 streamlit run"""
-    with patch('media_analyst.cli.subprocess.run') as mock_run:
-        mock_run.return_value = MagicMock(returncode=0)
-
-        with pytest.raises(SystemExit):
-            main()
-
-        # 验证 subprocess.run 被调用
-        mock_run.assert_called_once()
-        call_args = mock_run.call_args
+@pytest.fixture
+def mock_run(monkeypatch) -> MagicMock:
+    """替换 subprocess.run，默认返回码为 0"""
+    mock = MagicMock(return_value=MagicMock(returncode=0))
+    monkeypatch.setattr('media_analyst.cli.subprocess.run', mock)
+    return mock
 
-        # 验证命令结构
-        cmd = call_args[0][0]
-        assert cmd[0] == sys.executable
-        assert cmd[1] == '-m'
-        assert cmd[2] == 'streamlit'
-        assert cmd[3] == 'run'
-        assert cmd[4].endswith('app.py')
 
-
-def test_main_exits_with_returncode():
-    """验证 main() 使用子进程的返回码退出"""
-    with patch('media_analyst.cli.subprocess.run') as mock_run:
-        mock_run.return_value = MagicMock(returncode=42)
-
-        with pytest.raises(SystemExit) as exc_info:
-            main()
-
-        assert exc_info.value.code == 42
+# ============================================================================
+# Main Function Tests
+# ============================================================================
 
 
-def test_main_exits_with_zero_on_success():
-    """验证成功时返回码为 0"""
-    with patch('media_analyst.cli.subprocess.run') as mock_run:
-        mock_run.return_value = MagicMock(returncode=0)
+def test_main_calls_streamlit_run(mock_run: MagicMock):
+    """验证 main() 使用正确的参数调用 streamlit run"""
+    with pytest.raises(SystemExit):
+        main()
 
-        with pytest.raises(SystemExit) as exc_info:
-            main()
+    # 验证 subprocess.run 被调用
+    mock_run.assert_called_once()
+    call_args = mock_run.call_args
 
-        assert exc_info.value.code == 0
+    # 验证命令结构
+    cmd = call_args[0][0]
+    assert cmd[0] == sys.executable
+    assert cmd[1] == '-m'
+    assert cmd[2] == 'streamlit'
+    assert cmd[3] == 'run'
+    assert cmd[4].endswith('app.py')
 
 
-def test_main_exits_with_nonzero_on_failure():
-    """验证失败时返回非零返回码"""
-    with patch('media_analyst.cli.subprocess.run') as mock_run:
-        mock_run.return_value = MagicMock(returncode=1)
+@pytest.mark.parametrize('returncode', [0, 1, 42, 127])
+def test_main_exits_with_returncode(mock_run: MagicMock, returncode: int):
+    """验证 main() 使用子进程的返回码退出（成功、失败、命令未找到等）"""
+    mock_run.return_value = MagicMock(returncode=returncode)
 
-        with pytest.raises(SystemExit) as exc_info:
-            main()
+    with pytest.raises(SystemExit) as exc_info:
+        main()
 
-        assert exc_info.value.code == 1
+    assert exc_info.value.code == returncode
 
 
-def test_main_app_path_resolution():
+def test_main_app_path_resolution(mock_run: MagicMock):
     """验证 app.py 路径正确解析"""
-    with patch('media_analyst.cli.subprocess.run') as mock_run:
-        mock_run.return_value = MagicMock(returncode=0)
-
-        with pytest.raises(SystemExit):
-            main()
+    with pytest.raises(SystemExit):
+        main()
 
-        call_args = mock_run.call_args
-        app_path = call_args[0][0][4]
+    call_args = mock_run.call_args
+    app_path = call_args[0][0][4]
 
-        # 验证路径存在且是文件
-        path_obj = Path(app_path)
-        assert path_obj.exists()
-        assert path_obj.name == 'app.py'
-        assert path_obj.parent.name == 'ui'
+    # 验证路径存在且是文件
+    path_obj = Path(app_path)
+    assert path_obj.exists()
+    assert path_obj.name == 'app.py'
+    assert path_obj.parent.name == 'ui'
 
 
 # ============================================================================
@@ -94,24 +79,12 @@ def test_main_app_path_resolution():
 # ============================================================================
 
 
-def test_main_handles_subprocess_failure():
-    """验证处理子进程执行失败"""
-    with patch('media_analyst.cli.subprocess.run') as mock_run:
-        mock_run.return_value = MagicMock(returncode=127)
-
-        with pytest.raises(SystemExit) as exc_info:
-            main()
-
-        assert exc_info.value.code == 127
-
-
-def test_main_propagates_exception_on_subprocess_error():
+def test_main_propagates_exception_on_subprocess_error(mock_run: MagicMock):
     """验证子进程异常被正确传播"""
-    with patch('media_analyst.cli.subprocess.run') as mock_run:
-        mock_run.side_effect = OSError('Command not found')
+    mock_run.side_effect = OSError('Command not found')
 
-        with pytest.raises(OSError, match='Command not found'):
-            main()
+    with pytest.raises(OSError, match='Command not found'):
+        main()
 
 
 # ============================================================================
@@ -128,15 +101,14 @@ def test_module_entry_point():
     assert callable(cli_module.main)
 
 
-def test_main_check_false():
+def test_main_check_false(mock_run: MagicMock):
     """验证 check=False 允许非零返回码不抛出异常"""
-    with patch('media_analyst.cli.subprocess.run') as mock_run:
-        mock_run.return_value = MagicMock(returncode=1)
+    mock_run.return_value = MagicMock(returncode=1)
 
-        # 不应该抛出 CalledProcessError，因为 check=False
-        with pytest.raises(SystemExit):
-            main()
+    # 不应该抛出 CalledProcessError，因为 check=False
+    with pytest.raises(SystemExit):
+        main()
 
-        # 验证 check=False 被传递
-        call_kwargs = mock_run.call_args[1]
-        assert call_kwargs.get('check') is False
+    # 验证 check=False 被传递
+    call_kwargs = mock_run.call_args[1]
+    assert call_kwargs.get('check') is False
@@ -11,8 +11,10 @@ Core Models 单元测试
 
 from datetime import datetime, timedelta
 from pathlib import Path
+from unittest.mock import patch
 
 import pytest
+from pydantic import ValidationError
 
 from media_analyst.core.models import (
     Comment,
@@ -27,6 +29,16 @@ from media_analyst.core.models import (
     SearchRequest,
 )
 
+
+@pytest.fixture(scope='module')
+def sample_request() -> SearchRequest:
+    """执行状态测试共用的搜索请求（模型不可变，可在模块内共享）"""
+    return SearchRequest(platform=Platform.DY, keywords='测试')
+
+
+# 测试中用作时间戳的固定时间（结果与具体时间无关，固定后输出可复现）
+FIXED_NOW = datetime(2024, 1, 1, 12, 0, 0)
+
 # ============================================================================
 # SearchRequest Tests
 # ============================================================================
@@ -198,7 +210,7 @@ def test_request_is_frozen():
         keywords='测试',
     )
 
-    with pytest.raises(Exception):
+    with pytest.raises(ValidationError, match='frozen'):
         req.keywords = '修改'
 
 
@@ -207,85 +219,89 @@ def test_request_is_frozen():
 # ============================================================================
 
 
-def test_execution_creation_with_valid_request():
+def test_execution_creation_with_valid_request(sample_request: SearchRequest):
     """测试使用有效请求创建执行状态"""
-    request = SearchRequest(
-        platform=Platform.DY,
-        keywords='美食',
-    )
+    execution = CrawlerExecution(request=sample_request)
 
-    execution = CrawlerExecution(request=request)
-
-    assert execution.request == request
+    assert execution.request == sample_request
     assert execution.status == ExecutionStatus.PENDING
     assert execution.start_time is None
     assert execution.process_id is None
 
 
-def test_execution_validates_nonexistent_output_files():
+def test_pending_matches_validated_construction(sample_request: SearchRequest):
+    """pending() 跳过校验，但结果与正常构造一致"""
+    assert CrawlerExecution.pending(sample_request) == CrawlerExecution(request=sample_request)
+
+
+def test_execution_validates_nonexistent_output_files(sample_request: SearchRequest):
     """执行状态拒绝不存在的输出文件"""
-    request = SearchRequest(platform=Platform.DY, keywords='测试')
     nonexistent_file = Path('/tmp/definitely_not_exists_12345.json')
 
     with pytest.raises(ValueError, match='输出文件不存在'):
         CrawlerExecution(
-            request=request,
+            request=sample_request,
             output_files=[nonexistent_file],
         )
 
 
-def test_execution_accepts_existing_files(tmp_path: Path):
-    """执行状态接受存在的文件"""
-    request = SearchRequest(platform=Platform.DY, keywords='测试')
-    existing_file = tmp_path / 'test.json'
-    existing_file.write_text('{"test": true}')
+def test_execution_skip_fs_context_bypasses_existence_check(sample_request: SearchRequest):
+    """从可信数据恢复时可通过 context 跳过文件存在性检查"""
+    saved_file = Path('/nonexistent/saved.json')
 
-    execution = CrawlerExecution(
-        request=request,
-        output_files=[existing_file],
+    execution = CrawlerExecution.model_validate(
+        {'request': sample_request, 'output_files': [saved_file]},
+        context={'skip_fs': True},
     )
 
+    assert execution.output_files == [saved_file]
+
+
+def test_execution_accepts_existing_files(sample_request: SearchRequest):
+    """执行状态接受存在的文件"""
+    existing_file = Path('/fake/output/test.json')
+
+    # 校验只调用 exists()，无需真实写盘
+    with patch.object(Path, 'exists', return_value=True):
+        execution = CrawlerExecution(
+            request=sample_request,
+            output_files=[existing_file],
+        )
+
     assert execution.output_files == [existing_file]
 
 
-def test_execution_status_running_requires_process_id():
+def test_execution_status_running_requires_process_id(sample_request: SearchRequest):
     """RUNNING 状态必须有 process_id"""
-    request = SearchRequest(platform=Platform.DY, keywords='测试')
-
     with pytest.raises(ValueError, match='running 状态必须有 process_id'):
         CrawlerExecution(
-            request=request,
+            request=sample_request,
             status=ExecutionStatus.RUNNING,
         )
 
 
-def test_execution_status_completed_requires_end_time():
+def test_execution_status_completed_requires_end_time(sample_request: SearchRequest):
     """COMPLETED 状态必须有 end_time"""
-    request = SearchRequest(platform=Platform.DY, keywords='测试')
-
     with pytest.raises(ValueError, match='completed 状态必须有 end_time'):
         CrawlerExecution(
-            request=request,
+            request=sample_request,
             status=ExecutionStatus.COMPLETED,
         )
 
 
-def test_execution_status_failed_requires_error():
+def test_execution_status_failed_requires_error(sample_request: SearchRequest):
     """FAILED 状态必须有错误信息"""
-    request = SearchRequest(platform=Platform.DY, keywords='测试')
-
     with pytest.raises(ValueError, match='FAILED 状态必须有 error_message 或 stderr_lines'):
         CrawlerExecution(
-            request=request,
+            request=sample_request,
             status=ExecutionStatus.FAILED,
-            end_time=datetime.now(),
+            end_time=FIXED_NOW,
         )
 
 
-def test_mark_running():
+def test_mark_running(sample_request: SearchRequest):
     """测试标记为运行中"""
-    request = SearchRequest(platform=Platform.DY, keywords='测试')
-    execution = CrawlerExecution(request=request)
+    execution = CrawlerExecution.pending(sample_request)
 
     execution.mark_running(process_id=12345)
 
@@ -294,10 +310,9 @@ def test_mark_running():
     assert execution.start_time is not None
 
 
-def test_mark_completed_success():
+def test_mark_completed_success(sample_request: SearchRequest):
     """测试标记为成功完成"""
-    request = SearchRequest(platform=Platform.DY, keywords='测试')
-    execution = CrawlerExecution(request=request)
+    execution = CrawlerExecution.pending(sample_request)
     execution.mark_running(process_id=12345)
 
     execution.mark_completed(return_code=0)
@@ -307,10 +322,9 @@ def test_mark_completed_success():
     assert execution.end_time is not None
 
 
-def test_mark_completed_failure():
+def test_mark_completed_failure(sample_request: SearchRequest):
     """测试标记为失败完成"""
-    request = SearchRequest(platform=Platform.DY, keywords='测试')
-    execution = CrawlerExecution(request=request)
+    execution = CrawlerExecution.pending(sample_request)
     execution.mark_running(process_id=12345)
 
     execution.mark_completed(return_code=1)
@@ -320,10 +334,9 @@ def test_mark_completed_failure():
     assert execution.error_message == '进程返回码: 1'
 
 
-def test_duration_calculation():
+def test_duration_calculation(sample_request: SearchRequest):
     """测试时长计算"""
-    request = SearchRequest(platform=Platform.DY, keywords='测试')
-    execution = CrawlerExecution(request=request)
+    execution = CrawlerExecution.pending(sample_request)
 
     # 未开始
     assert execution.duration_seconds is None
@@ -338,21 +351,19 @@ def test_duration_calculation():
     assert execution.duration_seconds == 5.0
 
 
-def test_is_finished_property():
+def test_is_finished_property(sample_request: SearchRequest):
     """测试 is_finished 属性"""
-    request = SearchRequest(platform=Platform.DY, keywords='测试')
-
-    pending = CrawlerExecution(request=request, status=ExecutionStatus.PENDING)
+    pending = CrawlerExecution(request=sample_request, status=ExecutionStatus.PENDING)
     running = CrawlerExecution(
-        request=request,
+        request=sample_request,
         status=ExecutionStatus.RUNNING,
         process_id=12345,
-        start_time=datetime.now(),
+        start_time=FIXED_NOW,
     )
     completed = CrawlerExecution(
-        request=request,
+        request=sample_request,
         status=ExecutionStatus.COMPLETED,
-        end_time=datetime.now(),
+        end_time=FIXED_NOW,
     )
 
     assert not pending.is_finished
@@ -397,10 +408,9 @@ def test_search_request_deserialization():
     assert req.start_page == 2
 
 
-def test_execution_serialization():
+def test_execution_serialization(sample_request: SearchRequest):
     """测试执行状态序列化"""
-    request = SearchRequest(platform=Platform.DY, keywords='测试')
-    execution = CrawlerExecution(request=request)
+    execution = CrawlerExecution(request=sample_request)
     execution.mark_running(process_id=12345)
 
     data = execution.model_dump()
@@ -415,10 +425,9 @@ def test_execution_serialization():
 # ============================================================================
 
 
-def test_mark_failed():
+def test_mark_failed(sample_request: SearchRequest):
     """测试 mark_failed 方法"""
-    request = SearchRequest(platform=Platform.DY, keywords='测试')
-    execution = CrawlerExecution(request=request)
+    execution = CrawlerExecution.pending(sample_request)
 
     execution.mark_failed('Something went wrong')
 
@@ -427,18 +436,14 @@ def test_mark_failed():
     assert execution.end_time is not None
 
 
-def test_mark_failed_requires_error_message():
+def test_mark_failed_requires_error_message(sample_request: SearchRequest):
     """测试 mark_failed 后状态验证需要 error_message"""
-    from datetime import datetime
-
-    request = SearchRequest(platform=Platform.DY, keywords='测试')
-
     # 创建时没有错误信息会导致验证失败
     with pytest.raises(ValueError, match='FAILED 状态必须有 error_message 或 stderr_lines'):
         CrawlerExecution(
-            request=request,
+            request=sample_request,
             status=ExecutionStatus.FAILED,
-            end_time=datetime.now(),
+            end_time=FIXED_NOW,
         )
 
 
@@ -447,10 +452,9 @@ def test_mark_failed_requires_error_message():
 # ============================================================================
 
 
-def test_full_output_property():
+def test_full_output_property(sample_request: SearchRequest):
     """测试 full_output 属性"""
-    request = SearchRequest(platform=Platform.DY, keywords='测试')
-    execution = CrawlerExecution(request=request)
+    execution = CrawlerExecution(request=sample_request)
 
     execution.add_output('Line 1')
     execution.add_output('Line 2')
@@ -459,10 +463,23 @@ def test_full_output_property():
     assert execution.full_output == 'Line 1\nLine 2\nLine 3'
 
 
-def test_full_stderr_property():
+def test_full_output_tracks_appends_and_replacement(sample_request: SearchRequest):
+    """测试 full_output 缓存在追加和整体替换后保持正确"""
+    execution = CrawlerExecution(request=sample_request)
+
+    execution.add_output('Line 1')
+    assert execution.full_output == 'Line 1'
+
+    execution.add_outputs(['Line 2', 'Line 3'])
+    assert execution.full_output == 'Line 1\nLine 2\nLine 3'
+
+    execution.stdout_lines = ['New']
+    assert execution.full_output == 'New'
+
+
+def test_full_stderr_property(sample_request: SearchRequest):
     """测试 full_stderr 属性"""
-    request = SearchRequest(platform=Platform.DY, keywords='测试')
-    execution = CrawlerExecution(request=request)
+    execution = CrawlerExecution(request=sample_request)
 
     execution.add_output('Error 1', is_stderr=True)
     execution.add_output('Error 2', is_stderr=True)
@@ -470,10 +487,9 @@ def test_full_stderr_property():
     assert execution.full_stderr == 'Error 1\nError 2'
 
 
-def test_stdout_stderr_separation():
+def test_stdout_stderr_separation(sample_request: SearchRequest):
     """测试 stdout 和 stderr 分离"""
-    request = SearchRequest(platform=Platform.DY, keywords='测试')
-    execution = CrawlerExecution(request=request)
+    execution = CrawlerExecution(request=sample_request)
 
     execution.add_output('stdout line')
     execution.add_output('stderr line', is_stderr=True)
@@ -485,51 +501,107 @@ def test_stdout_stderr_separation():
     assert 'stderr line' in execution.full_stderr
 
 
+def test_add_outputs_appends_batch(sample_request: SearchRequest):
+    """测试批量添加输出"""
+    execution = CrawlerExecution(request=sample_request)
+
+    execution.add_output('Line 1')
+    execution.add_outputs(['Line 2', 'Line 3'])
+    execution.add_outputs(['Error 1'], is_stderr=True)
+
+    assert execution.stdout_lines == ['Line 1', 'Line 2', 'Line 3']
+    assert execution.stderr_lines == ['Error 1']
+
+
 # ============================================================================
 # Update Output Files Tests
 # ============================================================================
 
 
-def test_update_output_files_validates_existence(tmp_path: Path):
+def test_update_output_files_validates_existence(sample_request: SearchRequest):
     """测试 update_output_files 验证文件存在性"""
-    request = SearchRequest(platform=Platform.DY, keywords='测试')
-    execution = CrawlerExecution(request=request)
-
-    # 创建存在的文件
-    existing_file = tmp_path / 'existing.json'
-    existing_file.write_text('{}')
+    execution = CrawlerExecution(request=sample_request)
+    existing_file = Path('/fake/output/existing.json')
 
-    # 应该成功
-    execution.update_output_files([existing_file])
+    # 文件存在时应该成功（只调用 exists()，无需真实写盘）
+    with patch.object(Path, 'exists', return_value=True):
+        execution.update_output_files([existing_file])
     assert execution.output_files == [existing_file]
 
 
-def test_update_output_files_rejects_nonexistent():
+def test_update_output_files_rejects_nonexistent(sample_request: SearchRequest):
     """测试 update_output_files 拒绝不存在的文件"""
-    request = SearchRequest(platform=Platform.DY, keywords='测试')
-    execution = CrawlerExecution(request=request)
+    execution = CrawlerExecution(request=sample_request)
 
     with pytest.raises(ValueError, match='输出文件不存在'):
         execution.update_output_files([Path('/nonexistent/file.json')])
 
 
+def test_update_output_files_checks_siblings_in_one_directory(sample_request: SearchRequest, tmp_path: Path):
+    """测试同目录多个文件一次性校验，并报告缺失的那个"""
+    execution = CrawlerExecution(request=sample_request)
+    existing = [tmp_path / 'a.json', tmp_path / 'b.json']
+    for f in existing:
+        f.touch()
+
+    execution.update_output_files(existing)
+    assert execution.output_files == existing
+
+    with pytest.raises(ValueError, match='missing.json'):
+        execution.update_output_files([*existing, tmp_path / 'missing.json'])
+
+
+def test_update_output_files_reports_first_missing_in_input_order(sample_request: SearchRequest, tmp_path: Path):
+    """测试文件分布在多个目录时，按输入顺序报告第一个缺失的文件"""
+    execution = CrawlerExecution(request=sample_request)
+    other_dir = tmp_path / 'other'
+    other_dir.mkdir()
+    existing = [tmp_path / 'a.json', other_dir / 'b.json', tmp_path / 'c.json']
+    for f in existing:
+        f.touch()
+
+    files = [existing[0], other_dir / 'missing_first.json', existing[2], tmp_path / 'missing_second.json', existing[1]]
+    with pytest.raises(ValueError, match='missing_first.json'):
+        execution.update_output_files(files)
+
+
+def test_update_output_files_confirms_unlisted_names_with_exists(sample_request: SearchRequest, tmp_path: Path):
+    """测试目录列表中找不到的文件名以 exists() 为准（大小写不敏感的文件系统上大小写可能不同）"""
+    execution = CrawlerExecution(request=sample_request)
+    files = [tmp_path / 'A.json', tmp_path / 'B.json']
+
+    with patch.object(Path, 'exists', return_value=True):
+        execution.update_output_files(files)
+    assert execution.output_files == files
+
+
+def test_update_output_files_rejects_broken_symlink(sample_request: SearchRequest, tmp_path: Path):
+    """测试断开的符号链接视为不存在"""
+    execution = CrawlerExecution(request=sample_request)
+    existing = tmp_path / 'a.json'
+    existing.touch()
+    broken = tmp_path / 'broken.json'
+    broken.symlink_to(tmp_path / 'gone.json')
+
+    with pytest.raises(ValueError, match='broken.json'):
+        execution.update_output_files([existing, broken])
+
+
 # ============================================================================
 # Execution Properties Edge Cases
 # ============================================================================
 
 
-def test_duration_seconds_returns_none_when_not_started():
+def test_duration_seconds_returns_none_when_not_started(sample_request: SearchRequest):
     """测试未开始时 duration_seconds 返回 None"""
-    request = SearchRequest(platform=Platform.DY, keywords='测试')
-    execution = CrawlerExecution(request=request)
+    execution = CrawlerExecution(request=sample_request)
 
     assert execution.duration_seconds is None
 
 
-def test_duration_seconds_while_running():
+def test_duration_seconds_while_running(sample_request: SearchRequest):
     """测试运行中的 duration_seconds"""
-    request = SearchRequest(platform=Platform.DY, keywords='测试')
-    execution = CrawlerExecution(request=request)
+    execution = CrawlerExecution(request=sample_request)
 
     execution.mark_running(process_id=12345)
 
@@ -538,57 +610,23 @@ def test_duration_seconds_while_running():
     assert execution.duration_seconds >= 0
 
 
-def test_is_finished_for_all_terminal_states():
-    """测试所有终止状态的 is_finished 属性"""
-    from datetime import datetime
-
-    request = SearchRequest(platform=Platform.DY, keywords='测试')
-
-    # PENDING - 未完成
-    pending = CrawlerExecution(request=request, status=ExecutionStatus.PENDING)
-    assert not pending.is_finished
-
-    # RUNNING - 未完成
-    running = CrawlerExecution(
-        request=request,
-        status=ExecutionStatus.RUNNING,
-        process_id=12345,
-        start_time=datetime.now(),
-    )
-    assert not running.is_finished
-
-    # COMPLETED - 已完成
-    completed = CrawlerExecution(
-        request=request,
-        status=ExecutionStatus.COMPLETED,
-        end_time=datetime.now(),
-    )
-    assert completed.is_finished
-
-    # FAILED - 已完成
-    failed = CrawlerExecution(
-        request=request,
-        status=ExecutionStatus.FAILED,
-        end_time=datetime.now(),
-        error_message='Error',
-    )
-    assert failed.is_finished
-
-    # TIMEOUT - 已完成
-    timeout = CrawlerExecution(
-        request=request,
-        status=ExecutionStatus.TIMEOUT,
-        end_time=datetime.now(),
-    )
-    assert timeout.is_finished
+@pytest.mark.parametrize(
+    'status,extra,expected',
+    [
+        (ExecutionStatus.PENDING, {}, False),
+        (ExecutionStatus.RUNNING, {'process_id': 12345, 'start_time': FIXED_NOW}, False),
+        (ExecutionStatus.COMPLETED, {'end_time': FIXED_NOW}, True),
+        (ExecutionStatus.FAILED, {'end_time': FIXED_NOW, 'error_message': 'Error'}, True),
+        (ExecutionStatus.TIMEOUT, {'end_time': FIXED_NOW}, True),
+        (ExecutionStatus.STOPPED, {'end_time': FIXED_NOW}, True),
+    ],
+    ids=lambda v: v.value if isinstance(v, ExecutionStatus) else None,
+)
+def test_is_finished_for_all_terminal_states(sample_request: SearchRequest, status, extra, expected):
+    """测试各状态的 is_finished 属性（仅终止状态为已完成）"""
+    execution = CrawlerExecution(request=sample_request, status=status, **extra)
 
-    # STOPPED - 已完成
-    stopped = CrawlerExecution(
-        request=request,
-        status=ExecutionStatus.STOPPED,
-        end_time=datetime.now(),
-    )
-    assert stopped.is_finished
+    assert execution.is_finished is expected
 
 
 # ============================================================================
@@ -598,16 +636,14 @@ def test_is_finished_for_all_terminal_states():
 
 def test_post_timestamp_serialization():
     """测试帖子时间戳序列化"""
-    from datetime import datetime
-
     post = Post(
         content_id='123',
         platform=Platform.DY,
         create_time=datetime(2024, 1, 15, 10, 30, 0),
     )
 
-    data = post.model_dump()
-    assert data['create_time'] is not None
+    data = post.model_dump(include={'create_time'})
+    assert data == {'create_time': datetime(2024, 1, 15, 10, 30, 0)}
 
 
 def test_post_timestamp_from_unix_int():
@@ -634,10 +670,57 @@ def test_post_timestamp_from_unix_string():
     assert isinstance(post.create_time, datetime)
 
 
+def test_timestamp_forms_parse_to_same_datetime():
+    """整数、字符串时间戳（含重复出现的缓存命中）解析结果一致"""
+    times = [
+        Post(content_id='1', platform=Platform.DY, create_time=1705315800).create_time,
+        Post(content_id='2', platform=Platform.DY, create_time='1705315800').create_time,
+        Comment(comment_id='3', content_id='1', platform=Platform.DY, create_time=1705315800).create_time,
+    ]
+
+    assert times == [datetime.fromtimestamp(1705315800)] * 3
+
+
+def test_post_timestamp_out_of_range_string_is_none():
+    """超出范围的数字字符串（如 13 位毫秒时间戳）解析为 None，不拒绝整条记录"""
+    post = Post(content_id='1', platform=Platform.DY, create_time='1705315800000')
+
+    assert post.create_time is None
+
+
+@pytest.mark.parametrize(
+    'value, expected',
+    [
+        (' 1705315800 ', datetime.fromtimestamp(1705315800)),
+        ('+1705315800', datetime.fromtimestamp(1705315800)),
+        ('-1', datetime.fromtimestamp(-1)),
+        ('-', None),
+    ],
+)
+def test_post_timestamp_from_padded_or_signed_string(value: str, expected):
+    """带首尾空白或正负号的数字字符串与 int() 一样按时间戳解析"""
+    post = Post(content_id='1', platform=Platform.DY, create_time=value)
+
+    assert post.create_time == expected
+
+
+@pytest.mark.parametrize(
+    'value, expected',
+    [
+        ('2024-01-15T10:30:00', datetime(2024, 1, 15, 10, 30, 0)),
+        ('not a time', None),
+        ('', None),
+    ],
+)
+def test_post_timestamp_from_non_numeric_string(value: str, expected):
+    """非数字字符串按 ISO 格式解析，无法解析时为 None"""
+    post = Post(content_id='1', platform=Platform.DY, create_time=value)
+
+    assert post.create_time == expected
+
+
 def test_comment_timestamp_serialization():
     """测试评论时间戳序列化"""
-    from datetime import datetime
-
     comment = Comment(
         comment_id='456',
         content_id='123',
@@ -645,8 +728,8 @@ def test_comment_timestamp_serialization():
         create_time=datetime(2024, 1, 15, 10, 30, 0),
     )
 
-    data = comment.model_dump()
-    assert data['create_time'] is not None
+    data = comment.model_dump(include={'create_time'})
+    assert data == {'create_time': datetime(2024, 1, 15, 10, 30, 0)}
 
 
 def test_comment_pictures_parsing():
@@ -678,47 +761,67 @@ def test_comment_pictures_parsing():
     )
     assert comment3.pictures == []
 
+    # 空字符串（无图评论的常见形式）
+    comment5 = Comment(
+        comment_id='5',
+        content_id='post5',
+        platform=Platform.DY,
+        pictures='',
+    )
+    assert comment5.pictures == []
+
+    # 空白与空项被忽略
+    comment4 = Comment(
+        comment_id='4',
+        content_id='post4',
+        platform=Platform.DY,
+        pictures=' url1.jpg, ,url2.jpg,',
+    )
+    assert comment4.pictures == ['url1.jpg', 'url2.jpg']
+
+    # URL 内的空格不作为分隔符
+    comment6 = Comment(
+        comment_id='6',
+        content_id='post6',
+        platform=Platform.DY,
+        pictures='https://example.com/my pic.jpg, url2.jpg',
+    )
+    assert comment6.pictures == ['https://example.com/my pic.jpg', 'url2.jpg']
+
 
 # ============================================================================
 # Status Consistency Validation Tests
 # ============================================================================
 
 
-def test_running_status_requires_start_time():
+def test_running_status_requires_start_time(sample_request: SearchRequest):
     """测试 RUNNING 状态需要 start_time"""
-    request = SearchRequest(platform=Platform.DY, keywords='测试')
-
     with pytest.raises(ValueError, match='running 状态必须有 start_time'):
         CrawlerExecution(
-            request=request,
+            request=sample_request,
             status=ExecutionStatus.RUNNING,
             process_id=12345,
             # 缺少 start_time
         )
 
 
-def test_completed_status_requires_end_time():
+def test_completed_status_requires_end_time(sample_request: SearchRequest):
     """测试 COMPLETED 状态需要 end_time"""
-    request = SearchRequest(platform=Platform.DY, keywords='测试')
-
     with pytest.raises(ValueError, match='completed 状态必须有 end_time'):
         CrawlerExecution(
-            request=request,
+            request=sample_request,
             status=ExecutionStatus.COMPLETED,
             # 缺少 end_time
         )
 
 
-def test_failed_status_can_use_stderr_lines():
+def test_failed_status_can_use_stderr_lines(sample_request: SearchRequest):
     """测试 FAILED 状态可以使用 stderr_lines 作为错误信息"""
-    request = SearchRequest(platform=Platform.DY, keywords='测试')
-    from datetime import datetime
-
     # 有 stderr_lines 但没有 error_message 应该可以通过验证
     execution = CrawlerExecution(
-        request=request,
+        request=sample_request,
         status=ExecutionStatus.FAILED,
-        end_time=datetime.now(),
+        end_time=FIXED_NOW,
         stderr_lines=['Error line 1', 'Error line 2'],
     )
     assert execution.status == ExecutionStatus.FAILED
@@ -2,64 +2,80 @@
 导入链路测试
 
 验证从 core → ui 的完整导入链路
+
+导入放在模块顶层：链路断裂或循环导入在收集阶段即报错
 """
 
+import importlib
+import os
+import subprocess
+import sys
+
+from media_analyst.core import (
+    ParsedLink,
+    extract_douyin_links,
+    format_link_for_display,
+    url_parser,
+)
+
 
 class TestImportChain:
     """测试各级导入链路"""
 
     def test_import_from_url_parser_directly(self):
         """直接导入 url_parser 模块"""
-        from media_analyst.core.url_parser import (
-            extract_douyin_links,
-            extract_urls_from_text,
-        )
-
-        assert callable(extract_urls_from_text)
-        assert callable(extract_douyin_links)
+        assert callable(url_parser.extract_urls_from_text)
+        assert callable(url_parser.extract_douyin_links)
 
     def test_import_from_core_init(self):
-        """从 core.__init__ 导入"""
-        from media_analyst.core import (
-            extract_douyin_links,
-        )
-
+        """从 core.__init__ 导入，与 url_parser 中为同一对象"""
         assert callable(extract_douyin_links)
+        assert extract_douyin_links is url_parser.extract_douyin_links
 
     def test_import_format_link_for_display_from_core(self):
         """测试 format_link_for_display 是否能从core导入"""
-        from media_analyst.core import format_link_for_display
-
         assert callable(format_link_for_display)
+        assert format_link_for_display is url_parser.format_link_for_display
 
     def test_import_in_app_context(self):
-        """模拟 app.py 中的导入方式"""
-        # 这是 app.py 中的实际导入语句
-        from media_analyst.core import (
-            extract_douyin_links,
-            format_link_for_display,
-        )
+        """app.py 使用的导入在 ui 模块中可用"""
+        app = importlib.import_module('media_analyst.ui.app')
 
-        assert callable(extract_douyin_links)
-        assert callable(format_link_for_display)
+        assert app.extract_douyin_links is extract_douyin_links
+        assert app.format_link_for_display is format_link_for_display
 
     def test_import_all_exports(self):
         """测试 __all__ 中导出的所有名称"""
-        import media_analyst.core as core
+        core = importlib.import_module('media_analyst.core')
 
         # 检查 url_parser 相关导出
-        assert hasattr(core, 'ParsedLink')
-        assert hasattr(core, 'URLParseError')
-        assert hasattr(core, 'extract_urls_from_text')
-        assert hasattr(core, 'parse_douyin_url')
-        assert hasattr(core, 'extract_douyin_links')
-        assert hasattr(core, 'normalize_douyin_links')
-        assert hasattr(core, 'format_link_for_display')
+        for name in (
+            'ParsedLink',
+            'URLParseError',
+            'extract_urls_from_text',
+            'parse_douyin_url',
+            'extract_douyin_links',
+            'normalize_douyin_links',
+            'format_link_for_display',
+        ):
+            assert name in core.__all__
+            assert hasattr(core, name)
+
+    def test_parser_import_defers_heavy_modules(self):
+        """导入 parser 不应连带导入 pandas 和进程池（仅在导出/并行解析时按需导入）"""
+        code = (
+            'import sys, media_analyst.core.parser; '
+            "print(sorted({'pandas', 'concurrent.futures.process'} & set(sys.modules)))"
+        )
+        env = {**os.environ, 'PYTHONPATH': os.pathsep.join(sys.path)}  # 子进程沿用当前的 src 路径
+        output = subprocess.run(
+            [sys.executable, '-c', code], capture_output=True, text=True, check=True, env=env
+        ).stdout
+
+        assert output.strip() == '[]'
 
     def test_parsed_link_dataclass(self):
         """测试 ParsedLink 数据类可用"""
-        from media_analyst.core import ParsedLink
-
         link = ParsedLink(
             original='https://v.douyin.com/abc/',
             normalized='https://www.douyin.com/video/123',
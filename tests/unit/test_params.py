@@ -9,6 +9,9 @@ Params 模块单元测试
 使用函数形式编写测试
 """
 
+from typing import Dict, List
+from unittest.mock import patch
+
 from media_analyst.core.models import (
     CreatorRequest,
     DetailRequest,
@@ -19,6 +22,14 @@ from media_analyst.core.models import (
 )
 from media_analyst.core.params import build_args, build_command, preview_command
 
+
+def arg_pairs(args: List[str]) -> Dict[str, str]:
+    """将 ['--flag', 'value', ...] 转为 {flag: value}，同时检查没有重复的参数"""
+    pairs = dict(zip(args[::2], args[1::2]))
+    assert len(pairs) * 2 == len(args), f'参数重复或不成对: {args}'
+    return pairs
+
+
 # ============================================================================
 # build_args Tests
 # ============================================================================
@@ -36,21 +47,15 @@ def test_build_args_with_search_request():
         max_comments=50,
     )
 
-    args = build_args(req)
+    args = arg_pairs(build_args(req))
 
     # 验证必要参数
-    assert '--platform' in args
-    assert args[args.index('--platform') + 1] == 'dy'
-    assert '--lt' in args
-    assert args[args.index('--lt') + 1] == 'qrcode'
-    assert '--type' in args
-    assert args[args.index('--type') + 1] == 'search'
-    assert '--keywords' in args
-    assert args[args.index('--keywords') + 1] == '美食,旅游'
-    assert '--get_comment' in args
-    assert args[args.index('--get_comment') + 1] == 'yes'
-    assert '--max_comments_count_singlenotes' in args
-    assert args[args.index('--max_comments_count_singlenotes') + 1] == '50'
+    assert args['--platform'] == 'dy'
+    assert args['--lt'] == 'qrcode'
+    assert args['--type'] == 'search'
+    assert args['--keywords'] == '美食,旅游'
+    assert args['--get_comment'] == 'yes'
+    assert args['--max_comments_count_singlenotes'] == '50'
 
 
 def test_build_args_with_detail_request():
@@ -63,16 +68,12 @@ def test_build_args_with_detail_request():
         max_comments=100,
     )
 
-    args = build_args(req)
+    args = arg_pairs(build_args(req))
 
-    assert '--type' in args
-    assert args[args.index('--type') + 1] == 'detail'
-    assert '--specified_id' in args
-    assert args[args.index('--specified_id') + 1] == 'https://xiaohongshu.com/note/123'
-    assert '--get_comment' in args
-    assert args[args.index('--get_comment') + 1] == 'no'
-    assert '--headless' in args
-    assert args[args.index('--headless') + 1] == 'no'
+    assert args['--type'] == 'detail'
+    assert args['--specified_id'] == 'https://xiaohongshu.com/note/123'
+    assert args['--get_comment'] == 'no'
+    assert args['--headless'] == 'no'
 
 
 def test_build_args_with_creator_request():
@@ -84,16 +85,12 @@ def test_build_args_with_creator_request():
         get_sub_comment=True,
     )
 
-    args = build_args(req)
+    args = arg_pairs(build_args(req))
 
-    assert '--type' in args
-    assert args[args.index('--type') + 1] == 'creator'
-    assert '--creator_id' in args
-    assert args[args.index('--creator_id') + 1] == 'user1,user2'
-    assert '--start' in args
-    assert args[args.index('--start') + 1] == '2'
-    assert '--get_sub_comment' in args
-    assert args[args.index('--get_sub_comment') + 1] == 'yes'
+    assert args['--type'] == 'creator'
+    assert args['--creator_id'] == 'user1,user2'
+    assert args['--start'] == '2'
+    assert args['--get_sub_comment'] == 'yes'
 
 
 def test_build_args_with_custom_save_path():
@@ -104,10 +101,9 @@ def test_build_args_with_custom_save_path():
         save_path='/custom/path',
     )
 
-    args = build_args(req)
+    args = arg_pairs(build_args(req))
 
-    assert '--save_data_path' in args
-    assert args[args.index('--save_data_path') + 1] == '/custom/path'
+    assert args['--save_data_path'] == '/custom/path'
 
 
 def test_build_args_without_save_path():
@@ -140,18 +136,18 @@ def test_build_args_all_boolean_flags():
         headless=False,
     )
 
-    args_true = build_args(req_true)
-    args_false = build_args(req_false)
+    args_true = arg_pairs(build_args(req_true))
+    args_false = arg_pairs(build_args(req_false))
 
     # 验证 true 值
-    assert args_true[args_true.index('--get_comment') + 1] == 'yes'
-    assert args_true[args_true.index('--get_sub_comment') + 1] == 'yes'
-    assert args_true[args_true.index('--headless') + 1] == 'yes'
+    assert args_true['--get_comment'] == 'yes'
+    assert args_true['--get_sub_comment'] == 'yes'
+    assert args_true['--headless'] == 'yes'
 
     # 验证 false 值
-    assert args_false[args_false.index('--get_comment') + 1] == 'no'
-    assert args_false[args_false.index('--get_sub_comment') + 1] == 'no'
-    assert args_false[args_false.index('--headless') + 1] == 'no'
+    assert args_false['--get_comment'] == 'no'
+    assert args_false['--get_sub_comment'] == 'no'
+    assert args_false['--headless'] == 'no'
 
 
 # ============================================================================
@@ -205,7 +201,20 @@ def test_preview_command_format():
     assert preview.startswith('cd ../MediaCrawler &&')
     assert 'uv run main.py' in preview
     assert '--platform dy' in preview
-    assert '--keywords 美食' in preview
+    assert "--keywords '美食'" in preview
+
+
+def test_preview_command_quotes_shell_metacharacters():
+    """测试命令预览对空格和 shell 元字符转义"""
+    req = SearchRequest(
+        platform=Platform.DY,
+        keywords='a b & c',
+    )
+
+    preview = preview_command(req, media_crawler_path='/opt/Media Crawler')
+
+    assert preview.startswith("cd '/opt/Media Crawler' &&")
+    assert "--keywords 'a b & c'" in preview
 
 
 def test_preview_command_with_different_path():
@@ -240,3 +249,38 @@ def test_build_args_is_pure():
     # 原始请求未被修改
     assert req.keywords == '测试'
     assert req.max_comments == 50
+
+
+def test_build_args_returns_fresh_list():
+    """每次返回独立的列表，调用方修改不影响后续结果"""
+    req = SearchRequest(platform=Platform.DY, keywords='测试')
+
+    args1 = build_args(req)
+    args1.append('--extra')
+    args2 = build_args(req)
+
+    assert '--extra' not in args2
+
+
+def test_build_args_reuses_result_for_equal_requests():
+    """字段相同的请求只构建一次参数"""
+    req = SearchRequest(platform=Platform.DY, keywords='缓存测试')
+
+    with patch.object(SearchRequest, 'to_cli_args', autospec=True, side_effect=SearchRequest.to_cli_args) as mock:
+        first = build_args(req)
+        second = build_args(SearchRequest(platform=Platform.DY, keywords='缓存测试'))
+
+    assert mock.call_count == 1
+    assert first == second
+    assert first is not second
+
+
+def test_build_args_reflects_model_copy_update():
+    """model_copy(update=...) 后的请求按新字段构建参数"""
+    req = SearchRequest(platform=Platform.DY, keywords='旧关键词')
+    build_args(req)
+
+    copied = req.model_copy(update={'keywords': '新关键词'})
+
+    assert arg_pairs(build_args(copied))['--keywords'] == '新关键词'
+    assert '新关键词' in build_command(copied)
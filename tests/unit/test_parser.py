@@ -9,19 +9,23 @@
 测试数据基于 MediaCrawler 实际输出格式
 """
 
+import io
 import json
-import tempfile
 from datetime import datetime
-from pathlib import Path
 
 import pytest
 
 from media_analyst.core.models import Comment, ParsedData, Platform, Post
 from media_analyst.core.parser import (
+    _parse_bilibili_comment,
+    _parse_bilibili_post,
     detect_platform,
     detect_platform_from_filename,
+    extract_crawl_time_from_filename,
     parse_comment,
     parse_json_file,
+    parse_json_fileobj,
+    parse_json_files,
     parse_post,
     posts_to_dataframe,
 )
@@ -140,6 +144,21 @@ def invalid_data():
     return {'unknown_field': 'value', 'foo': 'bar'}
 
 
+@pytest.fixture(scope='module')
+def parsed_dy_post() -> Post:
+    """已解析的抖音帖子（只读，模块内共享；需要变体时用 model_copy）"""
+    return parse_post({'aweme_id': 'same_id', 'desc': '内容', 'nickname': '用户', 'liked_count': 100}, Platform.DY)
+
+
+@pytest.fixture(scope='module')
+def parsed_dy_comment() -> Comment:
+    """已解析的抖音评论（只读，模块内共享；需要变体时用 model_copy）"""
+    return parse_comment(
+        {'comment_id': 'same_comment', 'aweme_id': 'v123', 'content': '评论', 'nickname': '用户', 'like_count': 50},
+        Platform.DY,
+    )
+
+
 # =============================================================================
 # 平台检测测试
 # =============================================================================
@@ -171,6 +190,18 @@ def test_detect_platform_from_filename():
     assert detect_platform_from_filename('unknown_file.json') is None
 
 
+def test_detect_platform_from_filename_matches_whole_tokens():
+    """测试平台全名按子串匹配，缩写须独立出现，目录名同样可用"""
+    assert detect_platform_from_filename('data/douyin/json/search_contents.json') == Platform.DY
+    assert detect_platform_from_filename('douyin2024.json') == Platform.DY
+    assert detect_platform_from_filename('mydouyin_export.json') == Platform.DY
+    assert detect_platform_from_filename('xhs_search_contents_2024.json') == Platform.XHS
+    assert detect_platform_from_filename('xhs2024.json') == Platform.XHS
+    assert detect_platform_from_filename('/tmp/tmpdy3kx9.json') is None
+    assert detect_platform_from_filename('/tmp/tmpxhsq1.json') is None
+    assert detect_platform_from_filename('weeks_report.json') is None
+
+
 # =============================================================================
 # 帖子解析测试
 # =============================================================================
@@ -188,6 +219,7 @@ def test_parse_douyin_post(douyin_post_data):
     assert post.liked_count == 15057
     assert post.collected_count == 11502
     assert isinstance(post.create_time, datetime)
+    assert post.raw_data is douyin_post_data  # 直接引用原记录，不复制
 
 
 def test_parse_xhs_post(xhs_post_data):
@@ -214,6 +246,32 @@ def test_parse_post_auto_detect(douyin_post_data, xhs_post_data):
     assert post2.platform == Platform.XHS
 
 
+def test_parse_post_common_field_fallbacks():
+    """测试共通字段按候选顺序取第一个非 None 值，全部缺失时为空字符串"""
+    post = parse_post(
+        {'aweme_id': '1', 'user_id': None, 'uid': 'u1', 'author_id': 'a1', 'user_name': '备用昵称'},
+        Platform.DY,
+    )
+
+    assert post is not None
+    assert post.user_id == 'u1'
+    assert post.nickname == '备用昵称'
+    assert post.avatar == ''
+    assert post.source_keyword == ''
+
+
+def test_parse_low_cardinality_fields_share_string():
+    """测试 ip_location 等低基数字段同值记录共享同一字符串对象"""
+    result = parse_json_fileobj(
+        json_fileobj([{'aweme_id': str(i), 'ip_location': '山东', 'source_keyword': '美食'} for i in range(2)])
+    )
+
+    first, second = result.posts
+    assert first.ip_location == '山东'
+    assert first.ip_location is second.ip_location
+    assert first.source_keyword is second.source_keyword
+
+
 def test_parse_post_invalid_data():
     """测试解析无效数据"""
     result = parse_post({'foo': 'bar'})
@@ -285,60 +343,75 @@ def test_parse_comment_with_parent():
 # =============================================================================
 
 
-def test_parse_json_file_douyin(douyin_post_data, douyin_comment_data):
-    """测试解析抖音 JSON 文件"""
-    # 创建临时文件
-    data = [douyin_post_data, douyin_comment_data]
+def json_fileobj(data) -> io.BytesIO:
+    """将数据序列化为内存中的 JSON 文件对象"""
+    return io.BytesIO(json.dumps(data, ensure_ascii=False).encode('utf-8'))
+
+
+def test_parse_json_fileobj_douyin(douyin_post_data, douyin_comment_data):
+    """测试解析抖音 JSON 数据"""
+    result = parse_json_fileobj(json_fileobj([douyin_post_data, douyin_comment_data]))
+
+    assert isinstance(result, ParsedData)
+    assert result.platform == Platform.DY
+    assert len(result.posts) == 1
+    assert len(result.comments) == 1
+    assert result.total_records == 2
+    assert result.success_count == 2
+    assert result.error_count == 0
+
+
+def test_parse_json_fileobj_xhs(xhs_post_data, xhs_comment_data):
+    """测试解析小红书 JSON 数据"""
+    result = parse_json_fileobj(json_fileobj([xhs_post_data, xhs_comment_data]))
+
+    assert result.platform == Platform.XHS
+    assert len(result.posts) == 1
+    assert len(result.comments) == 1
 
-    with tempfile.NamedTemporaryFile(mode='w', suffix='.json', delete=False, encoding='utf-8') as f:
-        json.dump(data, f)
-        temp_path = Path(f.name)
 
-    try:
-        result = parse_json_file(temp_path)
+def test_parse_json_fileobj_single_object(douyin_post_data):
+    """测试解析单个对象（非列表）JSON 数据"""
+    result = parse_json_fileobj(json_fileobj(douyin_post_data))
 
-        assert isinstance(result, ParsedData)
-        assert result.platform == Platform.DY
-        assert len(result.posts) == 1
-        assert len(result.comments) == 1
-        assert result.total_records == 2
-        assert result.success_count == 2
-        assert result.error_count == 0
-    finally:
-        temp_path.unlink()
+    assert result.total_records == 1
+    assert len(result.posts) == 1
 
 
-def test_parse_json_file_xhs(xhs_post_data, xhs_comment_data):
-    """测试解析小红书 JSON 文件"""
-    data = [xhs_post_data, xhs_comment_data]
+def test_parse_json_fileobj_uses_source_file_metadata(douyin_post_data):
+    """测试 source_file 用于抓取时间检测并记录到结果"""
+    result = parse_json_fileobj(json_fileobj([douyin_post_data]), source_file='douyin_contents_2024_0222_143052.json')
 
-    with tempfile.NamedTemporaryFile(mode='w', suffix='.json', delete=False, encoding='utf-8') as f:
-        json.dump(data, f)
-        temp_path = Path(f.name)
+    assert result.posts[0].crawl_time == datetime(2024, 2, 22, 14, 30, 52)
+    assert result.posts[0].source_file == 'douyin_contents_2024_0222_143052.json'
+    # 就地写入的元数据与 model_copy(update=...) 结果一致（含 fields_set）
+    assert result.posts[0].model_fields_set >= {'crawl_time', 'source_file'}
+    assert result.posts[0] == parse_post(douyin_post_data, Platform.DY).model_copy(
+        update={'crawl_time': result.posts[0].crawl_time, 'source_file': result.posts[0].source_file}
+    )
+
+
+def test_parse_json_file_douyin(tmp_path, douyin_post_data, douyin_comment_data):
+    """测试从文件路径解析（记录源文件路径）"""
+    path = tmp_path / 'contents.json'
+    path.write_text(json.dumps([douyin_post_data, douyin_comment_data]), encoding='utf-8')
 
-    try:
-        result = parse_json_file(temp_path)
+    result = parse_json_file(path)
 
-        assert result.platform == Platform.XHS
-        assert len(result.posts) == 1
-        assert len(result.comments) == 1
-    finally:
-        temp_path.unlink()
+    assert result.platform == Platform.DY
+    assert result.success_count == 2
+    assert all(item.source_file == str(path) for item in [*result.posts, *result.comments])
 
 
-def test_parse_json_file_single_object(douyin_post_data):
-    """测试解析单个对象（非列表）JSON 文件"""
-    with tempfile.NamedTemporaryFile(mode='w', suffix='.json', delete=False, encoding='utf-8') as f:
-        json.dump(douyin_post_data, f)
-        temp_path = Path(f.name)
+def test_parse_json_file_returns_independent_results(tmp_path, douyin_post_data):
+    """测试重复解析同一文件返回互不影响的新结果"""
+    path = tmp_path / 'contents.json'
+    path.write_text(json.dumps([douyin_post_data]), encoding='utf-8')
 
-    try:
-        result = parse_json_file(temp_path)
+    first = parse_json_file(path)
+    first.posts.clear()
 
-        assert result.total_records == 1
-        assert len(result.posts) == 1
-    finally:
-        temp_path.unlink()
+    assert len(parse_json_file(path).posts) == 1
 
 
 def test_parse_json_file_not_found():
@@ -347,40 +420,87 @@ def test_parse_json_file_not_found():
         parse_json_file('/nonexistent/file.json')
 
 
-def test_parse_json_file_invalid_json():
-    """测试解析无效的 JSON 文件"""
-    with tempfile.NamedTemporaryFile(mode='w', suffix='.json', delete=False, encoding='utf-8') as f:
-        f.write('invalid json content')
-        temp_path = Path(f.name)
+def test_parse_json_fileobj_invalid_json():
+    """测试解析无效的 JSON 数据"""
+    with pytest.raises(json.JSONDecodeError):
+        parse_json_fileobj(io.BytesIO(b'invalid json content'))
+
+
+def test_parse_json_file_without_orjson(monkeypatch, tmp_path, douyin_post_data):
+    """测试未安装 orjson 时退回标准库解析"""
+    monkeypatch.setattr('media_analyst.core.parser.orjson', None)
+    path = tmp_path / 'contents.json'
+    path.write_text(json.dumps([douyin_post_data], ensure_ascii=False), encoding='utf-8')
+
+    result = parse_json_file(path)
+
+    assert len(result.posts) == 1
+    assert result.posts[0].nickname == douyin_post_data['nickname']
+
+
+def test_parse_json_file_with_orjson(monkeypatch, tmp_path, douyin_post_data, douyin_comment_data):
+    """测试安装 orjson 时走 orjson 解码，结果与标准库解析一致"""
+    orjson = pytest.importorskip('orjson')
+    calls = []
+
+    def spy_loads(raw):
+        calls.append(raw)
+        return orjson.loads(raw)
+
+    monkeypatch.setattr('media_analyst.core.parser.orjson', type('orjson', (), {'loads': staticmethod(spy_loads)}))
+    path = tmp_path / 'douyin_contents.json'
+    path.write_text(json.dumps([douyin_post_data, douyin_comment_data], ensure_ascii=False), encoding='utf-8')
 
-    try:
-        with pytest.raises(json.JSONDecodeError):
-            parse_json_file(temp_path)
-    finally:
-        temp_path.unlink()
+    result = parse_json_file(path)
+    monkeypatch.setattr('media_analyst.core.parser.orjson', None)
+    expected = parse_json_file(path)
 
+    assert len(calls) == 1
+    assert result.posts == expected.posts
+    assert result.comments == expected.comments
 
-def test_parse_json_file_with_errors():
-    """测试解析包含无效数据的文件"""
+
+def test_parse_json_fileobj_invalid_json_with_orjson():
+    """测试 orjson 的解码错误可按 json.JSONDecodeError 捕获"""
+    pytest.importorskip('orjson')
+    with pytest.raises(json.JSONDecodeError):
+        parse_json_fileobj(io.BytesIO(b'invalid json content'))
+
+
+def test_parse_json_file_streams_large_arrays(monkeypatch, tmp_path, douyin_post_data, douyin_comment_data):
+    """测试超过阈值的数组文件通过 ijson 流式解析，结果与整体加载一致"""
+    pytest.importorskip('ijson')
+    path = tmp_path / 'douyin_contents.json'
+    path.write_text(json.dumps([douyin_post_data, douyin_comment_data, 'not a dict']), encoding='utf-8')
+    expected = parse_json_file(path)
+
+    monkeypatch.setattr('media_analyst.core.parser.STREAMING_THRESHOLD', 0)
+    monkeypatch.setattr('media_analyst.core.parser._load_json', None)  # 流式路径不应整体加载
+    result = parse_json_file(path)
+
+    assert result.total_records == 3
+    assert len(result.posts) == 1
+    assert len(result.comments) == 1
+    assert result.error_count == 1
+    assert result.posts == expected.posts
+    assert result.comments == expected.comments
+    assert result.errors == expected.errors
+
+
+def test_parse_json_fileobj_with_errors():
+    """测试解析包含无效记录的数据"""
     data = [
         {'aweme_id': '123', 'nickname': 'valid'},  # 有效
         {'unknown_field': 'value'},  # 无效（无法识别平台）
         'not a dict',  # 无效（不是字典）
     ]
 
-    with tempfile.NamedTemporaryFile(mode='w', suffix='.json', delete=False, encoding='utf-8') as f:
-        json.dump(data, f)
-        temp_path = Path(f.name)
-
-    try:
-        result = parse_json_file(temp_path)
+    result = parse_json_fileobj(json_fileobj(data))
 
-        assert result.total_records == 3
-        assert result.success_count == 1
-        assert result.error_count == 2
-        assert len(result.errors) == 2
-    finally:
-        temp_path.unlink()
+    assert result.total_records == 3
+    assert result.success_count == 1
+    assert result.error_count == 2
+    assert result.errors == ['第 2 条记录无法识别平台或格式', '第 3 条记录不是字典类型']
 
 
 # =============================================================================
@@ -513,28 +633,34 @@ def test_parsed_data_same_user_counted_once(douyin_post_data):
     assert parsed.user_count == 1
 
 
+def test_parsed_data_aggregates_follow_mutation(douyin_post_data, douyin_comment_data):
+    """测试聚合值随帖子/评论列表的修改和 model_copy 更新而变化"""
+    post = parse_post(douyin_post_data, Platform.DY)
+    parsed = ParsedData(posts=[post])
+    assert parsed.total_interactions['likes'] == 15057
+    assert parsed.user_count == 1
+
+    parsed.posts.append(post.model_copy(update={'content_id': 'other', 'user_id': 'another_user'}))
+    parsed.comments.append(parse_comment(douyin_comment_data, Platform.DY))
+
+    assert parsed.total_interactions['likes'] == 15057 * 2
+    assert parsed.user_count == 3
+
+    emptied = parsed.model_copy(update={'posts': [], 'comments': []})
+    assert emptied.total_interactions['likes'] == 0
+    assert emptied.user_count == 0
+
+
 # =============================================================================
 # 去重功能测试
 # =============================================================================
 
 
-def test_deduplicate_posts():
+def test_deduplicate_posts(parsed_dy_post: Post):
     """测试帖子去重：保留最新抓取的数据"""
-    from datetime import datetime
-
-    # 创建两条相同 content_id 的帖子，但抓取时间不同
-    base_data = {
-        'aweme_id': 'same_id',
-        'desc': '内容',
-        'nickname': '用户',
-        'liked_count': 100,
-    }
-
-    post1 = parse_post(base_data, Platform.DY)
-    post1 = post1.model_copy(update={'crawl_time': datetime(2024, 1, 15, 10, 0, 0)})
-
-    post2 = parse_post(base_data, Platform.DY)
-    post2 = post2.model_copy(update={'crawl_time': datetime(2024, 1, 20, 14, 30, 0)})
+    # 两条相同 content_id 的帖子，但抓取时间不同
+    post1 = parsed_dy_post.model_copy(update={'crawl_time': datetime(2024, 1, 15, 10, 0, 0)})
+    post2 = parsed_dy_post.model_copy(update={'crawl_time': datetime(2024, 1, 20, 14, 30, 0)})
 
     # 合并数据（包含重复）
     parsed = ParsedData(posts=[post1, post2])
@@ -547,23 +673,10 @@ def test_deduplicate_posts():
     assert deduplicated.posts[0].crawl_time == datetime(2024, 1, 20, 14, 30, 0)
 
 
-def test_deduplicate_comments():
+def test_deduplicate_comments(parsed_dy_comment: Comment):
     """测试评论去重：保留最新抓取的数据"""
-    from datetime import datetime
-
-    base_data = {
-        'comment_id': 'same_comment',
-        'aweme_id': 'video123',
-        'content': '评论内容',
-        'nickname': '评论用户',
-        'like_count': 50,
-    }
-
-    comment1 = parse_comment(base_data, Platform.DY)
-    comment1 = comment1.model_copy(update={'crawl_time': datetime(2024, 2, 1, 8, 0, 0)})
-
-    comment2 = parse_comment(base_data, Platform.DY)
-    comment2 = comment2.model_copy(update={'crawl_time': datetime(2024, 2, 5, 16, 45, 0)})
+    comment1 = parsed_dy_comment.model_copy(update={'crawl_time': datetime(2024, 2, 1, 8, 0, 0)})
+    comment2 = parsed_dy_comment.model_copy(update={'crawl_time': datetime(2024, 2, 5, 16, 45, 0)})
 
     parsed = ParsedData(comments=[comment1, comment2])
     assert len(parsed.comments) == 2
@@ -574,19 +687,10 @@ def test_deduplicate_comments():
     assert deduplicated.comments[0].crawl_time == datetime(2024, 2, 5, 16, 45, 0)
 
 
-def test_deduplicate_without_crawl_time():
+def test_deduplicate_without_crawl_time(parsed_dy_post: Post):
     """测试没有去重时间时的去重行为：保留后遇到的"""
-    base_data = {
-        'aweme_id': 'same_id',
-        'desc': '内容',
-        'nickname': '用户',
-    }
-
-    post1 = parse_post(base_data, Platform.DY)
-    post1 = post1.model_copy(update={'source_file': 'file1.json'})
-
-    post2 = parse_post(base_data, Platform.DY)
-    post2 = post2.model_copy(update={'source_file': 'file2.json'})
+    post1 = parsed_dy_post.model_copy(update={'source_file': 'file1.json'})
+    post2 = parsed_dy_post.model_copy(update={'source_file': 'file2.json'})
 
     parsed = ParsedData(posts=[post1, post2])
     deduplicated = parsed.deduplicate()
@@ -596,6 +700,20 @@ def test_deduplicate_without_crawl_time():
     assert deduplicated.posts[0].source_file == 'file2.json'
 
 
+def test_deduplicate_with_stats_matches_separate_calls(parsed_dy_post: Post, parsed_dy_comment: Comment):
+    """测试 deduplicate_with_stats 与分别调用 deduplicate / deduplication_stats 结果一致"""
+    posts = [parsed_dy_post.model_copy(update={'content_id': post_id}) for post_id in ('a', 'a', 'b', 'b', 'b')]
+    comments = [parsed_dy_comment, parsed_dy_comment]
+    parsed = ParsedData(posts=posts, comments=comments)
+
+    deduplicated, stats = parsed.deduplicate_with_stats()
+
+    assert stats == parsed.deduplication_stats
+    assert stats == {'duplicate_posts': 2, 'duplicate_comments': 1, 'total_duplicates': 3}
+    assert deduplicated == parsed.deduplicate()
+    assert [p.content_id for p in deduplicated.posts] == ['a', 'b']
+
+
 def test_deduplicate_stats_no_duplicates():
     """测试无重复数据时的统计"""
     post1 = parse_post({'aweme_id': 'id1', 'desc': '内容1', 'nickname': '用户1'}, Platform.DY)
@@ -616,10 +734,6 @@ def test_deduplicate_stats_no_duplicates():
 
 def test_extract_crawl_time_from_filename():
     """测试从文件名提取抓取时间"""
-    from datetime import datetime
-
-    from media_analyst.core.parser import extract_crawl_time_from_filename
-
     # 下划线分隔格式
     result = extract_crawl_time_from_filename('douyin_contents_2024_0222_143052.json')
     assert result == datetime(2024, 2, 22, 14, 30, 52)
@@ -631,12 +745,20 @@ def test_extract_crawl_time_from_filename():
 
 def test_extract_crawl_time_from_invalid_filename():
     """测试无法解析的文件名返回 None"""
-    from media_analyst.core.parser import extract_crawl_time_from_filename
-
     result = extract_crawl_time_from_filename('some_random_file.json')
     assert result is None
 
 
+def test_extract_crawl_time_falls_back_to_mtime(tmp_path):
+    """测试文件名不含时间（也不含下划线）时退回文件修改时间"""
+    path = tmp_path / 'export.json'
+    path.write_text('[]', encoding='utf-8')
+
+    result = extract_crawl_time_from_filename(str(path))
+
+    assert result == datetime.fromtimestamp(path.stat().st_mtime)
+
+
 # =============================================================================
 # 抓取时间元数据测试
 # =============================================================================
@@ -644,8 +766,6 @@ def test_extract_crawl_time_from_invalid_filename():
 
 def test_post_metadata_fields():
     """测试帖子模型的元数据字段"""
-    from datetime import datetime
-
     data = {'aweme_id': '123', 'desc': '测试', 'nickname': '用户'}
     post = parse_post(data, Platform.DY)
 
@@ -663,8 +783,6 @@ def test_post_metadata_fields():
 
 def test_comment_metadata_fields():
     """测试评论模型的元数据字段"""
-    from datetime import datetime
-
     data = {'comment_id': 'c123', 'aweme_id': 'v123', 'content': '评论', 'nickname': '用户'}
     comment = parse_comment(data, Platform.DY)
 
@@ -680,23 +798,15 @@ def test_comment_metadata_fields():
     assert comment_with_meta.source_file == '/path/to/comments.json'
 
 
-def test_deduplicate_posts_and_comments_combined():
+def test_deduplicate_posts_and_comments_combined(parsed_dy_post: Post, parsed_dy_comment: Comment):
     """测试同时包含 Post 和 Comment 的去重"""
-    from datetime import datetime
-
     # Post 数据
-    post_data = {'aweme_id': 'same_post', 'desc': '内容', 'nickname': '用户'}
-    post1 = parse_post(post_data, Platform.DY).model_copy(update={'crawl_time': datetime(2024, 1, 10, 10, 0, 0)})
-    post2 = parse_post(post_data, Platform.DY).model_copy(update={'crawl_time': datetime(2024, 1, 15, 10, 0, 0)})
+    post1 = parsed_dy_post.model_copy(update={'crawl_time': datetime(2024, 1, 10, 10, 0, 0)})
+    post2 = parsed_dy_post.model_copy(update={'crawl_time': datetime(2024, 1, 15, 10, 0, 0)})
 
     # Comment 数据
-    comment_data = {'comment_id': 'same_comment', 'aweme_id': 'v123', 'content': '评论', 'nickname': '用户'}
-    comment1 = parse_comment(comment_data, Platform.DY).model_copy(
-        update={'crawl_time': datetime(2024, 1, 12, 10, 0, 0)}
-    )
-    comment2 = parse_comment(comment_data, Platform.DY).model_copy(
-        update={'crawl_time': datetime(2024, 1, 18, 10, 0, 0)}
-    )
+    comment1 = parsed_dy_comment.model_copy(update={'crawl_time': datetime(2024, 1, 12, 10, 0, 0)})
+    comment2 = parsed_dy_comment.model_copy(update={'crawl_time': datetime(2024, 1, 18, 10, 0, 0)})
 
     # 合并数据
     parsed = ParsedData(posts=[post1, post2], comments=[comment1, comment2])
@@ -717,37 +827,44 @@ def test_deduplicate_posts_and_comments_combined():
     assert deduplicated.comments[0].crawl_time == datetime(2024, 1, 18, 10, 0, 0)
 
 
-def test_parse_json_files_auto_deduplicate():
+def test_parse_json_files_auto_deduplicate(tmp_path):
     """测试 parse_json_files 自动去重功能"""
-    import json
+    # 文件1：旧数据
+    file1 = tmp_path / 'douyin_2024_0115_100000.json'
+    data1 = [{'aweme_id': 'same_id', 'desc': '旧内容', 'nickname': '用户', 'liked_count': 100}]
+    file1.write_text(json.dumps(data1), encoding='utf-8')
 
-    # 创建两个包含重复数据的临时文件
-    import tempfile
+    # 文件2：新数据（相同ID，更新内容）
+    file2 = tmp_path / 'douyin_2024_0120_120000.json'
+    data2 = [{'aweme_id': 'same_id', 'desc': '新内容', 'nickname': '用户', 'liked_count': 200}]
+    file2.write_text(json.dumps(data2), encoding='utf-8')
 
-    from media_analyst.core.parser import parse_json_files
+    # 测试自动去重（默认）
+    result_dedup = parse_json_files([file1, file2], deduplicate=True)
+    assert len(result_dedup.posts) == 1
+    # 应该保留最新数据（文件2的）
+    assert result_dedup.posts[0].liked_count == 200
 
-    with tempfile.TemporaryDirectory() as tmpdir:
-        # 文件1：旧数据
-        file1 = Path(tmpdir) / 'douyin_2024_0115_100000.json'
-        data1 = [{'aweme_id': 'same_id', 'desc': '旧内容', 'nickname': '用户', 'liked_count': 100}]
-        with open(file1, 'w', encoding='utf-8') as f:
-            json.dump(data1, f)
+    # 测试不去重
+    result_no_dedup = parse_json_files([file1, file2], deduplicate=False)
+    assert len(result_no_dedup.posts) == 2
 
-        # 文件2：新数据（相同ID，更新内容）
-        file2 = Path(tmpdir) / 'douyin_2024_0120_120000.json'
-        data2 = [{'aweme_id': 'same_id', 'desc': '新内容', 'nickname': '用户', 'liked_count': 200}]
-        with open(file2, 'w', encoding='utf-8') as f:
-            json.dump(data2, f)
 
-        # 测试自动去重（默认）
-        result_dedup = parse_json_files([file1, file2], deduplicate=True)
-        assert len(result_dedup.posts) == 1
-        # 应该保留最新数据（文件2的）
-        assert result_dedup.posts[0].liked_count == 200
+def test_parse_json_files_in_process_pool_matches_serial(tmp_path):
+    """测试多进程解析与串行解析结果一致（含错误文件，顺序保持）"""
+    paths = []
+    for i in range(3):
+        path = tmp_path / f'douyin_2024_01{i + 10}_100000.json'
+        path.write_text(json.dumps([{'aweme_id': f'id{i}', 'nickname': '用户'}]), encoding='utf-8')
+        paths.append(path)
+    paths.insert(1, tmp_path / 'missing.json')
 
-        # 测试不去重
-        result_no_dedup = parse_json_files([file1, file2], deduplicate=False)
-        assert len(result_no_dedup.posts) == 2
+    serial = parse_json_files(paths, deduplicate=False)
+    parallel = parse_json_files(paths, deduplicate=False, max_workers=2)
+
+    assert parallel == serial
+    assert [p.content_id for p in parallel.posts] == ['id0', 'id1', 'id2']
+    assert parallel.error_count == 1
 
 
 # =============================================================================
@@ -775,8 +892,6 @@ def test_detect_platform_unknown_data():
 
 def test_detect_platform_from_filename_unknown():
     """测试从无法识别的文件名返回 None"""
-    from media_analyst.core.parser import detect_platform_from_filename
-
     result = detect_platform_from_filename('some_random_file.json')
     assert result is None
 
@@ -823,8 +938,6 @@ def test_parse_comment_with_invalid_timestamp():
 
 def test_extract_crawl_time_with_invalid_timestamp():
     """测试从无效时间戳提取抓取时间"""
-    from media_analyst.core.parser import extract_crawl_time_from_filename
-
     # 无效的时间格式
     _result = extract_crawl_time_from_filename('douyin_data_99_99_99.json')
     # 应该返回 None 或回退到文件修改时间
@@ -837,8 +950,6 @@ def test_extract_crawl_time_with_invalid_timestamp():
 
 def test_parse_bilibili_post():
     """测试解析 Bilibili 视频数据"""
-    from media_analyst.core.parser import _parse_bilibili_post
-
     data = {
         'bvid': 'BV1xx411c7mD',
         'title': '测试视频标题',
@@ -863,8 +974,6 @@ def test_parse_bilibili_post():
 
 def test_parse_bilibili_comment():
     """测试解析 Bilibili 评论数据"""
-    from media_analyst.core.parser import _parse_bilibili_comment
-
     data = {
         'rpid': '123456789',
         'bvid': 'BV1xx411c7mD',
@@ -886,8 +995,6 @@ def test_parse_bilibili_comment():
 
 def test_parse_bilibili_sub_comment():
     """测试解析 Bilibili 子评论"""
-    from media_analyst.core.parser import _parse_bilibili_comment
-
     data = {
         'rpid': '987654321',
         'bvid': 'BV1xx411c7mD',
@@ -926,37 +1033,27 @@ def test_parse_post_with_empty_dict():
     # 主要验证不抛出异常
 
 
-def test_parse_json_file_handles_non_list_json():
+def test_parse_json_file_handles_non_list_json(tmp_path):
     """测试 parse_json_file 处理非列表 JSON"""
-    with tempfile.NamedTemporaryFile(mode='w', suffix='.json', delete=False, encoding='utf-8') as f:
-        json.dump({'single': 'object'}, f)
-        temp_path = f.name
+    path = tmp_path / 'single.json'
+    path.write_text(json.dumps({'single': 'object'}), encoding='utf-8')
 
-    try:
-        # 单个对象应被包装为列表
-        result = parse_json_file(temp_path)
-        assert result.total_records == 1
-    finally:
-        Path(temp_path).unlink()
+    # 单个对象应被包装为列表
+    result = parse_json_file(path)
+    assert result.total_records == 1
 
 
-def test_parse_json_file_handles_invalid_json():
+def test_parse_json_file_handles_invalid_json(tmp_path):
     """测试 parse_json_file 处理无效 JSON"""
-    with tempfile.NamedTemporaryFile(mode='w', suffix='.json', delete=False, encoding='utf-8') as f:
-        f.write('not valid json')
-        temp_path = f.name
+    path = tmp_path / 'invalid.json'
+    path.write_text('not valid json', encoding='utf-8')
 
-    try:
-        with pytest.raises(json.JSONDecodeError):
-            parse_json_file(temp_path)
-    finally:
-        Path(temp_path).unlink()
+    with pytest.raises(json.JSONDecodeError):
+        parse_json_file(path)
 
 
 def test_parse_json_files_handles_file_errors():
     """测试 parse_json_files 处理文件错误"""
-    from media_analyst.core.parser import parse_json_files
-
     # 包含一个不存在的文件
     result = parse_json_files(['/nonexistent/file.json'])
 
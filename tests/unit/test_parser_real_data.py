@@ -6,35 +6,69 @@
 """
 
 import json
-import tempfile
 from datetime import datetime
 from pathlib import Path
+from typing import Tuple
 
 import pytest
 
 from media_analyst.core.models import ParsedData, Platform
 from media_analyst.core.parser import (
+    comments_to_dataframe,
     extract_crawl_time_from_filename,
     parse_json_file,
     parse_json_files,
+    posts_to_dataframe,
 )
 
 # 测试数据目录
 TEST_DATA_DIR = Path(__file__).parent.parent / 'data' / 'douyin' / 'json'
 
 
+def data_file(name: str) -> Path:
+    """测试数据文件路径，不存在时跳过测试"""
+    path = TEST_DATA_DIR / name
+    if not path.exists():
+        pytest.skip('测试数据文件不存在')
+    return path
+
+
+@pytest.fixture(scope='module')
+def contents_file() -> Path:
+    """抖音内容数据文件"""
+    return data_file('douyin_contents_2024_0221_143052.json')
+
+
+@pytest.fixture(scope='module')
+def comments_file() -> Path:
+    """抖音评论数据文件"""
+    return data_file('douyin_comments_2024_0221_143052.json')
+
+
+@pytest.fixture(scope='module')
+def contents_file_pair(contents_file: Path) -> Tuple[Path, Path]:
+    """两次抓取的内容文件（含一条重复帖子）"""
+    return contents_file, data_file('douyin_contents_2024_0222_153000.json')
+
+
+@pytest.fixture(scope='module')
+def contents_parsed(contents_file: Path) -> ParsedData:
+    """已解析的内容文件（只读，模块内共享）"""
+    return parse_json_file(contents_file)
+
+
+@pytest.fixture(scope='module')
+def comments_parsed(comments_file: Path) -> ParsedData:
+    """已解析的评论文件（只读，模块内共享）"""
+    return parse_json_file(comments_file)
+
+
 class TestRealDataFormat:
     """测试真实数据格式解析"""
 
-    def test_parse_real_douyin_contents_format(self):
+    def test_parse_real_douyin_contents_format(self, contents_parsed: ParsedData):
         """测试解析真实抖音内容数据格式"""
-        # 使用模拟的真实数据文件
-        file_path = TEST_DATA_DIR / 'douyin_contents_2024_0221_143052.json'
-
-        if not file_path.exists():
-            pytest.skip('测试数据文件不存在')
-
-        result = parse_json_file(file_path)
+        result = contents_parsed
 
         # 验证解析结果
         assert isinstance(result, ParsedData)
@@ -67,14 +101,9 @@ class TestRealDataFormat:
         # 验证源文件信息
         assert 'douyin_contents_2024_0221_143052.json' in post.source_file
 
-    def test_parse_real_douyin_comments_format(self):
+    def test_parse_real_douyin_comments_format(self, comments_parsed: ParsedData):
         """测试解析真实抖音评论数据格式"""
-        file_path = TEST_DATA_DIR / 'douyin_comments_2024_0221_143052.json'
-
-        if not file_path.exists():
-            pytest.skip('测试数据文件不存在')
-
-        result = parse_json_file(file_path)
+        result = comments_parsed
 
         # 验证解析结果
         assert isinstance(result, ParsedData)
@@ -93,13 +122,9 @@ class TestRealDataFormat:
         assert comment.sub_comment_count == 2
         assert comment.is_sub_comment is False
 
-    def test_deduplicate_with_real_data_format(self):
+    def test_deduplicate_with_real_data_format(self, contents_file_pair: Tuple[Path, Path]):
         """测试使用真实数据格式进行去重"""
-        file1 = TEST_DATA_DIR / 'douyin_contents_2024_0221_143052.json'
-        file2 = TEST_DATA_DIR / 'douyin_contents_2024_0222_153000.json'
-
-        if not file1.exists() or not file2.exists():
-            pytest.skip('测试数据文件不存在')
+        file1, file2 = contents_file_pair
 
         # 解析两个文件（都包含 aweme_id=1234567890 的数据）
         result = parse_json_files([file1, file2], deduplicate=True)
@@ -116,13 +141,9 @@ class TestRealDataFormat:
         assert post.liked_count == 1500  # file2 中的值
         assert post.crawl_time.day == 22  # file2 的日期
 
-    def test_deduplicate_stats_with_real_data(self):
+    def test_deduplicate_stats_with_real_data(self, contents_file_pair: Tuple[Path, Path]):
         """测试真实数据的去重统计"""
-        file1 = TEST_DATA_DIR / 'douyin_contents_2024_0221_143052.json'
-        file2 = TEST_DATA_DIR / 'douyin_contents_2024_0222_153000.json'
-
-        if not file1.exists() or not file2.exists():
-            pytest.skip('测试数据文件不存在')
+        file1, file2 = contents_file_pair
 
         # 先获取原始数据（不去重）
         raw_result = parse_json_files([file1, file2], deduplicate=False)
@@ -155,14 +176,8 @@ class TestRealDataFormat:
 class TestMixedContentParsing:
     """测试混合内容解析"""
 
-    def test_parse_mixed_posts_and_comments(self):
+    def test_parse_mixed_posts_and_comments(self, contents_file: Path, comments_file: Path):
         """测试同时解析帖子和评论"""
-        contents_file = TEST_DATA_DIR / 'douyin_contents_2024_0221_143052.json'
-        comments_file = TEST_DATA_DIR / 'douyin_comments_2024_0221_143052.json'
-
-        if not contents_file.exists() or not comments_file.exists():
-            pytest.skip('测试数据文件不存在')
-
         result = parse_json_files([contents_file, comments_file])
 
         # 验证同时包含帖子和评论
@@ -170,15 +185,9 @@ class TestMixedContentParsing:
         assert len(result.comments) == 2
         assert result.platform == Platform.DY
 
-    def test_string_count_conversion(self):
+    def test_string_count_conversion(self, contents_parsed: ParsedData):
         """测试字符串数字转换（真实数据中计数字段是字符串）"""
-        file_path = TEST_DATA_DIR / 'douyin_contents_2024_0221_143052.json'
-
-        if not file_path.exists():
-            pytest.skip('测试数据文件不存在')
-
-        result = parse_json_file(file_path)
-        post = result.posts[0]
+        post = contents_parsed.posts[0]
 
         # 验证字符串 "1000" 被正确转换为整数 1000
         assert isinstance(post.liked_count, int)
@@ -190,61 +199,41 @@ class TestMixedContentParsing:
 class TestErrorHandling:
     """测试错误处理"""
 
-    def test_parse_invalid_json(self):
+    def test_parse_invalid_json(self, tmp_path: Path):
         """测试解析无效 JSON"""
-        with tempfile.NamedTemporaryFile(mode='w', suffix='.json', delete=False) as f:
-            f.write('{invalid json content')
-            temp_path = f.name
+        path = tmp_path / 'invalid.json'
+        path.write_text('{invalid json content', encoding='utf-8')
 
-        try:
-            with pytest.raises(Exception):
-                parse_json_file(temp_path)
-        finally:
-            Path(temp_path).unlink()
+        with pytest.raises(json.JSONDecodeError):
+            parse_json_file(path)
 
-    def test_parse_empty_list(self):
+    def test_parse_empty_list(self, tmp_path: Path):
         """测试解析空列表"""
-        with tempfile.NamedTemporaryFile(mode='w', suffix='.json', delete=False) as f:
-            json.dump([], f)
-            temp_path = f.name
-
-        try:
-            result = parse_json_file(temp_path)
-            assert len(result.posts) == 0
-            assert len(result.comments) == 0
-            assert result.success_count == 0
-        finally:
-            Path(temp_path).unlink()
-
-    def test_parse_non_dict_record(self):
+        path = tmp_path / 'empty.json'
+        path.write_text('[]', encoding='utf-8')
+
+        result = parse_json_file(path)
+        assert len(result.posts) == 0
+        assert len(result.comments) == 0
+        assert result.success_count == 0
+
+    def test_parse_non_dict_record(self, tmp_path: Path):
         """测试解析非字典类型的记录"""
-        with tempfile.NamedTemporaryFile(mode='w', suffix='.json', delete=False) as f:
-            json.dump(['not a dict', 123, None], f)
-            temp_path = f.name
+        path = tmp_path / 'non_dict.json'
+        path.write_text(json.dumps(['not a dict', 123, None]), encoding='utf-8')
 
-        try:
-            result = parse_json_file(temp_path)
-            # 应该有3条错误记录
-            assert len(result.errors) == 3
-            assert result.success_count == 0
-        finally:
-            Path(temp_path).unlink()
+        result = parse_json_file(path)
+        # 应该有3条错误记录
+        assert len(result.errors) == 3
+        assert result.success_count == 0
 
 
 class TestDataFrameExport:
     """测试 DataFrame 导出"""
 
-    def test_posts_to_dataframe_with_real_data(self):
+    def test_posts_to_dataframe_with_real_data(self, contents_parsed: ParsedData):
         """测试将真实帖子数据转换为 DataFrame"""
-        from media_analyst.core.parser import posts_to_dataframe
-
-        file_path = TEST_DATA_DIR / 'douyin_contents_2024_0221_143052.json'
-
-        if not file_path.exists():
-            pytest.skip('测试数据文件不存在')
-
-        result = parse_json_file(file_path)
-        df = posts_to_dataframe(result.posts)
+        df = posts_to_dataframe(contents_parsed.posts)
 
         # 验证 DataFrame 结构
         assert len(df) == 2
@@ -256,17 +245,9 @@ class TestDataFrameExport:
         # 验证数据类型
         assert df['liked_count'].dtype in ['int64', 'int32']
 
-    def test_comments_to_dataframe_with_real_data(self):
+    def test_comments_to_dataframe_with_real_data(self, comments_parsed: ParsedData):
         """测试将真实评论数据转换为 DataFrame"""
-        from media_analyst.core.parser import comments_to_dataframe
-
-        file_path = TEST_DATA_DIR / 'douyin_comments_2024_0221_143052.json'
-
-        if not file_path.exists():
-            pytest.skip('测试数据文件不存在')
-
-        result = parse_json_file(file_path)
-        df = comments_to_dataframe(result.comments)
+        df = comments_to_dataframe(comments_parsed.comments)
 
         # 验证 DataFrame 结构
         assert len(df) == 2
@@ -6,11 +6,15 @@ UI偏好持久化模块测试
 
 import json
 import tempfile
+from dataclasses import FrozenInstanceError, replace
 from pathlib import Path
 from unittest.mock import patch
 
 import pytest
+import streamlit as st
 
+from media_analyst.core import CRAWLER_TYPES, LOGIN_TYPES, PLATFORMS, SAVE_OPTIONS
+from media_analyst.ui import persistence
 from media_analyst.ui.persistence import (
     UserPreferences,
     _ensure_config_dir,
@@ -18,6 +22,35 @@ from media_analyst.ui.persistence import (
     save_from_form_values,
 )
 
+# ============================================================================
+# Fixtures
+# ============================================================================
+
+
+@pytest.fixture(autouse=True)
+def clean_session_state():
+    """每个测试前后清除会话中缓存的偏好，避免测试间相互影响"""
+    st.session_state.pop('_user_preferences', None)
+    yield
+    st.session_state.pop('_user_preferences', None)
+
+
+@pytest.fixture
+def config_dir(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> Path:
+    """将配置目录重定向到临时目录（monkeypatch 自动恢复）"""
+    directory = tmp_path / '.media_analyst'
+    monkeypatch.setattr(persistence, 'CONFIG_DIR', directory)
+    return directory
+
+
+@pytest.fixture
+def prefs_file(config_dir: Path, monkeypatch: pytest.MonkeyPatch) -> Path:
+    """将偏好文件重定向到临时配置目录，避免读写用户主目录"""
+    path = config_dir / 'preferences.json'
+    monkeypatch.setattr(persistence, 'PREFS_FILE', path)
+    return path
+
+
 # ============================================================================
 # UserPreferences Model Tests
 # ============================================================================
@@ -125,6 +158,26 @@ def test_user_preferences_from_dict_ignores_invalid():
     assert not hasattr(prefs, 'invalid_field')
 
 
+def test_user_preferences_rejects_unknown_attribute():
+    """测试不能给偏好对象添加未定义的属性（如拼错的字段名）"""
+    prefs = UserPreferences()
+
+    # frozen + slots 在部分 CPython 版本上对未定义属性抛 TypeError 而非 AttributeError
+    with pytest.raises((AttributeError, TypeError)):
+        prefs.plaform = 'xhs'
+
+
+def test_user_preferences_is_immutable():
+    """测试偏好对象不可原地修改，需通过 replace 生成新对象"""
+    prefs = UserPreferences()
+
+    with pytest.raises(FrozenInstanceError):
+        prefs.platform = 'xhs'
+
+    assert replace(prefs, platform='xhs').platform == 'xhs'
+    assert prefs.platform == 'dy'
+
+
 # ============================================================================
 # Preference Access Tests
 # ============================================================================
@@ -181,8 +234,6 @@ def test_save_from_form_values():
 
 def test_preferences_match_platform_options():
     """测试偏好值与平台选项匹配"""
-    from media_analyst.core import PLATFORMS
-
     prefs = UserPreferences()
 
     # 默认平台必须在可用平台列表中
@@ -191,8 +242,6 @@ def test_preferences_match_platform_options():
 
 def test_preferences_match_login_options():
     """测试偏好值与登录选项匹配"""
-    from media_analyst.core import LOGIN_TYPES
-
     prefs = UserPreferences()
 
     # 默认登录方式必须在可用选项中
@@ -201,8 +250,6 @@ def test_preferences_match_login_options():
 
 def test_preferences_match_crawler_types():
     """测试偏好值与爬虫类型匹配"""
-    from media_analyst.core import CRAWLER_TYPES
-
     prefs = UserPreferences()
 
     # 默认爬虫类型必须在可用选项中
@@ -211,8 +258,6 @@ def test_preferences_match_crawler_types():
 
 def test_preferences_match_save_options():
     """测试偏好值与保存选项匹配"""
-    from media_analyst.core import SAVE_OPTIONS
-
     prefs = UserPreferences()
 
     # 默认保存选项必须在可用选项中
@@ -224,169 +269,114 @@ def test_preferences_match_save_options():
 # ============================================================================
 
 
-def test_preferences_save_and_load_from_file():
+def test_preferences_save_and_load_from_file(prefs_file: Path):
     """测试偏好设置保存到文件并能正确加载"""
-    import streamlit as st
-
-    # 使用临时目录测试
-    with tempfile.TemporaryDirectory() as tmpdir:
-        # 临时修改配置文件路径
-        from media_analyst.ui import persistence
-
-        original_path = persistence.PREFS_FILE
-        test_file = Path(tmpdir) / 'test_prefs.json'
-        persistence.PREFS_FILE = test_file
-
-        try:
-            # 清除session_state中的缓存
-            if '_user_preferences' in st.session_state:
-                del st.session_state._user_preferences
-
-            # 创建并保存自定义偏好
-            prefs = UserPreferences(
-                platform='xhs',
-                login_type='phone',
-                crawler_type='detail',
-                save_option='json',
-                max_comments=50,
-                get_comment=True,
-                headless=False,
-            )
-            persistence.save_preferences(prefs)
-
-            # 验证文件已创建
-            assert test_file.exists()
+    # 创建并保存自定义偏好
+    prefs = UserPreferences(
+        platform='xhs',
+        login_type='phone',
+        crawler_type='detail',
+        save_option='json',
+        max_comments=50,
+        get_comment=True,
+        headless=False,
+    )
+    persistence.save_preferences(prefs)
 
-            # 读取文件内容验证
-            with open(test_file, 'r', encoding='utf-8') as f:
-                saved_data = json.load(f)
+    # 验证文件已创建
+    assert prefs_file.exists()
 
-            assert saved_data['platform'] == 'xhs'
-            assert saved_data['login_type'] == 'phone'
-            assert saved_data['max_comments'] == 50
-            assert saved_data['get_comment'] is True
-            assert saved_data['headless'] is False
+    # 读取文件内容验证
+    with open(prefs_file, 'r', encoding='utf-8') as f:
+        saved_data = json.load(f)
 
-            # 清除session_state模拟新会话
-            if '_user_preferences' in st.session_state:
-                del st.session_state._user_preferences
+    assert saved_data['platform'] == 'xhs'
+    assert saved_data['login_type'] == 'phone'
+    assert saved_data['max_comments'] == 50
+    assert saved_data['get_comment'] is True
+    assert saved_data['headless'] is False
 
-            # 从文件加载
-            loaded_prefs = persistence.load_preferences()
+    # 清除session_state模拟新会话
+    st.session_state.pop('_user_preferences', None)
 
-            assert loaded_prefs.platform == 'xhs'
-            assert loaded_prefs.login_type == 'phone'
-            assert loaded_prefs.crawler_type == 'detail'
-            assert loaded_prefs.max_comments == 50
-            assert loaded_prefs.get_comment is True
+    # 从文件加载
+    loaded_prefs = persistence.load_preferences()
 
-        finally:
-            # 恢复原配置路径
-            persistence.PREFS_FILE = original_path
+    assert loaded_prefs.platform == 'xhs'
+    assert loaded_prefs.login_type == 'phone'
+    assert loaded_prefs.crawler_type == 'detail'
+    assert loaded_prefs.max_comments == 50
+    assert loaded_prefs.get_comment is True
 
 
-def test_preferences_file_not_exists():
+def test_preferences_file_not_exists(prefs_file: Path):
     """测试配置文件不存在时返回默认值"""
-    import streamlit as st
-
-    with tempfile.TemporaryDirectory() as tmpdir:
-        from media_analyst.ui import persistence
+    # 加载不存在的文件应返回默认值
+    prefs = persistence.load_preferences()
 
-        original_path = persistence.PREFS_FILE
-        test_file = Path(tmpdir) / 'nonexistent.json'
-        persistence.PREFS_FILE = test_file
+    assert not prefs_file.exists()
+    assert prefs.platform == 'dy'  # 默认值
+    assert prefs.login_type == 'qrcode'
+    assert prefs.max_comments == 100
 
-        try:
-            # 清除session_state
-            if '_user_preferences' in st.session_state:
-                del st.session_state._user_preferences
 
-            # 加载不存在的文件应返回默认值
-            prefs = persistence.load_preferences()
+def test_load_preferences_reuses_session_instance():
+    """测试会话内重复加载返回同一个实例，并兼容旧版字典缓存"""
+    st.session_state._user_preferences = {'platform': 'ks', 'unknown': 1}
 
-            assert prefs.platform == 'dy'  # 默认值
-            assert prefs.login_type == 'qrcode'
-            assert prefs.max_comments == 100
+    first = persistence.load_preferences()
+    second = persistence.load_preferences()
 
-        finally:
-            persistence.PREFS_FILE = original_path
+    assert isinstance(first, UserPreferences)
+    assert first.platform == 'ks'
+    assert second is first
 
 
-def test_preferences_clear():
+def test_preferences_clear(prefs_file: Path):
     """测试清除偏好设置"""
+    # 先保存一些偏好
+    prefs = UserPreferences(platform='bili')
+    persistence.save_preferences(prefs)
+    assert prefs_file.exists()
 
-    with tempfile.TemporaryDirectory() as tmpdir:
-        from media_analyst.ui import persistence
-
-        original_path = persistence.PREFS_FILE
-        test_file = Path(tmpdir) / 'prefs_to_clear.json'
-        persistence.PREFS_FILE = test_file
-
-        try:
-            # 先保存一些偏好
-            prefs = UserPreferences(platform='bili')
-            persistence.save_preferences(prefs)
-            assert test_file.exists()
-
-            # 清除
-            persistence.clear_preferences()
-
-            # 文件应被删除
-            assert not test_file.exists()
+    # 清除
+    persistence.clear_preferences()
 
-        finally:
-            persistence.PREFS_FILE = original_path
+    # 文件应被删除
+    assert not prefs_file.exists()
 
 
-def test_ensure_config_dir():
+def test_ensure_config_dir(config_dir: Path):
     """测试配置目录创建"""
-    with tempfile.TemporaryDirectory() as tmpdir:
-        from media_analyst.ui import persistence
+    # 目录不应存在
+    assert not config_dir.exists()
 
-        original_dir = persistence.CONFIG_DIR
-        test_dir = Path(tmpdir) / '.media_analyst'
-        persistence.CONFIG_DIR = test_dir
+    # 调用确保目录函数
+    _ensure_config_dir()
 
-        try:
-            # 目录不应存在
-            assert not test_dir.exists()
+    # 目录应被创建
+    assert config_dir.exists()
+    assert config_dir.is_dir()
 
-            # 调用确保目录函数
-            _ensure_config_dir()
 
-            # 目录应被创建
-            assert test_dir.exists()
-            assert test_dir.is_dir()
+def test_ensure_config_dir_mkdir_once(config_dir: Path):
+    """测试同一配置目录只执行一次 mkdir"""
+    with patch.object(Path, 'mkdir') as mock_mkdir:
+        _ensure_config_dir()
+        _ensure_config_dir()
 
-        finally:
-            persistence.CONFIG_DIR = original_dir
+        mock_mkdir.assert_called_once()
 
 
-def test_corrupted_prefs_file():
+def test_corrupted_prefs_file(prefs_file: Path):
     """测试损坏的配置文件应返回默认值"""
-    import streamlit as st
-
-    with tempfile.TemporaryDirectory() as tmpdir:
-        from media_analyst.ui import persistence
+    # 创建损坏的JSON文件
+    prefs_file.parent.mkdir(parents=True)
+    prefs_file.write_text('{invalid json content', encoding='utf-8')
 
-        original_path = persistence.PREFS_FILE
-        test_file = Path(tmpdir) / 'corrupted.json'
-        persistence.PREFS_FILE = test_file
-
-        try:
-            # 清除session_state
-            if '_user_preferences' in st.session_state:
-                del st.session_state._user_preferences
-
-            # 创建损坏的JSON文件
-            test_file.write_text('{invalid json content', encoding='utf-8')
-
-            # 加载应返回默认值
-            prefs = persistence.load_preferences()
-            assert prefs.platform == 'dy'  # 默认值
-
-        finally:
-            persistence.PREFS_FILE = original_path
+    # 加载应返回默认值
+    prefs = persistence.load_preferences()
+    assert prefs.platform == 'dy'  # 默认值
 
 
 # ============================================================================
@@ -394,66 +384,28 @@ def test_corrupted_prefs_file():
 # ============================================================================
 
 
-def test_save_preferences_handles_ioerror():
+def test_save_preferences_handles_ioerror(prefs_file: Path):
     """测试保存偏好时处理 IOError"""
-    import streamlit as st
-
-    with tempfile.TemporaryDirectory() as tmpdir:
-        from media_analyst.ui import persistence
-
-        original_path = persistence.PREFS_FILE
-        original_dir = persistence.CONFIG_DIR
-        test_file = Path(tmpdir) / 'readonly.json'
-        test_dir = Path(tmpdir)
-        persistence.PREFS_FILE = test_file
-        persistence.CONFIG_DIR = test_dir
-
-        try:
-            # 清除session_state
-            if '_user_preferences' in st.session_state:
-                del st.session_state._user_preferences
+    prefs = UserPreferences(platform='dy')
 
-            prefs = UserPreferences(platform='dy')
-
-            # 模拟 IOError（权限问题）
-            with patch('builtins.open', side_effect=IOError('Permission denied')):
-                with patch('streamlit.warning') as mock_warning:
-                    persistence.save_preferences(prefs)
-                    # 应显示警告但不抛出异常
-                    mock_warning.assert_called_once()
-
-        finally:
-            persistence.PREFS_FILE = original_path
-            persistence.CONFIG_DIR = original_dir
+    # 模拟 IOError（权限问题）
+    with patch('builtins.open', side_effect=IOError('Permission denied')):
+        with patch('streamlit.warning') as mock_warning:
+            persistence.save_preferences(prefs)
+            # 应显示警告但不抛出异常
+            mock_warning.assert_called_once()
 
 
-def test_clear_preferences_handles_ioerror():
+def test_clear_preferences_handles_ioerror(prefs_file: Path):
     """测试清除偏好时处理 IOError"""
-    import streamlit as st
+    # 先保存偏好
+    prefs = UserPreferences(platform='bili')
+    persistence.save_preferences(prefs)
 
-    with tempfile.TemporaryDirectory() as tmpdir:
-        from media_analyst.ui import persistence
-
-        original_path = persistence.PREFS_FILE
-        test_file = Path(tmpdir) / 'prefs.json'
-        persistence.PREFS_FILE = test_file
-
-        try:
-            # 清除session_state
-            if '_user_preferences' in st.session_state:
-                del st.session_state._user_preferences
-
-            # 先保存偏好
-            prefs = UserPreferences(platform='bili')
-            persistence.save_preferences(prefs)
-
-            # 模拟删除文件时的 IOError
-            with patch.object(Path, 'unlink', side_effect=IOError('Cannot delete')):
-                # 不应抛出异常
-                persistence.clear_preferences()
-
-        finally:
-            persistence.PREFS_FILE = original_path
+    # 模拟删除文件时的 IOError
+    with patch.object(Path, 'unlink', side_effect=IOError('Cannot delete')):
+        # 不应抛出异常
+        persistence.clear_preferences()
 
 
 # ============================================================================
@@ -461,41 +413,32 @@ def test_clear_preferences_handles_ioerror():
 # ============================================================================
 
 
-def test_get_media_crawler_path_with_saved_path():
+def test_get_media_crawler_path_with_saved_path(prefs_file: Path, tmp_path: Path):
     """测试使用保存的自定义路径"""
-    import streamlit as st
-
-    with tempfile.TemporaryDirectory() as tmpdir:
-        from media_analyst.ui import persistence
+    # 创建模拟的 MediaCrawler 目录
+    mc_dir = tmp_path / 'MediaCrawler'
+    mc_dir.mkdir()
+    (mc_dir / 'main.py').write_text('# mock')
 
-        original_path = persistence.PREFS_FILE
-        test_file = Path(tmpdir) / 'test_prefs.json'
-        persistence.PREFS_FILE = test_file
+    # 保存路径
+    prefs = UserPreferences(media_crawler_path=str(mc_dir))
+    persistence.save_preferences(prefs)
 
-        try:
-            # 清除session_state
-            if '_user_preferences' in st.session_state:
-                del st.session_state._user_preferences
+    # 清除session_state以强制从文件加载
+    st.session_state.pop('_user_preferences', None)
 
-            # 创建模拟的 MediaCrawler 目录
-            mc_dir = Path(tmpdir) / 'MediaCrawler'
-            mc_dir.mkdir()
-            (mc_dir / 'main.py').write_text('# mock')
+    # 获取路径
+    result = persistence.get_media_crawler_path()
+    assert result == mc_dir
 
-            # 保存路径
-            prefs = UserPreferences(media_crawler_path=str(mc_dir))
-            persistence.save_preferences(prefs)
 
-            # 清除session_state以强制从文件加载
-            if '_user_preferences' in st.session_state:
-                del st.session_state._user_preferences
+def test_find_media_crawler_paths_includes_sibling_of_project_dir():
+    """测试基于 media-analyst 项目目录推导出兄弟目录 MediaCrawler"""
+    fake_file = '/opt/work/media-analyst/src/media_analyst/ui/persistence.py'
+    with patch.object(persistence, '__file__', fake_file):
+        candidates = persistence._find_media_crawler_paths()
 
-            # 获取路径
-            result = persistence.get_media_crawler_path()
-            assert result == mc_dir
-
-        finally:
-            persistence.PREFS_FILE = original_path
+    assert Path('/opt/work/MediaCrawler') in candidates
 
 
 def test_find_media_crawler_path_returns_none():
@@ -557,37 +500,20 @@ def test_save_media_crawler_path_validates_directory():
         assert result is False
 
 
-def test_save_media_crawler_path_success():
+def test_save_media_crawler_path_success(prefs_file: Path, tmp_path: Path):
     """测试成功保存 MediaCrawler 路径"""
-    import streamlit as st
-
-    with tempfile.TemporaryDirectory() as tmpdir:
-        from media_analyst.ui import persistence
-
-        original_path = persistence.PREFS_FILE
-        test_file = Path(tmpdir) / 'test_prefs.json'
-        persistence.PREFS_FILE = test_file
-
-        try:
-            # 清除session_state
-            if '_user_preferences' in st.session_state:
-                del st.session_state._user_preferences
+    # 创建有效的 MediaCrawler 目录
+    mc_dir = tmp_path / 'MediaCrawler'
+    mc_dir.mkdir()
+    (mc_dir / 'main.py').write_text('# mock main.py')
 
-            # 创建有效的 MediaCrawler 目录
-            mc_dir = Path(tmpdir) / 'MediaCrawler'
-            mc_dir.mkdir()
-            (mc_dir / 'main.py').write_text('# mock main.py')
+    result = persistence.save_media_crawler_path(str(mc_dir))
+    assert result is True
 
-            result = persistence.save_media_crawler_path(str(mc_dir))
-            assert result is True
-
-            # 验证已保存
-            prefs = persistence.load_preferences()
-            # 路径应保存为相对于 CWD 的路径（如果可能）
-            assert prefs.media_crawler_path != ''
-
-        finally:
-            persistence.PREFS_FILE = original_path
+    # 验证已保存
+    prefs = persistence.load_preferences()
+    # 路径应保存为相对于 CWD 的路径（如果可能）
+    assert prefs.media_crawler_path != ''
 
 
 def test_get_media_crawler_path_options():
@@ -658,33 +584,15 @@ def test_get_media_crawler_path_fallback():
             assert '../MediaCrawler' in str(result) or 'MediaCrawler' in str(result)
 
 
-def test_get_media_crawler_path_with_nonexistent_saved_path():
+def test_get_media_crawler_path_with_nonexistent_saved_path(prefs_file: Path):
     """测试保存的路径不存在时尝试相对路径"""
-    import streamlit as st
-
-    with tempfile.TemporaryDirectory() as tmpdir:
-        from media_analyst.ui import persistence
-
-        original_path = persistence.PREFS_FILE
-        test_file = Path(tmpdir) / 'test_prefs.json'
-        persistence.PREFS_FILE = test_file
+    # 保存一个不存在的相对路径
+    prefs = UserPreferences(media_crawler_path='/definitely/nonexistent/path')
+    persistence.save_preferences(prefs)
 
-        try:
-            # 清除session_state
-            if '_user_preferences' in st.session_state:
-                del st.session_state._user_preferences
-
-            # 保存一个不存在的相对路径
-            prefs = UserPreferences(media_crawler_path='/definitely/nonexistent/path')
-            persistence.save_preferences(prefs)
-
-            # 清除session_state
-            if '_user_preferences' in st.session_state:
-                del st.session_state._user_preferences
-
-            # 应返回默认路径（因为保存的路径不存在）
-            result = persistence.get_media_crawler_path()
-            assert '../MediaCrawler' in str(result) or 'MediaCrawler' in str(result)
+    # 清除session_state
+    st.session_state.pop('_user_preferences', None)
 
-        finally:
-            persistence.PREFS_FILE = original_path
+    # 应返回默认路径（因为保存的路径不存在）
+    result = persistence.get_media_crawler_path()
+    assert '../MediaCrawler' in str(result) or 'MediaCrawler' in str(result)